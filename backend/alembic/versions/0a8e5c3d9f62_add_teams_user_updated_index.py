@@ -0,0 +1,27 @@
+"""add_teams_user_updated_index
+
+Revision ID: 0a8e5c3d9f62
+Revises: f1d6b20e8c47
+Create Date: 2026-10-19 16:41:37.208815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a8e5c3d9f62'
+down_revision: Union[str, None] = 'f1d6b20e8c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create index for keyset pagination of a user's teams by (updated_at, id)
+    op.create_index('ix_teams_user_updated', 'teams', ['user_id', 'updated_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    # Drop keyset pagination index
+    op.drop_index('ix_teams_user_updated', table_name='teams', if_exists=True)
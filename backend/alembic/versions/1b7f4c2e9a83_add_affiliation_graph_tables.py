@@ -0,0 +1,68 @@
+"""add_affiliation_graph_tables
+
+Revision ID: 1b7f4c2e9a83
+Revises: 0a8e5c3d9f62
+Create Date: 2026-10-19 17:12:48.391604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b7f4c2e9a83'
+down_revision: Union[str, None] = '0a8e5c3d9f62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create affiliation_groups table
+    op.create_table('affiliation_groups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('normalized_name', sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('normalized_name')
+    )
+    op.create_index(op.f('ix_affiliation_groups_id'), 'affiliation_groups', ['id'], unique=False)
+
+    # Create superhero_groups table (hero -> groups via the primary key, group -> heroes via the index)
+    op.create_table('superhero_groups',
+        sa.Column('superhero_id', sa.Integer(), nullable=False),
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('is_former', sa.Boolean(), server_default='false', nullable=False),
+        sa.ForeignKeyConstraint(['superhero_id'], ['superheroes.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['group_id'], ['affiliation_groups.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('superhero_id', 'group_id')
+    )
+    op.create_index('ix_superhero_groups_group', 'superhero_groups', ['group_id', 'superhero_id'], unique=False)
+
+    # Create superhero_relations table
+    op.create_table('superhero_relations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('superhero_id', sa.Integer(), nullable=False),
+        sa.Column('related_superhero_id', sa.Integer(), nullable=True),
+        sa.Column('related_name', sa.String(length=255), nullable=False),
+        sa.Column('relation', sa.String(length=255), nullable=True),
+        sa.ForeignKeyConstraint(['superhero_id'], ['superheroes.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['related_superhero_id'], ['superheroes.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_superhero_relations_id'), 'superhero_relations', ['id'], unique=False)
+    op.create_index(op.f('ix_superhero_relations_superhero_id'), 'superhero_relations', ['superhero_id'], unique=False)
+    op.create_index(op.f('ix_superhero_relations_related_superhero_id'), 'superhero_relations', ['related_superhero_id'], unique=False)
+
+
+def downgrade() -> None:
+    # Drop affiliation graph tables
+    op.drop_index(op.f('ix_superhero_relations_related_superhero_id'), table_name='superhero_relations', if_exists=True)
+    op.drop_index(op.f('ix_superhero_relations_superhero_id'), table_name='superhero_relations', if_exists=True)
+    op.drop_index(op.f('ix_superhero_relations_id'), table_name='superhero_relations', if_exists=True)
+    op.drop_table('superhero_relations', if_exists=True)
+    op.drop_index('ix_superhero_groups_group', table_name='superhero_groups', if_exists=True)
+    op.drop_table('superhero_groups', if_exists=True)
+    op.drop_index(op.f('ix_affiliation_groups_id'), table_name='affiliation_groups', if_exists=True)
+    op.drop_table('affiliation_groups', if_exists=True)
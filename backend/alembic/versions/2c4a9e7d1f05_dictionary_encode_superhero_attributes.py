@@ -0,0 +1,60 @@
+"""dictionary_encode_superhero_attributes
+
+Revision ID: 2c4a9e7d1f05
+Revises: 1b7f4c2e9a83
+Create Date: 2026-10-19 17:48:05.617342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c4a9e7d1f05'
+down_revision: Union[str, None] = '1b7f4c2e9a83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (superheroes column, dictionary table, original column length, indexed)
+ATTRIBUTES = [
+    ('publisher', 'publishers', 255, True),
+    ('alignment', 'alignments', 50, True),
+    ('gender', 'genders', 50, False),
+    ('race', 'races', 100, False),
+    ('eye_color', 'eye_colors', 50, False),
+    ('hair_color', 'hair_colors', 50, False),
+]
+
+
+def upgrade() -> None:
+    for column, table, _, indexed in ATTRIBUTES:
+        # Create the dictionary table and fill it with the distinct stored values
+        op.create_table(table,
+            sa.Column('id', sa.SmallInteger(), nullable=False),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('name')
+        )
+        op.execute(f"INSERT INTO {table} (name) SELECT DISTINCT {column} FROM superheroes WHERE {column} IS NOT NULL ORDER BY 1")
+
+        # Replace the string column with its code
+        op.add_column('superheroes', sa.Column(f'{column}_id', sa.SmallInteger(), nullable=True))
+        op.execute(f"UPDATE superheroes SET {column}_id = d.id FROM {table} d WHERE d.name = superheroes.{column}")
+        op.create_foreign_key(f'fk_superheroes_{column}_id_{table}', 'superheroes', table, [f'{column}_id'], ['id'])
+        if indexed:
+            op.create_index(op.f(f'ix_superheroes_{column}_id'), 'superheroes', [f'{column}_id'], unique=False)
+        op.drop_column('superheroes', column)
+
+
+def downgrade() -> None:
+    for column, table, length, indexed in reversed(ATTRIBUTES):
+        # Restore the string column from the dictionary and drop the code
+        op.add_column('superheroes', sa.Column(column, sa.String(length=length), nullable=True))
+        op.execute(f"UPDATE superheroes SET {column} = d.name FROM {table} d WHERE d.id = superheroes.{column}_id")
+        if indexed:
+            op.drop_index(op.f(f'ix_superheroes_{column}_id'), table_name='superheroes', if_exists=True)
+        op.drop_constraint(f'fk_superheroes_{column}_id_{table}', 'superheroes', type_='foreignkey')
+        op.drop_column('superheroes', f'{column}_id')
+        op.drop_table(table, if_exists=True)
@@ -0,0 +1,42 @@
+"""add_superhero_favorite_stats_table
+
+Revision ID: 3c7d9a1e4b52
+Revises: b86aa0dc1a41
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7d9a1e4b52'
+down_revision: Union[str, None] = 'b86aa0dc1a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create superhero_favorite_stats table
+    op.create_table('superhero_favorite_stats',
+        sa.Column('superhero_id', sa.Integer(), nullable=False),
+        sa.Column('favorite_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['superhero_id'], ['superheroes.id'], ),
+        sa.PrimaryKeyConstraint('superhero_id')
+    )
+    op.create_index('ix_superhero_favorite_stats_ranking', 'superhero_favorite_stats', ['favorite_count', 'superhero_id'], unique=False)
+
+    # Backfill counters from existing favorites
+    op.execute(
+        "INSERT INTO superhero_favorite_stats (superhero_id, favorite_count) "
+        "SELECT superhero_id, COUNT(*) FROM user_favorites GROUP BY superhero_id"
+    )
+
+
+def downgrade() -> None:
+    # Drop superhero_favorite_stats table
+    op.drop_index('ix_superhero_favorite_stats_ranking', table_name='superhero_favorite_stats', if_exists=True)
+    op.drop_table('superhero_favorite_stats', if_exists=True)
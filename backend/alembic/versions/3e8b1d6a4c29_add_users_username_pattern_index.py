@@ -0,0 +1,28 @@
+"""add_users_username_pattern_index
+
+Revision ID: 3e8b1d6a4c29
+Revises: 2c4a9e7d1f05
+Create Date: 2026-10-19 18:27:53.104286
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8b1d6a4c29'
+down_revision: Union[str, None] = '2c4a9e7d1f05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create index for username prefix lookups (LIKE 'base%' can't use the collated unique index)
+    op.create_index('ix_users_username_pattern', 'users', ['username'], unique=False,
+                    postgresql_ops={'username': 'varchar_pattern_ops'})
+
+
+def downgrade() -> None:
+    # Drop username prefix index
+    op.drop_index('ix_users_username_pattern', table_name='users', if_exists=True)
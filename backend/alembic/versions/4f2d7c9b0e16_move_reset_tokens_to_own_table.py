@@ -0,0 +1,60 @@
+"""move_reset_tokens_to_own_table
+
+Revision ID: 4f2d7c9b0e16
+Revises: 3e8b1d6a4c29
+Create Date: 2026-10-19 19:03:41.772958
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2d7c9b0e16'
+down_revision: Union[str, None] = '3e8b1d6a4c29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create password_reset_tokens table (keyed by the token's SHA-256)
+    op.create_table('password_reset_tokens',
+        sa.Column('token_hash', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('token_hash')
+    )
+    op.create_index(op.f('ix_password_reset_tokens_user_id'), 'password_reset_tokens', ['user_id'], unique=False)
+    op.create_index(op.f('ix_password_reset_tokens_expires_at'), 'password_reset_tokens', ['expires_at'], unique=False)
+
+    # Carry over outstanding tokens (hashing is done in Python)
+    connection = op.get_bind()
+    tokens = sa.table('password_reset_tokens',
+        sa.column('token_hash', sa.String()), sa.column('user_id', sa.Integer()), sa.column('expires_at', sa.DateTime(timezone=True)))
+    rows = connection.execute(sa.text(
+        "SELECT id, reset_token, reset_token_expires_at FROM users "
+        "WHERE reset_token IS NOT NULL AND reset_token_expires_at > now()"
+    )).all()
+    if rows:
+        connection.execute(tokens.insert(), [
+            {"token_hash": hashlib.sha256(token.encode("utf-8")).hexdigest(), "user_id": user_id, "expires_at": expires_at}
+            for user_id, token, expires_at in rows
+        ])
+
+    # Drop raw reset token columns from users
+    op.drop_column('users', 'reset_token_expires_at')
+    op.drop_column('users', 'reset_token')
+
+
+def downgrade() -> None:
+    # Restore reset token columns (outstanding tokens can't be recovered from their hashes)
+    op.add_column('users', sa.Column('reset_token', sa.String(length=255), nullable=True))
+    op.add_column('users', sa.Column('reset_token_expires_at', sa.DateTime(timezone=True), nullable=True))
+    op.drop_index(op.f('ix_password_reset_tokens_expires_at'), table_name='password_reset_tokens', if_exists=True)
+    op.drop_index(op.f('ix_password_reset_tokens_user_id'), table_name='password_reset_tokens', if_exists=True)
+    op.drop_table('password_reset_tokens', if_exists=True)
@@ -0,0 +1,33 @@
+"""add_superhero_catalog_version
+
+Revision ID: 5a9c3e1f7b48
+Revises: 4f2d7c9b0e16
+Create Date: 2026-10-19 21:14:52.306118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a9c3e1f7b48'
+down_revision: Union[str, None] = '4f2d7c9b0e16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Single-row counter bumped by every superhero write
+    op.create_table('superhero_catalog_version',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default='1', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO superhero_catalog_version (id, version) VALUES (1, 1)")
+
+
+def downgrade() -> None:
+    op.drop_table('superhero_catalog_version')
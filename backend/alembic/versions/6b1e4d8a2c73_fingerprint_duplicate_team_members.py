@@ -0,0 +1,61 @@
+"""fingerprint_duplicate_team_members
+
+Revision ID: 6b1e4d8a2c73
+Revises: 5a9c3e1f7b48
+Create Date: 2026-10-19 22:07:31.482915
+
+"""
+import hashlib
+from collections import defaultdict
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b1e4d8a2c73'
+down_revision: Union[str, None] = '5a9c3e1f7b48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def roster_fingerprint(superhero_ids):
+    """Frozen copy of the fingerprint at this revision: sorted member multiset"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(",".join(str(hero_id) for hero_id in sorted(superhero_ids)).encode("ascii"))
+    return digest.hexdigest()
+
+
+def upgrade() -> None:
+    # Fingerprints now count repeated heroes; only rosters with a repeated hero change
+    connection = op.get_bind()
+    members = defaultdict(list)
+    for team_id, superhero_id in connection.execute(sa.text(
+        "SELECT team_id, superhero_id FROM team_members WHERE team_id IN ("
+        "SELECT team_id FROM team_members GROUP BY team_id, superhero_id HAVING count(*) > 1)"
+    )):
+        members[team_id].append(superhero_id)
+
+    teams = sa.table('teams', sa.column('id', sa.Integer()), sa.column('roster_fingerprint', sa.String()))
+    for team_id, superhero_ids in members.items():
+        connection.execute(
+            teams.update().where(teams.c.id == team_id).values(roster_fingerprint=roster_fingerprint(superhero_ids))
+        )
+
+
+def downgrade() -> None:
+    # Restore member-set fingerprints for rosters with a repeated hero
+    connection = op.get_bind()
+    members = defaultdict(set)
+    for team_id, superhero_id in connection.execute(sa.text(
+        "SELECT team_id, superhero_id FROM team_members WHERE team_id IN ("
+        "SELECT team_id FROM team_members GROUP BY team_id, superhero_id HAVING count(*) > 1)"
+    )):
+        members[team_id].add(superhero_id)
+
+    teams = sa.table('teams', sa.column('id', sa.Integer()), sa.column('roster_fingerprint', sa.String()))
+    for team_id, superhero_ids in members.items():
+        connection.execute(
+            teams.update().where(teams.c.id == team_id).values(roster_fingerprint=roster_fingerprint(superhero_ids))
+        )
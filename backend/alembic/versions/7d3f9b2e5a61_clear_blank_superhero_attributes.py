@@ -0,0 +1,41 @@
+"""clear_blank_superhero_attributes
+
+Revision ID: 7d3f9b2e5a61
+Revises: 6b1e4d8a2c73
+Create Date: 2026-10-19 22:41:09.735204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3f9b2e5a61'
+down_revision: Union[str, None] = '6b1e4d8a2c73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (superheroes column prefix, dictionary table)
+ATTRIBUTES = [
+    ('publisher', 'publishers'),
+    ('alignment', 'alignments'),
+    ('gender', 'genders'),
+    ('race', 'races'),
+    ('eye_color', 'eye_colors'),
+    ('hair_color', 'hair_colors'),
+]
+
+
+def upgrade() -> None:
+    # Blank attribute values mean unknown: store NULL and drop the blank dictionary entries
+    for column, table in ATTRIBUTES:
+        op.execute(f"UPDATE superheroes SET {column}_id = NULL WHERE {column}_id IN (SELECT id FROM {table} WHERE trim(name) = '')")
+        op.execute(f"DELETE FROM {table} WHERE trim(name) = ''")
+    # Cached catalog snapshots still carry the blank values
+    op.execute("UPDATE superhero_catalog_version SET version = version + 1, updated_at = now()")
+
+
+def downgrade() -> None:
+    # Blank values are not restored: NULL already meant unknown before this revision
+    pass
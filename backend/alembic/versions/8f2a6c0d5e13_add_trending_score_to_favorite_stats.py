@@ -0,0 +1,30 @@
+"""add_trending_score_to_favorite_stats
+
+Revision ID: 8f2a6c0d5e13
+Revises: 3c7d9a1e4b52
+Create Date: 2026-10-19 10:03:17.540912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2a6c0d5e13'
+down_revision: Union[str, None] = '3c7d9a1e4b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Add time-decayed trending score columns to superhero_favorite_stats
+    op.add_column('superhero_favorite_stats', sa.Column('trending_score', sa.Float(), server_default='0', nullable=False))
+    op.add_column('superhero_favorite_stats', sa.Column('trending_updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+
+
+def downgrade() -> None:
+    # Remove trending score columns
+    op.drop_column('superhero_favorite_stats', 'trending_updated_at')
+    op.drop_column('superhero_favorite_stats', 'trending_score')
@@ -0,0 +1,46 @@
+"""add_superhero_co_favorites_table
+
+Revision ID: a41e7b9c2d68
+Revises: 8f2a6c0d5e13
+Create Date: 2026-10-19 11:26:05.902377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41e7b9c2d68'
+down_revision: Union[str, None] = '8f2a6c0d5e13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create superhero_co_favorites table
+    op.create_table('superhero_co_favorites',
+        sa.Column('superhero_id', sa.Integer(), nullable=False),
+        sa.Column('other_superhero_id', sa.Integer(), nullable=False),
+        sa.Column('co_count', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['superhero_id'], ['superheroes.id'], ),
+        sa.ForeignKeyConstraint(['other_superhero_id'], ['superheroes.id'], ),
+        sa.PrimaryKeyConstraint('superhero_id', 'other_superhero_id')
+    )
+    op.create_index('ix_superhero_co_favorites_ranking', 'superhero_co_favorites', ['superhero_id', 'co_count'], unique=False)
+
+    # Backfill from existing favorites
+    op.execute(
+        "INSERT INTO superhero_co_favorites (superhero_id, other_superhero_id, co_count) "
+        "SELECT a.superhero_id, b.superhero_id, COUNT(*) "
+        "FROM user_favorites a JOIN user_favorites b "
+        "ON a.user_id = b.user_id AND a.superhero_id <> b.superhero_id "
+        "GROUP BY a.superhero_id, b.superhero_id"
+    )
+
+
+def downgrade() -> None:
+    # Drop superhero_co_favorites table
+    op.drop_index('ix_superhero_co_favorites_ranking', table_name='superhero_co_favorites', if_exists=True)
+    op.drop_table('superhero_co_favorites', if_exists=True)
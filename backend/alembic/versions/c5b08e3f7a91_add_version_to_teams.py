@@ -0,0 +1,28 @@
+"""add_version_to_teams
+
+Revision ID: c5b08e3f7a91
+Revises: a41e7b9c2d68
+Create Date: 2026-10-19 12:41:53.118460
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5b08e3f7a91'
+down_revision: Union[str, None] = 'a41e7b9c2d68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Add optimistic concurrency version column to teams
+    op.add_column('teams', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    # Remove version column from teams
+    op.drop_column('teams', 'version')
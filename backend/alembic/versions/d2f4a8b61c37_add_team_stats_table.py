@@ -0,0 +1,81 @@
+"""add_team_stats_table
+
+Revision ID: d2f4a8b61c37
+Revises: c5b08e3f7a91
+Create Date: 2026-10-19 13:35:26.664018
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f4a8b61c37'
+down_revision: Union[str, None] = 'c5b08e3f7a91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create team_stats table
+    op.create_table('team_stats',
+        sa.Column('team_id', sa.Integer(), nullable=False),
+        sa.Column('member_count', sa.Integer(), nullable=False),
+        sa.Column('total_power', sa.Integer(), nullable=False),
+        sa.Column('total_intelligence', sa.Integer(), nullable=False),
+        sa.Column('total_strength', sa.Integer(), nullable=False),
+        sa.Column('total_speed', sa.Integer(), nullable=False),
+        sa.Column('total_durability', sa.Integer(), nullable=False),
+        sa.Column('total_power_stat', sa.Integer(), nullable=False),
+        sa.Column('total_combat', sa.Integer(), nullable=False),
+        sa.Column('alignment_distribution', sa.JSON(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('team_id')
+    )
+
+    # Backfill stats for existing teams
+    op.execute("""
+        INSERT INTO team_stats (
+            team_id, member_count, total_power, total_intelligence, total_strength, total_speed,
+            total_durability, total_power_stat, total_combat, alignment_distribution
+        )
+        SELECT
+            t.id,
+            COUNT(s.id),
+            COALESCE(SUM(COALESCE(s.intelligence, 0) + COALESCE(s.strength, 0) + COALESCE(s.speed, 0)
+                + COALESCE(s.durability, 0) + COALESCE(s.power, 0) + COALESCE(s.combat, 0)), 0),
+            COALESCE(SUM(COALESCE(s.intelligence, 0)), 0),
+            COALESCE(SUM(COALESCE(s.strength, 0)), 0),
+            COALESCE(SUM(COALESCE(s.speed, 0)), 0),
+            COALESCE(SUM(COALESCE(s.durability, 0)), 0),
+            COALESCE(SUM(COALESCE(s.power, 0)), 0),
+            COALESCE(SUM(COALESCE(s.combat, 0)), 0),
+            '{}'::json
+        FROM teams t
+        LEFT JOIN team_members tm ON tm.team_id = t.id
+        LEFT JOIN superheroes s ON s.id = tm.superhero_id
+        GROUP BY t.id
+    """)
+    op.execute("""
+        UPDATE team_stats ts SET alignment_distribution = a.distribution
+        FROM (
+            SELECT team_id, json_object_agg(alignment, hero_count) AS distribution
+            FROM (
+                SELECT tm.team_id, s.alignment, COUNT(*) AS hero_count
+                FROM team_members tm
+                JOIN superheroes s ON s.id = tm.superhero_id
+                WHERE s.alignment IS NOT NULL AND s.alignment <> ''
+                GROUP BY tm.team_id, s.alignment
+            ) counts
+            GROUP BY team_id
+        ) a
+        WHERE ts.team_id = a.team_id
+    """)
+
+
+def downgrade() -> None:
+    # Drop team_stats table
+    op.drop_table('team_stats', if_exists=True)
@@ -0,0 +1,37 @@
+"""add_team_ratings_table
+
+Revision ID: e7c3a95f1b24
+Revises: d2f4a8b61c37
+Create Date: 2026-10-19 15:12:48.317204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c3a95f1b24'
+down_revision: Union[str, None] = 'd2f4a8b61c37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create team_ratings table (populated by the ladder background job)
+    op.create_table('team_ratings',
+        sa.Column('team_id', sa.Integer(), nullable=False),
+        sa.Column('rating', sa.Float(), server_default='1500', nullable=False),
+        sa.Column('matches', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('team_id')
+    )
+    op.create_index('ix_team_ratings_ladder', 'team_ratings', [sa.text('rating DESC'), 'team_id'], unique=False)
+
+
+def downgrade() -> None:
+    # Drop team_ratings table
+    op.drop_index('ix_team_ratings_ladder', table_name='team_ratings', if_exists=True)
+    op.drop_table('team_ratings', if_exists=True)
@@ -0,0 +1,87 @@
+"""add_team_roster_signatures
+
+Revision ID: f1d6b20e8c47
+Revises: e7c3a95f1b24
+Create Date: 2026-10-19 16:02:11.540937
+
+"""
+import hashlib
+from collections import defaultdict
+from typing import Sequence, Union
+
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1d6b20e8c47'
+down_revision: Union[str, None] = 'e7c3a95f1b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of the signatures as defined at this revision (app code may change later)
+LSH_BANDS = 16
+LSH_ROWS = 2
+NUM_HASHES = LSH_BANDS * LSH_ROWS
+_PRIME = (1 << 31) - 1
+_COEFFICIENTS = np.random.default_rng(20261019).integers(1, _PRIME, size=(2, NUM_HASHES), dtype=np.int64)
+
+
+def roster_fingerprint(superhero_ids):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(",".join(str(hero_id) for hero_id in sorted(set(superhero_ids))).encode("ascii"))
+    return digest.hexdigest()
+
+
+def lsh_buckets(superhero_ids):
+    members = np.array(sorted(set(superhero_ids)), dtype=np.int64)
+    if not len(members):
+        return []
+    hashed = (np.outer(members, _COEFFICIENTS[0]) + _COEFFICIENTS[1]) % _PRIME
+    bands = hashed.min(axis=0).reshape(LSH_BANDS, LSH_ROWS)
+    return [
+        (band, int.from_bytes(hashlib.blake2b(values.tobytes(), digest_size=8).digest(), "big", signed=True))
+        for band, values in enumerate(bands)
+    ]
+
+
+def upgrade() -> None:
+    # Add roster fingerprint to teams
+    op.add_column('teams', sa.Column('roster_fingerprint', sa.String(length=32), nullable=True))
+    op.create_index(op.f('ix_teams_roster_fingerprint'), 'teams', ['roster_fingerprint'], unique=False)
+
+    # Create team_lsh_buckets table
+    op.create_table('team_lsh_buckets',
+        sa.Column('band', sa.Integer(), nullable=False),
+        sa.Column('bucket', sa.BigInteger(), nullable=False),
+        sa.Column('team_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('band', 'bucket', 'team_id')
+    )
+    op.create_index(op.f('ix_team_lsh_buckets_team_id'), 'team_lsh_buckets', ['team_id'], unique=False)
+
+    # Backfill signatures for existing teams (hashing is done in Python)
+    connection = op.get_bind()
+    members = defaultdict(list)
+    for team_id, superhero_id in connection.execute(sa.text("SELECT team_id, superhero_id FROM team_members")):
+        members[team_id].append(superhero_id)
+
+    teams = sa.table('teams', sa.column('id', sa.Integer()), sa.column('roster_fingerprint', sa.String()))
+    buckets = sa.table('team_lsh_buckets', sa.column('band', sa.Integer()), sa.column('bucket', sa.BigInteger()), sa.column('team_id', sa.Integer()))
+    for team_id, superhero_ids in members.items():
+        connection.execute(
+            teams.update().where(teams.c.id == team_id).values(roster_fingerprint=roster_fingerprint(superhero_ids))
+        )
+        connection.execute(
+            buckets.insert(),
+            [{"team_id": team_id, "band": band, "bucket": bucket} for band, bucket in lsh_buckets(superhero_ids)]
+        )
+
+
+def downgrade() -> None:
+    # Drop team_lsh_buckets table and roster fingerprint
+    op.drop_index(op.f('ix_team_lsh_buckets_team_id'), table_name='team_lsh_buckets', if_exists=True)
+    op.drop_table('team_lsh_buckets', if_exists=True)
+    op.drop_index(op.f('ix_teams_roster_fingerprint'), table_name='teams', if_exists=True)
+    op.drop_column('teams', 'roster_fingerprint')
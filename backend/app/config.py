@@ -32,6 +32,56 @@ class Settings:
     FROM_EMAIL: str = os.getenv("FROM_EMAIL", SMTP_USERNAME)
     SMTP_USE_TLS: bool = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
 
+    # Background jobs
+    BACKGROUND_JOBS_ENABLED: bool = os.getenv("BACKGROUND_JOBS_ENABLED", "true").lower() == "true"
+    FAVORITE_COUNT_RECONCILE_INTERVAL_SECONDS: int = int(os.getenv("FAVORITE_COUNT_RECONCILE_INTERVAL_SECONDS", "3600"))
+
+    # Trending heroes
+    TRENDING_HALF_LIFE_HOURS: float = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "24"))
+    TRENDING_WINDOW_DAYS: int = int(os.getenv("TRENDING_WINDOW_DAYS", "14"))
+    TRENDING_REBUILD_INTERVAL_SECONDS: int = int(os.getenv("TRENDING_REBUILD_INTERVAL_SECONDS", "21600"))
+
+    # Co-favorite recommendations
+    CO_FAVORITE_REBUILD_INTERVAL_SECONDS: int = int(os.getenv("CO_FAVORITE_REBUILD_INTERVAL_SECONDS", "86400"))
+
+    # In-process superhero catalog
+    CATALOG_TTL_SECONDS: int = int(os.getenv("CATALOG_TTL_SECONDS", "300"))
+
+    # Expired password reset token sweep
+    PASSWORD_RESET_SWEEP_INTERVAL_SECONDS: int = int(os.getenv("PASSWORD_RESET_SWEEP_INTERVAL_SECONDS", "900"))
+
+    # Team rating ladder
+    TEAM_LADDER_REBUILD_INTERVAL_SECONDS: int = int(os.getenv("TEAM_LADDER_REBUILD_INTERVAL_SECONDS", "3600"))
+    TEAM_LADDER_ROUNDS: int = int(os.getenv("TEAM_LADDER_ROUNDS", "64"))
+    TEAM_LADDER_K_FACTOR: float = float(os.getenv("TEAM_LADDER_K_FACTOR", "32"))
+    TEAM_LADDER_PLACEMENT_PROBES: int = int(os.getenv("TEAM_LADDER_PLACEMENT_PROBES", "12"))
+    TEAM_LADDER_PLACEMENT_PEERS: int = int(os.getenv("TEAM_LADDER_PLACEMENT_PEERS", "16"))
+
+    # Team comparison result cache (entries per process)
+    COMPARISON_CACHE_SIZE: int = int(os.getenv("COMPARISON_CACHE_SIZE", "10000"))
+
+    # Battle simulation
+    SIMULATION_DEFAULT_TRIALS: int = int(os.getenv("SIMULATION_DEFAULT_TRIALS", "10000"))
+    SIMULATION_MAX_TRIALS: int = int(os.getenv("SIMULATION_MAX_TRIALS", "1000000"))
+    SIMULATION_TIME_BUDGET_MS: int = int(os.getenv("SIMULATION_TIME_BUDGET_MS", "2000"))
+    SIMULATION_WORKERS: int = int(os.getenv("SIMULATION_WORKERS", "2"))
+    SIMULATION_PARALLEL_THRESHOLD: int = int(os.getenv("SIMULATION_PARALLEL_THRESHOLD", "200000"))
+    SIMULATION_STAT_STDDEV: float = float(os.getenv("SIMULATION_STAT_STDDEV", "0.25"))
+
+    # bcrypt cost factor (pick with calibrate_password_hash.py; older hashes are upgraded on login)
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+    # Password hashing executor (bcrypt threads per process and how many more requests may wait for one)
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "16"))
+
+    # Verified JWT claims cache (entries per process, 0 disables)
+    JWT_DECODE_CACHE_SIZE: int = int(os.getenv("JWT_DECODE_CACHE_SIZE", "10000"))
+
+    # Authenticated principal cache (entries per process; edits in other processes are picked up after the TTL)
+    AUTH_PRINCIPAL_CACHE_SIZE: int = int(os.getenv("AUTH_PRINCIPAL_CACHE_SIZE", "10000"))
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+
     # Project settings
     PROJECT_NAME: str = "Superhero API"
     VERSION: str = "1.0.0"
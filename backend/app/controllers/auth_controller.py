@@ -1,15 +1,23 @@
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 import secrets
 from ..repository.user_repository import UserRepository
 from ..schemas.auth import UserCreate, UserResponse, APIResponse, VerifyTokenResponse
-from ..utils.auth import get_password_hash, create_access_token
+from ..utils.auth import get_password_hash, verify_and_update_password, create_access_token
+from ..utils.hashing_executor import HashingOverloadedError
 from ..utils import get_logger, create_success_response, create_error_response, create_user_data
 from ..service import send_password_reset_email
 from ..config import settings
 
 logger = get_logger("auth_controller")
 
+# Returned when the password hashing queue is full (routes answer 503)
+BUSY_MESSAGE = "Server is busy, please try again shortly"
+
+# Username allocations to try before giving up when concurrent signups keep taking the same name
+USERNAME_ALLOCATION_ATTEMPTS = 5
+
 class AuthController:
     def __init__(self, db: Session):
         self.db = db
@@ -18,16 +26,6 @@ class AuthController:
     def register_user(self, user_data: UserCreate) -> APIResponse:
         """Register a new user"""
         try:
-            # Generate username from email (part before @)
-            base_username = user_data.email.split('@')[0]
-            username = base_username
-            
-            # Ensure username is unique by appending numbers if needed
-            counter = 1
-            while self.user_repo.get_user_by_username(username):
-                username = f"{base_username}{counter}"
-                counter += 1
-            
             # Check if user already exists by email
             if self.user_repo.get_user_by_email(user_data.email):
                 logger.warning(f"Registration failed - user already exists: {user_data.email}")
@@ -36,7 +34,6 @@ class AuthController:
             # Create user data
             user_dict = {
                 "email": user_data.email,
-                "username": username,
                 "first_name": user_data.first_name,
                 "last_name": user_data.last_name,
                 "password_hash": get_password_hash(user_data.password),
@@ -44,10 +41,28 @@ class AuthController:
                 "is_active": True
             }
 
-            # Create user
-            user = self.user_repo.create_user(user_dict)
-            return create_success_response("User registered successfully", {"user": create_user_data(user)})
+            # Username from email (part before @), with a numeric suffix when taken. Allocation is a
+            # single query; a concurrent signup that takes the same name trips the unique constraint
+            # and we allocate again.
+            base_username = user_data.email.split('@')[0]
+            for _ in range(USERNAME_ALLOCATION_ATTEMPTS):
+                user_dict["username"] = self.user_repo.get_next_username(base_username)
+                try:
+                    user = self.user_repo.create_user(user_dict)
+                except IntegrityError:
+                    self.db.rollback()
+                    if self.user_repo.get_user_by_email(user_data.email):
+                        logger.warning(f"Registration failed - user already exists: {user_data.email}")
+                        return create_error_response("User with this email already exists")
+                    continue
+                return create_success_response("User registered successfully", {"user": create_user_data(user)})
+
+            logger.error(f"Registration error for {user_data.email}: could not allocate a username for '{base_username}'")
+            return create_error_response("Registration failed due to server error")
 
+        except HashingOverloadedError:
+            logger.warning(f"Registration shed - password hashing queue full: {user_data.email}")
+            return create_error_response(BUSY_MESSAGE)
         except Exception as e:
             logger.error(f"Registration error for {user_data.email}: {e}")
             return create_error_response("Registration failed due to server error")
@@ -60,11 +75,13 @@ class AuthController:
                 logger.warning(f"Login failed - user not found or inactive: {email}")
                 return create_error_response("Invalid email or password")
 
-            # Check password
-            from ..utils.auth import verify_password
-            if not verify_password(password, user.password_hash):
+            # Check password (and get a replacement hash if the stored one uses an outdated cost)
+            valid, new_hash = verify_and_update_password(password, user.password_hash)
+            if not valid:
                 logger.warning(f"Login failed - invalid password: {email}")
                 return create_error_response("Invalid email or password")
+            if new_hash:
+                self._upgrade_password_hash(user, new_hash)
 
             # Generate access token (30 days)
             access_token_expires = timedelta(days=30)
@@ -80,10 +97,22 @@ class AuthController:
                 "user": create_user_data(user)
             })
 
+        except HashingOverloadedError:
+            logger.warning(f"Login shed - password hashing queue full: {email}")
+            return create_error_response(BUSY_MESSAGE)
         except Exception as e:
             logger.error(f"Login error for {email}: {e}")
             return create_error_response("Login failed due to server error")
 
+    def _upgrade_password_hash(self, user, new_hash: str):
+        """Store a rehashed password after a successful login (failure here must not fail the login)"""
+        try:
+            self.user_repo.update_user(user, {"password_hash": new_hash})
+            logger.info(f"Upgraded password hash cost for user {user.id}")
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"Could not upgrade password hash for user {user.id}: {e}")
+
     def get_current_user(self, email: str) -> APIResponse:
         """Get current user by email"""
         try:
@@ -113,8 +142,8 @@ class AuthController:
             reset_token = secrets.token_urlsafe(32)
             expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)
 
-            # Set reset token
-            self.user_repo.set_password_reset_token(user, reset_token, expires_at)
+            # Store the token's hash (the raw token only goes out in the email)
+            self.user_repo.create_password_reset_token(user, reset_token, expires_at)
 
             # Send password reset email
             from ..service.email_service import email_service
@@ -140,19 +169,22 @@ class AuthController:
     def reset_password(self, token: str, new_password: str) -> APIResponse:
         """Reset password using token"""
         try:
-            user = self.user_repo.get_user_by_reset_token(token)
-            if not user or not self.user_repo.is_reset_token_valid(user):
+            reset_token = self.user_repo.get_password_reset_token(token)
+            if not reset_token or not reset_token.user.is_active:
                 logger.warning("Invalid or expired password reset token")
                 return create_error_response("Invalid or expired reset token")
 
-            # Update password
-            user.password_hash = get_password_hash(new_password)
-            user.reset_token = None
-            user.reset_token_expires_at = None
-
-            self.user_repo.update_user(user, {})
+            # The lookup above only spares the hashing for bad tokens; consuming the
+            # token and storing the new hash happen atomically, so a token works once
+            password_hash = get_password_hash(new_password)
+            if not self.user_repo.reset_password_with_token(token, password_hash):
+                logger.warning("Password reset token already used or expired")
+                return create_error_response("Invalid or expired reset token")
             return create_success_response("Password has been reset successfully")
 
+        except HashingOverloadedError:
+            logger.warning("Password reset shed - password hashing queue full")
+            return create_error_response(BUSY_MESSAGE)
         except Exception as e:
             logger.error(f"Password reset error: {e}")
             return create_error_response("Failed to reset password")
@@ -160,12 +192,12 @@ class AuthController:
     def verify_reset_token(self, token: str) -> APIResponse:
         """Verify if a reset token is valid"""
         try:
-            user = self.user_repo.get_user_by_reset_token(token)
-            if not user or not self.user_repo.is_reset_token_valid(user):
+            reset_token = self.user_repo.get_password_reset_token(token)
+            if not reset_token or not reset_token.user.is_active:
                 return create_success_response("Token validation completed", {"valid": False, "expires_at": None})
 
             # Token is valid
-            expires_at = user.reset_token_expires_at.isoformat() if user.reset_token_expires_at else None
+            expires_at = reset_token.expires_at.isoformat()
             return create_success_response("Token validation completed", {"valid": True, "expires_at": expires_at})
 
         except Exception as e:
@@ -52,6 +52,20 @@ class FavoriteController:
             logger.error(f"Error getting favorites: {e}")
             return create_error_response("Failed to retrieve favorites")
 
+    def get_recommendations(self, user_id: int, limit: int = 10):
+        """Recommend superheroes based on what fans of the user's favorites also favorited"""
+        try:
+            ranked = self.favorite_repo.get_recommended_for_user(user_id, limit)
+            items = []
+            for hero, score in ranked:
+                data = create_superhero_data(hero)
+                data["recommendation_score"] = int(score)
+                items.append(data)
+            return create_success_response("Recommendations retrieved successfully", items)
+        except Exception as e:
+            logger.error(f"Error getting recommendations: {e}")
+            return create_error_response("Failed to retrieve recommendations")
+
     def check_favorite(self, user_id: int, superhero_id: int):
         """Check if a superhero is favorited"""
         try:
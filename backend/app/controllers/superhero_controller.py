@@ -2,6 +2,11 @@ from sqlalchemy.orm import Session
 from typing import Optional
 from ..repository.superhero_repository import SuperheroRepository
 from ..repository.favorite_repository import FavoriteRepository
+from ..repository.team_repository import TeamRepository
+from ..repository.affiliation_repository import AffiliationRepository
+from ..service.team_scoring import STAT_FIELDS
+from ..service.superhero_catalog import superhero_catalog
+from ..service.affiliation_graph import affiliation_graph
 from ..schemas.superhero import SuperheroUpdate, SuperheroResponse
 from ..utils import get_logger, create_success_response, create_error_response, create_superhero_data
 import math
@@ -30,12 +35,19 @@ class SuperheroController:
             favorite_ids = set()
             if user_id:
                 favorite_ids = set(self.favorite_repo.get_user_favorite_ids(user_id))
-            
+
+            # Popularity for the page in one lookup against the counter table
+            favorite_counts = self.favorite_repo.get_favorite_counts([item.id for item in items])
+
             return create_success_response(
                 "Superheroes retrieved successfully",
                 {
                     "items": [
-                        create_superhero_data(item, is_favorite=(item.id in favorite_ids)) 
+                        create_superhero_data(
+                            item,
+                            is_favorite=(item.id in favorite_ids),
+                            favorite_count=favorite_counts.get(item.id, 0)
+                        )
                         for item in items
                     ],
                     "total": total,
@@ -54,15 +66,113 @@ class SuperheroController:
             superhero = self.superhero_repo.get_by_id(superhero_id)
             if not superhero:
                 return create_error_response("Superhero not found")
-            
+
+            favorite_count = self.favorite_repo.get_favorite_counts([superhero.id]).get(superhero.id, 0)
             return create_success_response(
                 "Superhero retrieved successfully",
-                create_superhero_data(superhero)
+                create_superhero_data(superhero, favorite_count=favorite_count)
             )
         except Exception as e:
             logger.error(f"Error getting superhero {superhero_id}: {e}")
             return create_error_response("Failed to retrieve superhero")
 
+    def get_most_favorited(self, limit: int = 10):
+        """Get the most favorited superheroes"""
+        try:
+            ranked = self.favorite_repo.get_most_favorited(limit)
+            return create_success_response(
+                "Most favorited superheroes retrieved successfully",
+                [create_superhero_data(hero, favorite_count=count) for hero, count in ranked]
+            )
+        except Exception as e:
+            logger.error(f"Error getting most favorited superheroes: {e}")
+            return create_error_response("Failed to retrieve most favorited superheroes")
+
+    def get_trending(self, limit: int = 10):
+        """Get superheroes ranked by recent favorite activity"""
+        try:
+            ranked = self.favorite_repo.get_trending(limit)
+            items = []
+            for hero, score in ranked:
+                data = create_superhero_data(hero)
+                data["trending_score"] = round(score, 4)
+                items.append(data)
+            return create_success_response("Trending superheroes retrieved successfully", items)
+        except Exception as e:
+            logger.error(f"Error getting trending superheroes: {e}")
+            return create_error_response("Failed to retrieve trending superheroes")
+
+    def get_facets(self):
+        """Count heroes per publisher, alignment, gender, race, eye color and hair color"""
+        try:
+            return create_success_response(
+                "Superhero facets retrieved successfully",
+                superhero_catalog.get(self.db).facets()
+            )
+        except Exception as e:
+            logger.error(f"Error getting superhero facets: {e}")
+            return create_error_response("Failed to retrieve superhero facets")
+
+    def get_also_favorited(self, superhero_id: int, limit: int = 10):
+        """Get heroes that fans of this superhero also favorited"""
+        try:
+            superhero = self.superhero_repo.get_by_id(superhero_id)
+            if not superhero:
+                return create_error_response("Superhero not found")
+
+            ranked = self.favorite_repo.get_also_favorited(superhero_id, limit)
+            items = []
+            for hero, co_count in ranked:
+                data = create_superhero_data(hero)
+                data["co_favorite_count"] = co_count
+                items.append(data)
+            return create_success_response("Co-favorited superheroes retrieved successfully", items)
+        except Exception as e:
+            logger.error(f"Error getting co-favorites for superhero {superhero_id}: {e}")
+            return create_error_response("Failed to retrieve co-favorited superheroes")
+
+    def get_teammates(self, superhero_id: int, limit: int = 20, include_former: bool = False):
+        """Get heroes that share a group with this superhero, most shared groups first"""
+        try:
+            superhero = self.superhero_repo.get_by_id(superhero_id)
+            if not superhero:
+                return create_error_response("Superhero not found")
+
+            ranked = affiliation_graph.get(self.db).teammates(superhero_id, limit, include_former)
+            heroes = {hero.id: hero for hero in self.superhero_repo.get_by_ids([entry["superhero_id"] for entry in ranked])}
+            items = []
+            for entry in ranked:
+                hero = heroes.get(entry["superhero_id"])
+                if hero is None:
+                    continue
+                data = create_superhero_data(hero)
+                data["shared_groups"] = entry["shared_groups"]
+                items.append(data)
+            return create_success_response("Teammates retrieved successfully", items)
+        except Exception as e:
+            logger.error(f"Error getting teammates for superhero {superhero_id}: {e}")
+            return create_error_response("Failed to retrieve teammates")
+
+    def get_shared_groups(self, superhero_id: int, other_id: int, include_former: bool = False):
+        """Get the groups two superheroes have in common"""
+        try:
+            found = {hero.id for hero in self.superhero_repo.get_by_ids([superhero_id, other_id])}
+            if superhero_id not in found or other_id not in found:
+                return create_error_response("Superhero not found")
+
+            index = affiliation_graph.get(self.db)
+            return create_success_response(
+                "Shared groups retrieved successfully",
+                {
+                    "superhero_ids": [superhero_id, other_id],
+                    "groups": index.shared_groups(superhero_id, other_id, include_former),
+                    "relation": index.relatives.get(superhero_id, {}).get(other_id)
+                }
+            )
+        except Exception as e:
+            logger.error(f"Error getting shared groups for superheroes {superhero_id} and {other_id}: {e}")
+            return create_error_response("Failed to retrieve shared groups")
+
     def update(self, superhero_id: int, update_data: SuperheroUpdate, user_role: str):
         """Update superhero (admin only)"""
         if user_role != "admin":
@@ -74,7 +184,23 @@ class SuperheroController:
                 return create_error_response("Superhero not found")
 
             update_dict = update_data.model_dump(exclude_unset=True)
+            previous_names = (superhero.name, superhero.full_name)
             updated = self.superhero_repo.update(superhero, update_dict)
+
+            # Keep materialized team stats in sync with the hero's stats
+            if any(field in update_dict for field in STAT_FIELDS + ["alignment"]):
+                TeamRepository(self.db).refresh_stats_for_superhero(superhero_id)
+            superhero_catalog.invalidate()
+
+            # Re-parse this hero's edges in the affiliation graph
+            if any(field in update_dict for field in ("group_affiliation", "relatives")):
+                AffiliationRepository(self.db).rebuild_for_superhero(updated)
+                affiliation_graph.invalidate()
+
+            # Other heroes' relatives are linked by name: relink those naming this hero before or after a rename
+            if previous_names != (updated.name, updated.full_name):
+                AffiliationRepository(self.db).relink_relations(superhero_id, previous_names + (updated.name, updated.full_name))
+                affiliation_graph.invalidate()
             
             return create_success_response(
                 "Superhero updated successfully",
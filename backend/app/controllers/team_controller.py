@@ -1,7 +1,21 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.orm.exc import StaleDataError
+from typing import Dict, List, Optional
 from ..repository.team_repository import TeamRepository
 from ..repository.superhero_repository import SuperheroRepository
+from ..repository.favorite_repository import FavoriteRepository
+from ..service.team_scoring import (
+    calculate_team_stats, team_stats_to_dict, compare_team_stats, build_factor_matrix, round_robin,
+    STAT_FIELDS
+)
+from ..service.battle_simulation import simulate_battle
+from ..service.superhero_catalog import superhero_catalog
+from ..service.team_optimizer import optimize_team, OptimizationError
+from ..service.counter_team import find_counter_team
+from ..service.comparison_cache import get_matchup_stats
+from ..service.team_signatures import jaccard
+from ..service.affiliation_graph import affiliation_graph
+from ..service.ladder_placement import ladder_placement
 from ..utils import get_logger, create_success_response, create_error_response, create_superhero_data
 import random
 
@@ -23,14 +37,16 @@ class TeamController:
                 return create_error_response("Team must have at least one member")
 
             # Validate all superheroes exist
-            for hero_id in superhero_ids:
-                if not self.superhero_repo.get_by_id(hero_id):
-                    return create_error_response(f"Superhero with ID {hero_id} not found")
+            missing_error = self._validate_superhero_ids(superhero_ids)
+            if missing_error:
+                return missing_error
 
             team = self.team_repo.create_team(name, description, user_id, superhero_ids)
+            team_data = self._team_to_dict(team)
+            self._place_on_ladder(team.id)
             return create_success_response(
                 "Team created successfully",
-                self._team_to_dict(team)
+                team_data
             )
         except Exception as e:
             logger.error(f"Error creating team: {e}")
@@ -48,6 +64,38 @@ class TeamController:
             logger.error(f"Error getting teams: {e}")
             return create_error_response("Failed to retrieve teams")
 
+    def get_user_team_summaries(self, user_id: int, limit: int = 20, after_updated_at=None, after_id: Optional[int] = None):
+        """Get a page of the user's teams without hero payloads"""
+        try:
+            if (after_updated_at is None) != (after_id is None):
+                return create_error_response("after_updated_at and after_id must be provided together")
+
+            rows = self.team_repo.get_user_team_summaries(user_id, limit, after_updated_at, after_id)
+            thumbnails = self.team_repo.get_member_thumbnails([row.id for row in rows]) if rows else {}
+
+            teams = [
+                {
+                    "id": row.id,
+                    "name": row.name,
+                    "member_count": row.member_count or 0,
+                    "total_power": row.total_power or 0,
+                    "members": thumbnails.get(row.id, []),
+                    "updated_at": row.updated_at.isoformat() if row.updated_at else None
+                }
+                for row in rows
+            ]
+            next_cursor = None
+            if len(rows) == limit:
+                next_cursor = {"after_updated_at": rows[-1].updated_at.isoformat(), "after_id": rows[-1].id}
+
+            return create_success_response(
+                "Teams retrieved successfully",
+                {"teams": teams, "next_cursor": next_cursor}
+            )
+        except Exception as e:
+            logger.error(f"Error getting team summaries: {e}")
+            return create_error_response("Failed to retrieve teams")
+
     def get_team_by_id(self, team_id: int, user_id: int):
         """Get team by ID"""
         try:
@@ -63,24 +111,34 @@ class TeamController:
             logger.error(f"Error getting team: {e}")
             return create_error_response("Failed to retrieve team")
 
-    def update_team(self, team_id: int, user_id: int, name: Optional[str], description: Optional[str], superhero_ids: Optional[List[int]]):
-        """Update a team"""
+    def update_team(self, team_id: int, user_id: int, name: Optional[str], description: Optional[str], superhero_ids: Optional[List[int]], version: Optional[int] = None):
+        """Update a team (optionally only if it is still at the given version)"""
         try:
             team = self.team_repo.get_team_by_id(team_id, user_id)
             if not team:
                 return create_error_response("Team not found")
 
+            if version is not None and team.version != version:
+                return create_error_response("Team was modified by another request, please reload and try again")
+
             if superhero_ids is not None:
                 # Validate all superheroes exist
-                for hero_id in superhero_ids:
-                    if not self.superhero_repo.get_by_id(hero_id):
-                        return create_error_response(f"Superhero with ID {hero_id} not found")
+                missing_error = self._validate_superhero_ids(superhero_ids)
+                if missing_error:
+                    return missing_error
 
             updated_team = self.team_repo.update_team(team, name, description, superhero_ids)
+            team_data = self._team_to_dict(updated_team)
+            if superhero_ids is not None:
+                self._place_on_ladder(team_id)
             return create_success_response(
                 "Team updated successfully",
-                self._team_to_dict(updated_team)
+                team_data
             )
+        except StaleDataError:
+            self.db.rollback()
+            logger.warning(f"Concurrent update detected for team {team_id}")
+            return create_error_response("Team was modified by another request, please reload and try again")
         except Exception as e:
             logger.error(f"Error updating team: {e}")
             return create_error_response("Failed to update team")
@@ -191,161 +249,54 @@ class TeamController:
             logger.error(f"Error recommending random team: {e}")
             return create_error_response("Failed to recommend team")
 
-    def compare_teams(self, team1_id: int, team2_id: int, user_id: int):
-        """Compare two teams and predict a winner"""
+    def compare_teams(
+        self,
+        team1_id: int,
+        team2_id: int,
+        user_id: int,
+        simulate: bool = False,
+        trials: Optional[int] = None,
+        seed: Optional[int] = None,
+        time_budget_ms: Optional[int] = None
+    ):
+        """Compare two teams and predict a winner (optionally with a Monte Carlo simulation)"""
         try:
-            # Get both teams
-            team1 = self.team_repo.get_team_by_id(team1_id, user_id)
-            team2 = self.team_repo.get_team_by_id(team2_id, user_id)
+            # Names, member IDs and materialized stats of both teams in one query
+            rosters = self.team_repo.get_team_rosters([team1_id, team2_id], user_id)
 
-            if not team1:
+            if team1_id not in rosters:
                 return create_error_response(f"Team {team1_id} not found")
-            if not team2:
+            if team2_id not in rosters:
                 return create_error_response(f"Team {team2_id} not found")
 
-            # Get superheroes for both teams
-            heroes1 = self.team_repo.get_team_superheroes(team1_id)
-            heroes2 = self.team_repo.get_team_superheroes(team2_id)
-
-            if not heroes1 or not heroes2:
+            name1, ids1, team_stats1 = rosters[team1_id]
+            name2, ids2, team_stats2 = rosters[team2_id]
+            if not ids1 or not ids2:
                 return create_error_response("Both teams must have at least one member")
 
-            # Calculate team statistics
-            def calculate_team_stats(heroes):
-                """Calculate total power, averages, and alignment distribution"""
-                total_power = 0
-                total_intelligence = 0
-                total_strength = 0
-                total_speed = 0
-                total_durability = 0
-                total_power_stat = 0
-                total_combat = 0
-                
-                alignment_counts = {"good": 0, "bad": 0, "neutral": 0}
-                
-                for hero in heroes:
-                    stats = [
-                        hero.intelligence or 0,
-                        hero.strength or 0,
-                        hero.speed or 0,
-                        hero.durability or 0,
-                        hero.power or 0,
-                        hero.combat or 0
-                    ]
-                    total_power += sum(stats)
-                    total_intelligence += stats[0]
-                    total_strength += stats[1]
-                    total_speed += stats[2]
-                    total_durability += stats[3]
-                    total_power_stat += stats[4]
-                    total_combat += stats[5]
-                    
-                    if hero.alignment:
-                        alignment_counts[hero.alignment] = alignment_counts.get(hero.alignment, 0) + 1
-
-                count = len(heroes)
-                return {
-                    "total_power": total_power,
-                    "average_power": total_power / (count * 6) if count > 0 else 0,
-                    "total_intelligence": total_intelligence,
-                    "total_strength": total_strength,
-                    "total_speed": total_speed,
-                    "total_durability": total_durability,
-                    "total_power_stat": total_power_stat,
-                    "total_combat": total_combat,
-                    "average_intelligence": total_intelligence / count if count > 0 else 0,
-                    "average_strength": total_strength / count if count > 0 else 0,
-                    "average_speed": total_speed / count if count > 0 else 0,
-                    "average_durability": total_durability / count if count > 0 else 0,
-                    "average_power_stat": total_power_stat / count if count > 0 else 0,
-                    "average_combat": total_combat / count if count > 0 else 0,
-                    "alignment_distribution": alignment_counts,
-                    "member_count": count
-                }
-
-            stats1 = calculate_team_stats(heroes1)
-            stats2 = calculate_team_stats(heroes2)
-
-            # Determine winner based on multiple factors
-            team1_score = 0
-            team2_score = 0
-            reasons = []
-
-            # Factor 1: Total Power (40% weight)
-            if stats1["total_power"] > stats2["total_power"]:
-                team1_score += 40
-                reasons.append(f"{team1.name} has higher total power ({stats1['total_power']} vs {stats2['total_power']})")
-            elif stats2["total_power"] > stats1["total_power"]:
-                team2_score += 40
-                reasons.append(f"{team2.name} has higher total power ({stats2['total_power']} vs {stats1['total_power']})")
-
-            # Factor 2: Average Power per Hero (20% weight)
-            if stats1["average_power"] > stats2["average_power"]:
-                team1_score += 20
-                reasons.append(f"{team1.name} has higher average power per hero ({stats1['average_power']:.1f} vs {stats2['average_power']:.1f})")
-            elif stats2["average_power"] > stats1["average_power"]:
-                team2_score += 20
-                reasons.append(f"{team2.name} has higher average power per hero ({stats2['average_power']:.1f} vs {stats1['average_power']:.1f})")
-
-            # Factor 3: Strength advantage (15% weight)
-            if stats1["total_strength"] > stats2["total_strength"]:
-                team1_score += 15
-                reasons.append(f"{team1.name} has superior strength ({stats1['total_strength']} vs {stats2['total_strength']})")
-            elif stats2["total_strength"] > stats1["total_strength"]:
-                team2_score += 15
-                reasons.append(f"{team2.name} has superior strength ({stats2['total_strength']} vs {stats1['total_strength']})")
-
-            # Factor 4: Combat ability (15% weight)
-            if stats1["total_combat"] > stats2["total_combat"]:
-                team1_score += 15
-                reasons.append(f"{team1.name} has better combat skills ({stats1['total_combat']} vs {stats2['total_combat']})")
-            elif stats2["total_combat"] > stats1["total_combat"]:
-                team2_score += 15
-                reasons.append(f"{team2.name} has better combat skills ({stats2['total_combat']} vs {stats1['total_combat']})")
-
-            # Factor 5: Intelligence advantage (10% weight)
-            if stats1["total_intelligence"] > stats2["total_intelligence"]:
-                team1_score += 10
-                reasons.append(f"{team1.name} has higher intelligence ({stats1['total_intelligence']} vs {stats2['total_intelligence']})")
-            elif stats2["total_intelligence"] > stats1["total_intelligence"]:
-                team2_score += 10
-                reasons.append(f"{team2.name} has higher intelligence ({stats2['total_intelligence']} vs {stats1['total_intelligence']})")
-
-            # Determine winner
-            if team1_score > team2_score:
-                winner_id = team1_id
-                winner_name = team1.name
-                explanation = f"{team1.name} wins with a score of {team1_score}/100 vs {team2.name}'s {team2_score}/100."
-            elif team2_score > team1_score:
-                winner_id = team2_id
-                winner_name = team2.name
-                explanation = f"{team2.name} wins with a score of {team2_score}/100 vs {team1.name}'s {team1_score}/100."
+            # Materialized stats are refreshed with every roster or hero edit; a team
+            # without a stats row falls back to the comparison cache
+            catalog = self._get_catalog(ids1 + ids2) if simulate or team_stats1 is None or team_stats2 is None else None
+            if team_stats1 is not None and team_stats2 is not None:
+                stats1, stats2 = team_stats_to_dict(team_stats1), team_stats_to_dict(team_stats2)
             else:
-                winner_id = None
-                winner_name = "Tie"
-                explanation = f"Both teams are evenly matched with a score of {team1_score}/100."
-
-            comparison_data = {
-                "team1": {
-                    "id": team1.id,
-                    "name": team1.name,
-                    "stats": stats1,
-                    "score": team1_score
-                },
-                "team2": {
-                    "id": team2.id,
-                    "name": team2.name,
-                    "stats": stats2,
-                    "score": team2_score
-                },
-                "winner": {
-                    "team_id": winner_id,
-                    "team_name": winner_name,
-                    "score": max(team1_score, team2_score) if winner_id else team1_score
-                },
-                "explanation": explanation,
-                "reasons": reasons
-            }
+                stats1, stats2 = get_matchup_stats(catalog, ids1, ids2)
+
+            comparison_data = compare_team_stats(
+                {"id": team1_id, "name": name1}, stats1,
+                {"id": team2_id, "name": name2}, stats2
+            )
+            explanation = comparison_data["explanation"]
+            comparison_data["synergy"] = self._get_synergy(ids1, ids2)
+
+            if simulate:
+                comparison_data["simulation"] = simulate_battle(
+                    catalog.stats[catalog.indices_for(ids1)].tolist(),
+                    catalog.stats[catalog.indices_for(ids2)].tolist(),
+                    trials=trials,
+                    seed=seed,
+                    time_budget_ms=time_budget_ms
+                )
 
             return create_success_response(
                 f"Team comparison completed: {explanation}",
@@ -356,14 +307,308 @@ class TeamController:
             logger.error(f"Error comparing teams: {e}")
             return create_error_response("Failed to compare teams")
 
+    def compare_adhoc(
+        self,
+        team1_ids: List[int],
+        team2_ids: List[int],
+        team1_name: Optional[str] = None,
+        team2_name: Optional[str] = None
+    ):
+        """Compare two unsaved rosters straight from the superhero catalog (no writes)"""
+        try:
+            # Rosters are compared exactly as submitted; like saved teams, a hero may appear more than once
+            if not team1_ids or not team2_ids:
+                return create_error_response("Both teams must have at least one member")
+
+            missing_error = self._validate_superhero_ids(team1_ids + team2_ids)
+            if missing_error:
+                return missing_error
+
+            catalog = self._get_catalog(team1_ids + team2_ids)
+
+            stats1, stats2 = get_matchup_stats(catalog, team1_ids, team2_ids)
+            comparison_data = compare_team_stats(
+                {"id": None, "name": team1_name or "Team 1"}, stats1,
+                {"id": None, "name": team2_name or "Team 2"}, stats2
+            )
+            comparison_data["team1"]["superhero_ids"] = team1_ids
+            comparison_data["team2"]["superhero_ids"] = team2_ids
+            comparison_data["synergy"] = self._get_synergy(team1_ids, team2_ids)
+
+            return create_success_response(
+                f"Team comparison completed: {comparison_data['explanation']}",
+                comparison_data
+            )
+        except Exception as e:
+            logger.error(f"Error comparing ad-hoc teams: {e}")
+            return create_error_response("Failed to compare teams")
+
+    def get_similar_teams(self, team_id: int, user_id: int, limit: int = 10):
+        """Find teams (from any user) whose rosters are identical or nearly identical to one of yours"""
+        try:
+            team = self.team_repo.get_team_by_id(team_id, user_id, with_members=False)
+            if not team:
+                return create_error_response(f"Team {team_id} not found")
+
+            candidate_ids = self.team_repo.get_similar_team_candidates(team_id)
+            member_sets = self.team_repo.get_member_sets(candidate_ids + [team_id])
+            members = member_sets[team_id][1]
+
+            similar = []
+            for candidate_id in candidate_ids:
+                name, candidate_members = member_sets[candidate_id]
+                similarity = jaccard(members, candidate_members)
+                similar.append({
+                    "team_id": candidate_id,
+                    "team_name": name,
+                    "similarity": round(similarity, 3),
+                    "identical": candidate_members == members,
+                    "superhero_ids": sorted(candidate_members)
+                })
+            similar.sort(key=lambda entry: (-entry["similarity"], entry["team_id"]))
+
+            return create_success_response(
+                f"Found {min(len(similar), limit)} similar teams",
+                similar[:limit]
+            )
+        except Exception as e:
+            logger.error(f"Error finding similar teams: {e}")
+            return create_error_response("Failed to find similar teams")
+
+    def get_ladder(self, limit: int = 50, after_rating: Optional[float] = None, after_team_id: Optional[int] = None):
+        """Get a page of the global team rating ladder"""
+        try:
+            if (after_rating is None) != (after_team_id is None):
+                return create_error_response("after_rating and after_team_id must be provided together")
+
+            entries = self.team_repo.get_ladder(limit, after_rating, after_team_id)
+            first_rank = self.team_repo.get_ladder_rank(entries[0][0].rating, entries[0][0].team_id) if entries else None
+
+            ladder = [
+                {
+                    "rank": first_rank + offset,
+                    "team_id": rating.team_id,
+                    "team_name": team_name,
+                    "rating": round(rating.rating, 1),
+                    "matches": rating.matches
+                }
+                for offset, (rating, team_name) in enumerate(entries)
+            ]
+            next_cursor = None
+            if len(entries) == limit:
+                last = entries[-1][0]
+                next_cursor = {"after_rating": last.rating, "after_team_id": last.team_id}
+
+            return create_success_response(
+                "Ladder retrieved successfully",
+                {"entries": ladder, "next_cursor": next_cursor}
+            )
+        except Exception as e:
+            logger.error(f"Error getting ladder: {e}")
+            return create_error_response("Failed to retrieve ladder")
+
+    def run_tournament(self, user_id: int, team_ids: Optional[List[int]] = None):
+        """Rank teams with a round-robin where every team is compared against every other"""
+        try:
+            if team_ids:
+                unique_ids = list(dict.fromkeys(team_ids))
+                teams = self.team_repo.get_teams_by_ids(unique_ids, user_id)
+                missing_ids = sorted(set(unique_ids) - {team.id for team in teams})
+                if missing_ids:
+                    return create_error_response(f"Teams not found: {', '.join(str(team_id) for team_id in missing_ids)}")
+            else:
+                teams = self.team_repo.get_user_teams(user_id, with_members=False)
+
+            entries = [(team, self._get_team_stats(team)) for team in teams]
+            entries = [(team, stats) for team, stats in entries if stats["member_count"]]
+            if len(entries) < 2:
+                return create_error_response("At least two teams with members are required for a tournament")
+
+            results = round_robin(build_factor_matrix([stats for _, stats in entries]))
+
+            standings = []
+            for rank, index in enumerate(results["order"], start=1):
+                team, stats = entries[index]
+                standings.append({
+                    "rank": rank,
+                    "team_id": team.id,
+                    "team_name": team.name,
+                    "wins": int(results["wins"][index]),
+                    "losses": int(results["losses"][index]),
+                    "ties": int(results["ties"][index]),
+                    "points": int(results["points"][index]),
+                    "total_power": stats["total_power"]
+                })
+
+            return create_success_response(
+                f"Tournament completed between {len(entries)} teams",
+                {"team_count": len(entries), "standings": standings}
+            )
+        except Exception as e:
+            logger.error(f"Error running tournament: {e}")
+            return create_error_response("Failed to run tournament")
+
+    def optimize_team(
+        self,
+        team_size: int,
+        stat_weights: Optional[Dict[str, float]] = None,
+        required_ids: Optional[List[int]] = None,
+        excluded_ids: Optional[List[int]] = None,
+        alignment_min: Optional[Dict[str, int]] = None,
+        alignment_max: Optional[Dict[str, int]] = None,
+        publisher_max: Optional[Dict[str, int]] = None,
+        max_per_publisher: Optional[int] = None,
+        time_limit_ms: int = 1000
+    ):
+        """Build the best-scoring team under the given constraints"""
+        try:
+            unknown_stats = sorted(set(stat_weights or {}) - set(STAT_FIELDS))
+            if unknown_stats:
+                return create_error_response(f"Unknown stats in stat_weights: {', '.join(unknown_stats)}")
+
+            catalog = superhero_catalog.get(self.db)
+            result = optimize_team(
+                catalog,
+                team_size,
+                stat_weights=stat_weights,
+                required_ids=required_ids,
+                excluded_ids=excluded_ids,
+                alignment_min=alignment_min,
+                alignment_max=alignment_max,
+                publisher_max=publisher_max,
+                max_per_publisher=max_per_publisher,
+                time_limit_ms=time_limit_ms
+            )
+
+            heroes = self.superhero_repo.get_by_ids(result["superhero_ids"])
+            heroes_by_id = {hero.id: hero for hero in heroes}
+            selected = [heroes_by_id[hero_id] for hero_id in result["superhero_ids"] if hero_id in heroes_by_id]
+
+            message = "Optimal team found" if result["optimal"] else "Best team found within the time limit"
+            return create_success_response(message, {
+                "superheroes": [create_superhero_data(hero) for hero in selected],
+                "stats": calculate_team_stats(selected),
+                "score": result["score"],
+                "optimal": result["optimal"],
+                "nodes_explored": result["nodes_explored"],
+                "elapsed_ms": result["elapsed_ms"]
+            })
+        except OptimizationError as e:
+            return create_error_response(str(e))
+        except Exception as e:
+            logger.error(f"Error optimizing team: {e}")
+            return create_error_response("Failed to optimize team")
+
+    def suggest_counter_team(
+        self,
+        team_id: int,
+        user_id: int,
+        team_size: Optional[int] = None,
+        favorites_only: bool = False,
+        time_limit_ms: int = 500,
+        seed: Optional[int] = None
+    ):
+        """Suggest the roster with the widest win margin against an existing team"""
+        try:
+            team = self.team_repo.get_team_by_id(team_id, user_id, with_members=False)
+            if not team:
+                return create_error_response(f"Team {team_id} not found")
+
+            opponent_stats = self._get_team_stats(team)
+            if not opponent_stats["member_count"]:
+                return create_error_response("Team must have at least one member")
+
+            team_size = team_size or opponent_stats["member_count"]
+            candidate_ids = None
+            if favorites_only:
+                candidate_ids = FavoriteRepository(self.db).get_user_favorite_ids(user_id)
+                if len(candidate_ids) < team_size:
+                    return create_error_response(
+                        f"At least {team_size} favorite heroes are required, you have {len(candidate_ids)}"
+                    )
+
+            result = find_counter_team(
+                superhero_catalog.get(self.db),
+                opponent_stats,
+                team_size,
+                candidate_ids=candidate_ids,
+                time_limit_ms=time_limit_ms,
+                seed=seed
+            )
+
+            heroes_by_id = {hero.id: hero for hero in self.superhero_repo.get_by_ids(result["superhero_ids"])}
+            selected = [heroes_by_id[hero_id] for hero_id in result["superhero_ids"] if hero_id in heroes_by_id]
+
+            comparison = compare_team_stats(
+                {"id": None, "name": "Counter team"}, calculate_team_stats(selected),
+                {"id": team.id, "name": team.name}, opponent_stats
+            )
+            return create_success_response(
+                f"Counter team found: {comparison['explanation']}",
+                {
+                    "superheroes": [create_superhero_data(hero) for hero in selected],
+                    "comparison": comparison,
+                    "margin": result["margin"],
+                    "search": {
+                        "candidates_evaluated": result["candidates_evaluated"],
+                        "candidates_per_second": result["candidates_per_second"],
+                        "restarts": result["restarts"],
+                        "elapsed_ms": result["elapsed_ms"]
+                    }
+                }
+            )
+        except ValueError as e:
+            # Too few candidate heroes for the requested team size
+            return create_error_response(str(e))
+        except Exception as e:
+            logger.error(f"Error suggesting counter team: {e}")
+            return create_error_response("Failed to suggest counter team")
+
+    def _place_on_ladder(self, team_id: int):
+        """Queue a created or edited team for placement on the rating ladder (runs after the response)"""
+        ladder_placement.submit(team_id)
+
+    def _get_synergy(self, team1_ids: List[int], team2_ids: List[int]) -> dict:
+        """Affiliation synergy of both rosters (reported alongside the comparison, not part of its scoring)"""
+        index = affiliation_graph.get(self.db)
+        return {"team1": index.team_synergy(team1_ids), "team2": index.team_synergy(team2_ids)}
+
+    def _get_catalog(self, superhero_ids: List[int]):
+        """Return the catalog snapshot, reloading it once if it predates any of the given heroes"""
+        catalog = superhero_catalog.get(self.db)
+        if catalog.missing_ids(superhero_ids):
+            superhero_catalog.invalidate()
+            catalog = superhero_catalog.get(self.db)
+        return catalog
+
+    def _get_team_stats(self, team) -> dict:
+        """Read a team's materialized stats, falling back to its member heroes if missing"""
+        if team.stats is not None:
+            return team_stats_to_dict(team.stats)
+        return calculate_team_stats(self.team_repo.get_team_superheroes(team.id))
+
+    def _validate_superhero_ids(self, superhero_ids: List[int]):
+        """Return an error response listing every unknown superhero ID, or None if all exist"""
+        missing_ids = self.superhero_repo.get_missing_ids(superhero_ids)
+        if not missing_ids:
+            return None
+        if len(missing_ids) == 1:
+            return create_error_response(f"Superhero with ID {missing_ids[0]} not found")
+        return create_error_response(
+            f"Superheroes with IDs {', '.join(str(hero_id) for hero_id in missing_ids)} not found",
+            {"missing_ids": missing_ids}
+        )
+
     def _team_to_dict(self, team) -> dict:
-        """Convert team model to dictionary with superheroes"""
-        superheroes = self.team_repo.get_team_superheroes(team.id)
+        """Convert team model to dictionary with superheroes (uses the loaded members, no extra queries)"""
+        superheroes = [member.superhero for member in team.members]
         return {
             "id": team.id,
             "name": team.name,
             "description": team.description,
             "user_id": team.user_id,
+            "version": team.version,
+            "stats": team_stats_to_dict(team.stats) if team.stats else None,
             "created_at": team.created_at.isoformat() if team.created_at else None,
             "updated_at": team.updated_at.isoformat() if team.updated_at else None,
             "superheroes": [create_superhero_data(hero) for hero in superheroes]
@@ -1,8 +1,17 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
 from .config import settings
-from .database import engine
+from .database import engine, get_db
 from .routes import auth_router, superhero_router, favorite_router, team_router
+from .service.scheduler import start_scheduler, stop_scheduler
+from .service.background_jobs import register_background_jobs
+from .service.battle_simulation import shutdown_simulation_pool
+from .service.comparison_cache import comparison_cache
+from .service.ladder_placement import ladder_placement
+from .utils import token_cache, principal_cache, hashing_executor
+from .utils.auth import get_current_admin_user
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -44,10 +53,47 @@ app.include_router(
     tags=["teams"]
 )
 
+# Background jobs
+if settings.BACKGROUND_JOBS_ENABLED:
+    register_background_jobs()
+
+@app.on_event("startup")
+def start_background_jobs():
+    start_scheduler()
+
+@app.on_event("shutdown")
+def stop_background_jobs():
+    stop_scheduler()
+    shutdown_simulation_pool()
+    hashing_executor.shutdown()
+    ladder_placement.shutdown()
+
 @app.get("/")
 def root():
     return {"message": "Superhero API is running"}
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+security = HTTPBearer()
+
+@app.get("/metrics")
+def metrics(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+):
+    """Per-process cache, password hashing and ladder placement counters (admin only)"""
+    if not get_current_admin_user(db, credentials.credentials):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can view metrics"
+        )
+
+    return {
+        "jwt_cache": token_cache.stats(),
+        "principal_cache": principal_cache.stats(),
+        "comparison_cache": comparison_cache.stats(),
+        "password_hashing": hashing_executor.stats(),
+        "ladder_placement": ladder_placement.stats()
+    }
@@ -1,6 +1,10 @@
-from .superhero import Superhero
-from .user import User
-from .favorite import UserFavorite
-from .team import Team, TeamMember
+from .attribute import Publisher, Alignment, Gender, Race, EyeColor, HairColor, ATTRIBUTE_MODELS
+from .superhero import Superhero, CatalogVersion
+from .user import User, PasswordResetToken
+from .favorite import UserFavorite, SuperheroFavoriteStats, SuperheroCoFavorite
+from .team import Team, TeamMember, TeamStats, TeamRating, TeamLshBucket
+from .affiliation import AffiliationGroup, SuperheroGroup, SuperheroRelation
 
-__all__ = ["Superhero", "User", "UserFavorite", "Team", "TeamMember"]
\ No newline at end of file
+__all__ = ["Superhero", "CatalogVersion", "User", "PasswordResetToken", "UserFavorite", "SuperheroFavoriteStats", "SuperheroCoFavorite", "Team", "TeamMember", "TeamStats", "TeamRating", "TeamLshBucket",
+           "AffiliationGroup", "SuperheroGroup", "SuperheroRelation",
+           "Publisher", "Alignment", "Gender", "Race", "EyeColor", "HairColor", "ATTRIBUTE_MODELS"]
\ No newline at end of file
@@ -0,0 +1,42 @@
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Index
+from ..database import Base
+
+class AffiliationGroup(Base):
+    """A group parsed from superhero group_affiliation text"""
+    __tablename__ = "affiliation_groups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(255), nullable=False)
+    normalized_name = Column(String(255), nullable=False, unique=True)  # Lower-cased, whitespace-collapsed name
+
+    def __repr__(self):
+        return f"<AffiliationGroup(id={self.id}, name='{self.name}')>"
+
+class SuperheroGroup(Base):
+    """Hero membership in a group (current or former)"""
+    __tablename__ = "superhero_groups"
+
+    superhero_id = Column(Integer, ForeignKey("superheroes.id", ondelete="CASCADE"), primary_key=True)
+    group_id = Column(Integer, ForeignKey("affiliation_groups.id", ondelete="CASCADE"), primary_key=True)
+    is_former = Column(Boolean, nullable=False, default=False, server_default="false")
+
+    # Group -> members lookups (hero -> groups is served by the primary key)
+    __table_args__ = (
+        Index('ix_superhero_groups_group', 'group_id', 'superhero_id'),
+    )
+
+    def __repr__(self):
+        return f"<SuperheroGroup(superhero_id={self.superhero_id}, group_id={self.group_id})>"
+
+class SuperheroRelation(Base):
+    """A relative parsed from superhero relatives text, linked to a hero when the name resolves"""
+    __tablename__ = "superhero_relations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    superhero_id = Column(Integer, ForeignKey("superheroes.id", ondelete="CASCADE"), nullable=False, index=True)
+    related_superhero_id = Column(Integer, ForeignKey("superheroes.id", ondelete="SET NULL"), nullable=True, index=True)
+    related_name = Column(String(255), nullable=False)
+    relation = Column(String(255), nullable=True)  # e.g. "father", "sister"
+
+    def __repr__(self):
+        return f"<SuperheroRelation(superhero_id={self.superhero_id}, related_name='{self.related_name}')>"
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, SmallInteger, String
+from ..database import Base
+
+class _AttributeValue:
+    """Columns shared by the dictionary tables of low-cardinality hero attributes"""
+    id = Column(SmallInteger, primary_key=True)
+    name = Column(String(255), nullable=False, unique=True)
+
+    def __repr__(self):
+        return f"<{type(self).__name__}(id={self.id}, name='{self.name}')>"
+
+class Publisher(_AttributeValue, Base):
+    __tablename__ = "publishers"
+
+class Alignment(_AttributeValue, Base):
+    __tablename__ = "alignments"
+
+class Gender(_AttributeValue, Base):
+    __tablename__ = "genders"
+
+class Race(_AttributeValue, Base):
+    __tablename__ = "races"
+
+class EyeColor(_AttributeValue, Base):
+    __tablename__ = "eye_colors"
+
+class HairColor(_AttributeValue, Base):
+    __tablename__ = "hair_colors"
+
+# Hero attribute name -> dictionary table (the hero column is "<attribute>_id")
+ATTRIBUTE_MODELS = {
+    "publisher": Publisher,
+    "alignment": Alignment,
+    "gender": Gender,
+    "race": Race,
+    "eye_color": EyeColor,
+    "hair_color": HairColor,
+}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, UniqueConstraint, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -18,3 +18,44 @@ class UserFavorite(Base):
 
     def __repr__(self):
         return f"<UserFavorite(user_id={self.user_id}, superhero_id={self.superhero_id})>"
+
+class SuperheroFavoriteStats(Base):
+    """Per-hero favorite aggregates, maintained on every favorite add/remove"""
+    __tablename__ = "superhero_favorite_stats"
+
+    superhero_id = Column(Integer, ForeignKey("superheroes.id"), primary_key=True)
+    favorite_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Exponentially decayed favorite activity, as of trending_updated_at
+    trending_score = Column(Float, nullable=False, default=0.0, server_default="0")
+    trending_updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    # Serves "most favorited" ranking as an index range scan
+    __table_args__ = (
+        Index('ix_superhero_favorite_stats_ranking', 'favorite_count', 'superhero_id'),
+    )
+
+    def __repr__(self):
+        return f"<SuperheroFavoriteStats(superhero_id={self.superhero_id}, favorite_count={self.favorite_count})>"
+
+class SuperheroCoFavorite(Base):
+    """
+    Item-to-item co-occurrence: how many users favorited both heroes.
+
+    Stored in both directions so a hero's ranked neighbours are a single
+    index range scan on (superhero_id, co_count).
+    """
+    __tablename__ = "superhero_co_favorites"
+
+    superhero_id = Column(Integer, ForeignKey("superheroes.id"), primary_key=True)
+    other_superhero_id = Column(Integer, ForeignKey("superheroes.id"), primary_key=True)
+    co_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index('ix_superhero_co_favorites_ranking', 'superhero_id', 'co_count'),
+    )
+
+    def __repr__(self):
+        return f"<SuperheroCoFavorite(superhero_id={self.superhero_id}, other_superhero_id={self.other_superhero_id}, co_count={self.co_count})>"
@@ -1,6 +1,12 @@
-from sqlalchemy import Column, Integer, String, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, SmallInteger, String, Text, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship, joinedload
 from ..database import Base
+from .attribute import Publisher, Alignment, Gender, Race, EyeColor, HairColor
+
+def _attribute_name(relationship_name: str):
+    """Read-only string view of a dictionary-encoded attribute (writes go through AttributeRepository.encode)"""
+    return property(lambda self: getattr(getattr(self, relationship_name), "name", None))
 
 class Superhero(Base):
     __tablename__ = "superheroes"
@@ -23,18 +29,18 @@ class Superhero(Base):
     alter_egos = Column(Text)
     place_of_birth = Column(String(255))
     first_appearance = Column(String(255))
-    publisher = Column(String(255))
-    alignment = Column(String(50))  # good, bad, neutral
+    publisher_id = Column(SmallInteger, ForeignKey("publishers.id"), index=True)
+    alignment_id = Column(SmallInteger, ForeignKey("alignments.id"), index=True)  # good, bad, neutral
 
     # Appearance
-    gender = Column(String(50))
-    race = Column(String(100))
+    gender_id = Column(SmallInteger, ForeignKey("genders.id"))
+    race_id = Column(SmallInteger, ForeignKey("races.id"))
     height_feet = Column(String(50))  # e.g., "6'6"
     height_cm = Column(String(50))    # e.g., "198 cm"
     weight_lbs = Column(String(50))   # e.g., "425 lb"
     weight_kg = Column(String(50))    # e.g., "191 kg"
-    eye_color = Column(String(50))
-    hair_color = Column(String(50))
+    eye_color_id = Column(SmallInteger, ForeignKey("eye_colors.id"))
+    hair_color_id = Column(SmallInteger, ForeignKey("hair_colors.id"))
 
     # Work
     occupation = Column(Text)
@@ -50,5 +56,45 @@ class Superhero(Base):
     # Aliases (stored as JSON string for simplicity)
     aliases = Column(Text)  # JSON array as string
 
+    # Dictionary-encoded attributes: queries that read the values join them in with
+    # with_attribute_values(); anything else only pays for them on access
+    publisher_value = relationship(Publisher)
+    alignment_value = relationship(Alignment)
+    gender_value = relationship(Gender)
+    race_value = relationship(Race)
+    eye_color_value = relationship(EyeColor)
+    hair_color_value = relationship(HairColor)
+
+    publisher = _attribute_name("publisher_value")
+    alignment = _attribute_name("alignment_value")
+    gender = _attribute_name("gender_value")
+    race = _attribute_name("race_value")
+    eye_color = _attribute_name("eye_color_value")
+    hair_color = _attribute_name("hair_color_value")
+
+    def __repr__(self):
+        return f"<Superhero(id={self.id}, name='{self.name}')>"
+
+def with_attribute_values():
+    """Loader options joining a hero's attribute dictionary rows into the same query"""
+    return [
+        joinedload(relationship_attribute) for relationship_attribute in (
+            Superhero.publisher_value, Superhero.alignment_value, Superhero.gender_value,
+            Superhero.race_value, Superhero.eye_color_value, Superhero.hair_color_value
+        )
+    ]
+
+class CatalogVersion(Base):
+    """
+    Single-row counter bumped in the same transaction as every superhero write.
+    Worker processes compare it with their in-memory catalog snapshot, so an
+    edit made through any process is seen by all of them on their next read.
+    """
+    __tablename__ = "superhero_catalog_version"
+
+    id = Column(Integer, primary_key=True)  # Always 1
+    version = Column(BigInteger, nullable=False, default=1, server_default="1")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
     def __repr__(self):
-        return f"<Superhero(id={self.id}, name='{self.name}')>"
\ No newline at end of file
+        return f"<CatalogVersion(version={self.version})>"
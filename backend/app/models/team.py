@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, Float, String, Text, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -12,9 +12,20 @@ class Team(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Optimistic concurrency
+    roster_fingerprint = Column(String(32), nullable=True, index=True)  # Order-insensitive hash of the members, duplicates included
 
     # Relationships
-    members = relationship("TeamMember", back_populates="team", cascade="all, delete-orphan")
+    members = relationship("TeamMember", back_populates="team", cascade="all, delete-orphan", order_by="[TeamMember.position, TeamMember.id]")
+    stats = relationship("TeamStats", uselist=False, cascade="all, delete-orphan", lazy="joined")
+
+    # Every UPDATE checks and bumps `version`; a concurrent edit raises StaleDataError
+    __mapper_args__ = {"version_id_col": version}
+
+    # Serves the keyset-paginated team summary listing
+    __table_args__ = (
+        Index('ix_teams_user_updated', 'user_id', 'updated_at', 'id'),
+    )
 
     def __repr__(self):
         return f"<Team(id={self.id}, name='{self.name}', user_id={self.user_id})>"
@@ -30,6 +41,59 @@ class TeamMember(Base):
 
     # Relationships
     team = relationship("Team", back_populates="members")
+    superhero = relationship("Superhero")
 
     def __repr__(self):
         return f"<TeamMember(team_id={self.team_id}, superhero_id={self.superhero_id})>"
+
+class TeamStats(Base):
+    """Aggregate team statistics, refreshed whenever membership or member heroes change"""
+    __tablename__ = "team_stats"
+
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), primary_key=True)
+    member_count = Column(Integer, nullable=False, default=0)
+    total_power = Column(Integer, nullable=False, default=0)  # Sum of all powerstats
+    total_intelligence = Column(Integer, nullable=False, default=0)
+    total_strength = Column(Integer, nullable=False, default=0)
+    total_speed = Column(Integer, nullable=False, default=0)
+    total_durability = Column(Integer, nullable=False, default=0)
+    total_power_stat = Column(Integer, nullable=False, default=0)
+    total_combat = Column(Integer, nullable=False, default=0)
+    alignment_distribution = Column(JSON, nullable=False, default=dict)  # e.g. {"good": 3, "bad": 1}
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<TeamStats(team_id={self.team_id}, member_count={self.member_count}, total_power={self.total_power})>"
+
+class TeamRating(Base):
+    """Elo ladder rating, refitted by a background job and placed incrementally when a team changes"""
+    __tablename__ = "team_ratings"
+
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), primary_key=True)
+    rating = Column(Float, nullable=False, default=1500.0, server_default="1500")
+    matches = Column(Integer, nullable=False, default=0, server_default="0")  # Matches played in the last fit or placement
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    # Serves the ladder and its keyset pagination as an index range scan
+    __table_args__ = (
+        Index('ix_team_ratings_ladder', rating.desc(), team_id),
+    )
+
+    def __repr__(self):
+        return f"<TeamRating(team_id={self.team_id}, rating={self.rating})>"
+
+class TeamLshBucket(Base):
+    """
+    MinHash LSH buckets of a team's member set (one row per band).
+
+    Teams sharing any (band, bucket) are near-duplicate candidates; the
+    primary key makes that lookup an index range scan.
+    """
+    __tablename__ = "team_lsh_buckets"
+
+    band = Column(Integer, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+    def __repr__(self):
+        return f"<TeamLshBucket(team_id={self.team_id}, band={self.band}, bucket={self.bucket})>"
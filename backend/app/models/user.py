@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Index, ForeignKey
 from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
 from ..database import Base
 
 class User(Base):
@@ -15,13 +16,28 @@ class User(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     deleted_at = Column(DateTime(timezone=True), nullable=True)  # Soft delete
 
-    # Password reset
-    reset_token = Column(String(255), nullable=True)
-    reset_token_expires_at = Column(DateTime(timezone=True), nullable=True)
-
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    # Prefix (LIKE 'base%') lookups for username allocation
+    __table_args__ = (
+        Index('ix_users_username_pattern', 'username', postgresql_ops={'username': 'varchar_pattern_ops'}),
+    )
+
+    def __repr__(self):
+        return f"<User(id={self.id}, email='{self.email}', role='{self.role}')>"
+
+class PasswordResetToken(Base):
+    """An outstanding password reset, stored by the SHA-256 of the emailed token (the raw token is never stored)"""
+    __tablename__ = "password_reset_tokens"
+
+    token_hash = Column(String(64), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)  # Swept by a background job
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    user = relationship("User")
+
     def __repr__(self):
-        return f"<User(id={self.id}, email='{self.email}', role='{self.role}')>"
\ No newline at end of file
+        return f"<PasswordResetToken(user_id={self.user_id}, expires_at={self.expires_at})>"
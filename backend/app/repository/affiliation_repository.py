@@ -0,0 +1,177 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, insert, update, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..models.affiliation import AffiliationGroup, SuperheroGroup, SuperheroRelation
+from ..models.superhero import Superhero
+from ..service.affiliation_parser import parse_groups, parse_relatives, normalize_name
+
+class AffiliationRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def rebuild_all(self, batch_size: int = 5000) -> Tuple[int, int, int]:
+        """
+        Re-parse every hero's group_affiliation and relatives into the graph tables
+        in a single transaction. Group IDs are kept stable for groups that still exist.
+
+        Returns:
+            (groups, memberships, relations) written
+        """
+        heroes = self.db.query(
+            Superhero.id, Superhero.name, Superhero.full_name, Superhero.group_affiliation, Superhero.relatives
+        ).all()
+        names_to_ids = self._build_name_index((hero.id, hero.name, hero.full_name) for hero in heroes)
+
+        parsed_groups = {hero.id: parse_groups(hero.group_affiliation) for hero in heroes}
+        group_ids = self._ensure_groups(
+            {normalize_name(name): name for groups in parsed_groups.values() for name, _ in groups}
+        )
+
+        memberships = [
+            {"superhero_id": hero_id, "group_id": group_ids[normalize_name(name)], "is_former": is_former}
+            for hero_id, groups in parsed_groups.items()
+            for name, is_former in groups
+        ]
+        relations = [
+            self._relation_row(hero.id, name, relation, names_to_ids)
+            for hero in heroes
+            for name, relation in parse_relatives(hero.relatives)
+        ]
+
+        self.db.execute(delete(SuperheroGroup))
+        self.db.execute(delete(SuperheroRelation))
+        for i in range(0, len(memberships), batch_size):
+            self.db.execute(insert(SuperheroGroup), memberships[i:i + batch_size])
+        for i in range(0, len(relations), batch_size):
+            self.db.execute(insert(SuperheroRelation), relations[i:i + batch_size])
+
+        # Groups nobody belongs to any more
+        self.db.execute(delete(AffiliationGroup).where(
+            AffiliationGroup.id.not_in(select(SuperheroGroup.group_id).distinct())
+        ))
+        self.db.commit()
+        return len(group_ids), len(memberships), len(relations)
+
+    def rebuild_for_superhero(self, superhero: Superhero):
+        """Re-parse one hero's affiliations and relatives after an edit"""
+        groups = parse_groups(superhero.group_affiliation)
+        relatives = parse_relatives(superhero.relatives)
+
+        group_ids = self._ensure_groups({normalize_name(name): name for name, _ in groups})
+
+        # Resolve relative names against hero names in one query
+        names_to_ids = self._get_name_index({normalize_name(name) for name, _ in relatives})
+
+        self.db.execute(delete(SuperheroGroup).where(SuperheroGroup.superhero_id == superhero.id))
+        self.db.execute(delete(SuperheroRelation).where(SuperheroRelation.superhero_id == superhero.id))
+        if groups:
+            self.db.execute(insert(SuperheroGroup), [
+                {"superhero_id": superhero.id, "group_id": group_ids[normalize_name(name)], "is_former": is_former}
+                for name, is_former in groups
+            ])
+        if relatives:
+            self.db.execute(insert(SuperheroRelation), [
+                self._relation_row(superhero.id, name, relation, names_to_ids)
+                for name, relation in relatives
+            ])
+        self.db.commit()
+
+    def relink_relations(self, superhero_id: int, names: Iterable[Optional[str]]) -> int:
+        """
+        Re-resolve other heroes' relatives after a hero's name or full name changed.
+
+        Relations linked to the hero, or naming any of the given (old and new)
+        names, are resolved again against current hero names.
+
+        Returns:
+            Number of relations whose link changed
+        """
+        keys = {normalize_name(name) for name in names if name}
+        rows = self.db.query(
+            SuperheroRelation.id, SuperheroRelation.superhero_id,
+            SuperheroRelation.related_superhero_id, SuperheroRelation.related_name
+        ).filter(or_(
+            SuperheroRelation.related_superhero_id == superhero_id,
+            func.lower(SuperheroRelation.related_name).in_(keys)
+        )).all()
+        names_to_ids = self._get_name_index({normalize_name(row.related_name) for row in rows})
+
+        changes = []
+        for row in rows:
+            linked = self._relation_row(row.superhero_id, row.related_name, None, names_to_ids)["related_superhero_id"]
+            if linked != row.related_superhero_id:
+                changes.append({"id": row.id, "related_superhero_id": linked})
+        if changes:
+            self.db.execute(update(SuperheroRelation), changes)
+        self.db.commit()
+        return len(changes)
+
+    def get_graph_rows(self) -> Tuple[List[tuple], List[tuple], List[tuple]]:
+        """
+        Load everything the in-memory index needs.
+
+        Returns:
+            (groups as (id, name), memberships as (superhero_id, group_id, is_former),
+             resolved relations as (superhero_id, related_superhero_id, relation))
+        """
+        groups = [tuple(row) for row in self.db.query(AffiliationGroup.id, AffiliationGroup.name).all()]
+        memberships = [
+            tuple(row) for row in self.db.query(
+                SuperheroGroup.superhero_id, SuperheroGroup.group_id, SuperheroGroup.is_former
+            ).all()
+        ]
+        relations = [
+            tuple(row) for row in self.db.query(
+                SuperheroRelation.superhero_id, SuperheroRelation.related_superhero_id, SuperheroRelation.relation
+            ).filter(SuperheroRelation.related_superhero_id.isnot(None)).all()
+        ]
+        return groups, memberships, relations
+
+    def _ensure_groups(self, names: Dict[str, str], batch_size: int = 1000) -> Dict[str, int]:
+        """Insert missing groups and return {normalized_name: group_id} for all given names"""
+        keys = list(names)
+        group_ids = {}
+        for i in range(0, len(keys), batch_size):
+            chunk = keys[i:i + batch_size]
+            stmt = pg_insert(AffiliationGroup).values(
+                [{"name": names[key], "normalized_name": key} for key in chunk]
+            ).on_conflict_do_nothing(index_elements=[AffiliationGroup.normalized_name])
+            self.db.execute(stmt)
+            group_ids.update(
+                self.db.query(AffiliationGroup.normalized_name, AffiliationGroup.id)
+                .filter(AffiliationGroup.normalized_name.in_(chunk)).all()
+            )
+        return group_ids
+
+    def _get_name_index(self, keys: set) -> Dict[str, set]:
+        """Name index of the heroes whose name or full name matches any of the normalized keys"""
+        if not keys:
+            return defaultdict(set)
+        candidates = self.db.query(Superhero.id, Superhero.name, Superhero.full_name).filter(or_(
+            func.lower(Superhero.name).in_(keys),
+            func.lower(Superhero.full_name).in_(keys)
+        )).all()
+        return self._build_name_index(candidates)
+
+    @staticmethod
+    def _build_name_index(heroes) -> Dict[str, set]:
+        """Map normalized hero names and full names to the hero IDs that carry them"""
+        names_to_ids = defaultdict(set)
+        for hero_id, name, full_name in heroes:
+            for value in (name, full_name):
+                if value:
+                    names_to_ids[normalize_name(value)].add(hero_id)
+        return names_to_ids
+
+    @staticmethod
+    def _relation_row(superhero_id: int, name: str, relation: str, names_to_ids: Dict[str, set]) -> dict:
+        """Build a relation row, linking the relative only when the name resolves to exactly one other hero"""
+        matches = names_to_ids.get(normalize_name(name), set()) - {superhero_id}
+        return {
+            "superhero_id": superhero_id,
+            "related_superhero_id": next(iter(matches)) if len(matches) == 1 else None,
+            "related_name": name,
+            "relation": relation or None
+        }
@@ -0,0 +1,83 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Dict, Iterable, List, Optional
+from ..models.attribute import ATTRIBUTE_MODELS
+
+class AttributeRepository:
+    def __init__(self, db: Session):
+        self.db = db
+        # Codes already looked up or created through this repository: {attribute: {value: code}}
+        self._codes: Dict[str, Dict[str, int]] = {attribute: {} for attribute in ATTRIBUTE_MODELS}
+
+    @staticmethod
+    def clean(value: Optional[str]) -> Optional[str]:
+        """Attribute value as stored: surrounding whitespace stripped, blank meaning unknown (None)"""
+        if value is None:
+            return None
+        return value.strip() or None
+
+    def get_codes(self, attribute: str, names: Iterable[str], create: bool = False) -> Dict[str, int]:
+        """
+        Map attribute values to their dictionary codes.
+
+        With create=True missing values are inserted first (concurrent inserts of
+        the same value are resolved by the unique name constraint).
+        """
+        model = ATTRIBUTE_MODELS[attribute]
+        names = {name for name in names if name is not None}
+        if not names:
+            return {}
+        if create:
+            self.db.execute(
+                pg_insert(model).values([{"name": name} for name in names])
+                .on_conflict_do_nothing(index_elements=[model.name])
+            )
+        return dict(self.db.query(model.name, model.id).filter(model.name.in_(names)).all())
+
+    def get_labels(self) -> Dict[str, Dict[int, str]]:
+        """Every dictionary as {attribute: {code: value}}"""
+        return {
+            attribute: dict(self.db.query(model.id, model.name).all())
+            for attribute, model in ATTRIBUTE_MODELS.items()
+        }
+
+    def preload(self):
+        """Remember every existing code, so encoding only queries for values not seen before"""
+        for attribute, labels in self.get_labels().items():
+            self._codes[attribute].update((name, code) for code, name in labels.items())
+
+    def encode_many(self, rows: List[dict]) -> List[dict]:
+        """
+        Replace attribute values in hero field dictionaries with their codes.
+
+        Values not seen before are created with one statement per attribute for
+        all rows together; codes are then remembered for the life of the
+        repository (a seed run or a request). Blank values are stored as None.
+        """
+        rows = [
+            {key: self.clean(value) if key in ATTRIBUTE_MODELS else value for key, value in row.items()}
+            for row in rows
+        ]
+        for attribute, codes in self._codes.items():
+            missing = {row[attribute] for row in rows if row.get(attribute) is not None} - codes.keys()
+            if missing:
+                codes.update(self.get_codes(attribute, missing, create=True))
+
+        encoded_rows = []
+        for row in rows:
+            encoded = {key: value for key, value in row.items() if key not in ATTRIBUTE_MODELS}
+            for attribute, codes in self._codes.items():
+                if attribute in row:
+                    value = row[attribute]
+                    encoded[f"{attribute}_id"] = None if value is None else codes[value]
+            encoded_rows.append(encoded)
+        return encoded_rows
+
+    def encode(self, values: dict) -> dict:
+        """
+        Replace attribute values in a hero field dictionary with their codes,
+        creating dictionary entries for values not seen before.
+
+        {"publisher": "Marvel Comics", "name": "Hulk"} -> {"publisher_id": 4, "name": "Hulk"}
+        """
+        return self.encode_many([values])[0]
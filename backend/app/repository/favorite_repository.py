@@ -1,7 +1,27 @@
 from sqlalchemy.orm import Session
-from typing import List
-from ..models.favorite import UserFavorite
-from ..models.superhero import Superhero
+from sqlalchemy import func, select, update, delete, insert, or_, and_, literal, text, exists, Table, Column, Integer, MetaData
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import timedelta
+from typing import Dict, Iterator, List, Tuple
+from ..config import settings
+from ..models.favorite import UserFavorite, SuperheroFavoriteStats, SuperheroCoFavorite
+from ..models.superhero import Superhero, with_attribute_values
+
+def _decay_factor(since):
+    """SQL expression for the exponential decay weight of an event at `since`, as of now()"""
+    half_life_seconds = settings.TRENDING_HALF_LIFE_HOURS * 3600
+    return func.power(2.0, -func.extract("epoch", func.now() - since) / half_life_seconds)
+
+# Per-transaction staging area for co-favorite rebuilds (dropped on commit)
+_co_favorite_staging = Table(
+    "co_favorite_rebuild",
+    MetaData(),
+    Column("superhero_id", Integer, primary_key=True),
+    Column("other_superhero_id", Integer, primary_key=True),
+    Column("co_count", Integer, nullable=False),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP"
+)
 
 class FavoriteRepository:
     def __init__(self, db: Session):
@@ -11,6 +31,9 @@ class FavoriteRepository:
         """Add a favorite superhero for a user"""
         favorite = UserFavorite(user_id=user_id, superhero_id=superhero_id)
         self.db.add(favorite)
+        self.db.flush()
+        self._record_favorite_event(superhero_id, 1, 1.0)
+        self._apply_co_favorite_delta(user_id, superhero_id, 1)
         self.db.commit()
         self.db.refresh(favorite)
         return favorite
@@ -21,9 +44,12 @@ class FavoriteRepository:
             UserFavorite.user_id == user_id,
             UserFavorite.superhero_id == superhero_id
         ).first()
-        
+
         if favorite:
             self.db.delete(favorite)
+            # Withdraw whatever is left of this favorite's decayed contribution
+            self._record_favorite_event(superhero_id, -1, -_decay_factor(favorite.created_at))
+            self._apply_co_favorite_delta(user_id, superhero_id, -1)
             self.db.commit()
             return True
         return False
@@ -33,9 +59,9 @@ class FavoriteRepository:
         favorites = self.db.query(UserFavorite).filter(
             UserFavorite.user_id == user_id
         ).all()
-        
+
         superhero_ids = [f.superhero_id for f in favorites]
-        return self.db.query(Superhero).filter(Superhero.id.in_(superhero_ids)).all()
+        return self.db.query(Superhero).options(*with_attribute_values()).filter(Superhero.id.in_(superhero_ids)).all()
 
     def is_favorite(self, user_id: int, superhero_id: int) -> bool:
         """Check if a superhero is favorited by user"""
@@ -51,3 +77,278 @@ class FavoriteRepository:
             UserFavorite.user_id == user_id
         ).all()
         return [f.superhero_id for f in favorites]
+
+    def get_favorite_counts(self, superhero_ids: List[int]) -> Dict[int, int]:
+        """Get favorite counts for a set of superheroes (missing heroes have no favorites)"""
+        if not superhero_ids:
+            return {}
+        rows = self.db.query(
+            SuperheroFavoriteStats.superhero_id, SuperheroFavoriteStats.favorite_count
+        ).filter(SuperheroFavoriteStats.superhero_id.in_(superhero_ids)).all()
+        return {superhero_id: count for superhero_id, count in rows}
+
+    def get_most_favorited(self, limit: int = 10) -> List[Tuple[Superhero, int]]:
+        """Get the top-N superheroes by favorite count from the counter table"""
+        return self.db.query(Superhero, SuperheroFavoriteStats.favorite_count).options(*with_attribute_values()).join(
+            SuperheroFavoriteStats, SuperheroFavoriteStats.superhero_id == Superhero.id
+        ).filter(
+            SuperheroFavoriteStats.favorite_count > 0
+        ).order_by(
+            SuperheroFavoriteStats.favorite_count.desc(),
+            SuperheroFavoriteStats.superhero_id.desc()
+        ).limit(limit).all()
+
+    def get_trending(self, limit: int = 10) -> List[Tuple[Superhero, float]]:
+        """Get the top-N superheroes by time-decayed favorite activity"""
+        current_score = (
+            SuperheroFavoriteStats.trending_score * _decay_factor(SuperheroFavoriteStats.trending_updated_at)
+        ).label("trending_score")
+        return self.db.query(Superhero, current_score).options(*with_attribute_values()).join(
+            SuperheroFavoriteStats, SuperheroFavoriteStats.superhero_id == Superhero.id
+        ).filter(
+            SuperheroFavoriteStats.trending_score > 0
+        ).order_by(
+            current_score.desc(),
+            SuperheroFavoriteStats.superhero_id.desc()
+        ).limit(limit).all()
+
+    def rebuild_trending_scores(self) -> int:
+        """
+        Recompute trending scores from favorites inside the trending window.
+
+        Favorites older than the window contribute (almost) nothing after decay,
+        so they are ignored; this also clears floating point drift from the
+        incremental updates.
+
+        Returns:
+            Number of heroes with a non-zero trending score
+        """
+        window_start = func.now() - timedelta(days=settings.TRENDING_WINDOW_DAYS)
+        recent = select(
+            UserFavorite.superhero_id,
+            func.sum(_decay_factor(UserFavorite.created_at)).label("trending_score")
+        ).where(
+            UserFavorite.created_at >= window_start
+        ).group_by(UserFavorite.superhero_id)
+
+        upsert = pg_insert(SuperheroFavoriteStats).from_select(
+            ["superhero_id", "trending_score"], recent
+        )
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[SuperheroFavoriteStats.superhero_id],
+            set_={"trending_score": upsert.excluded.trending_score, "trending_updated_at": func.now()}
+        )
+        scored = self.db.execute(upsert).rowcount
+
+        self.db.execute(
+            update(SuperheroFavoriteStats).where(
+                SuperheroFavoriteStats.trending_score != 0,
+                SuperheroFavoriteStats.superhero_id.not_in(
+                    select(UserFavorite.superhero_id).where(UserFavorite.created_at >= window_start).distinct()
+                )
+            ).values(trending_score=0, trending_updated_at=func.now())
+        )
+
+        self.db.commit()
+        return scored
+
+    def get_also_favorited(self, superhero_id: int, limit: int = 10) -> List[Tuple[Superhero, int]]:
+        """Get heroes most often favorited together with the given hero"""
+        return self.db.query(Superhero, SuperheroCoFavorite.co_count).options(*with_attribute_values()).join(
+            SuperheroCoFavorite, SuperheroCoFavorite.other_superhero_id == Superhero.id
+        ).filter(
+            SuperheroCoFavorite.superhero_id == superhero_id,
+            SuperheroCoFavorite.co_count > 0
+        ).order_by(
+            SuperheroCoFavorite.co_count.desc(),
+            SuperheroCoFavorite.other_superhero_id.desc()
+        ).limit(limit).all()
+
+    def get_recommended_for_user(self, user_id: int, limit: int = 10) -> List[Tuple[Superhero, int]]:
+        """Get heroes co-favorited with the user's favorites that the user hasn't favorited yet"""
+        user_favorites = select(UserFavorite.superhero_id).where(UserFavorite.user_id == user_id)
+        score = func.sum(SuperheroCoFavorite.co_count)
+        ranked = select(
+            SuperheroCoFavorite.other_superhero_id.label("superhero_id"),
+            score.label("score")
+        ).where(
+            SuperheroCoFavorite.superhero_id.in_(user_favorites),
+            SuperheroCoFavorite.other_superhero_id.not_in(user_favorites),
+            SuperheroCoFavorite.co_count > 0
+        ).group_by(
+            SuperheroCoFavorite.other_superhero_id
+        ).order_by(
+            score.desc(), SuperheroCoFavorite.other_superhero_id.desc()
+        ).limit(limit).subquery()
+
+        return self.db.query(Superhero, ranked.c.score).options(*with_attribute_values()).join(
+            ranked, ranked.c.superhero_id == Superhero.id
+        ).order_by(ranked.c.score.desc(), Superhero.id.desc()).all()
+
+    def iter_favorite_pairs(self, batch_size: int = 10000) -> Iterator[Tuple[int, int]]:
+        """Stream all (user_id, superhero_id) favorite pairs"""
+        result = self.db.execute(
+            select(UserFavorite.user_id, UserFavorite.superhero_id).execution_options(yield_per=batch_size)
+        )
+        for user_id, superhero_id in result:
+            yield user_id, superhero_id
+
+    def lock_co_favorites(self):
+        """
+        Block co-favorite increments (not reads) until this transaction commits.
+        Taken before reading favorites for a rebuild so the counts it writes
+        include every favorite committed before the lock and none made after.
+        """
+        self.db.execute(text(f"LOCK TABLE {SuperheroCoFavorite.__tablename__} IN EXCLUSIVE MODE"))
+
+    def replace_co_favorite_counts(self, rows: List[Tuple[int, int, int]], batch_size: int = 5000) -> int:
+        """
+        Bring the co-favorite table to the given counts in a single transaction.
+
+        The counts are loaded into a temporary staging table; rows whose count
+        changed are upserted and pairs missing from the new counts are deleted,
+        so readers keep seeing the previous model until the commit.
+
+        Returns:
+            Number of rows inserted, updated or deleted
+        """
+        connection = self.db.connection()
+        _co_favorite_staging.create(connection)
+        for i in range(0, len(rows), batch_size):
+            self.db.execute(
+                insert(_co_favorite_staging),
+                [
+                    {"superhero_id": a, "other_superhero_id": b, "co_count": count}
+                    for a, b, count in rows[i:i + batch_size]
+                ]
+            )
+
+        upsert = pg_insert(SuperheroCoFavorite).from_select(
+            ["superhero_id", "other_superhero_id", "co_count"], select(_co_favorite_staging)
+        )
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[SuperheroCoFavorite.superhero_id, SuperheroCoFavorite.other_superhero_id],
+            set_={"co_count": upsert.excluded.co_count},
+            where=SuperheroCoFavorite.co_count != upsert.excluded.co_count
+        )
+        changed = self.db.execute(upsert).rowcount
+
+        changed += self.db.execute(
+            delete(SuperheroCoFavorite).where(
+                ~exists().where(
+                    _co_favorite_staging.c.superhero_id == SuperheroCoFavorite.superhero_id,
+                    _co_favorite_staging.c.other_superhero_id == SuperheroCoFavorite.other_superhero_id
+                )
+            )
+        ).rowcount
+
+        self.db.commit()
+        return changed
+
+    def reconcile_favorite_counts(self) -> int:
+        """
+        Recompute favorite counters from user_favorites.
+
+        The counter table is locked against concurrent add/remove first (reads
+        are not blocked), so the recount sees every favorite committed before it
+        and no increment can land between the count and the assignment. Each
+        correction is a single recompute-and-assign statement, and only rows
+        whose stored count drifted are written.
+
+        Returns:
+            Number of counter rows that were corrected
+        """
+        self.db.execute(text(f"LOCK TABLE {SuperheroFavoriteStats.__tablename__} IN EXCLUSIVE MODE"))
+        actual = select(
+            UserFavorite.superhero_id,
+            func.count(UserFavorite.id).label("favorite_count")
+        ).group_by(UserFavorite.superhero_id).subquery()
+
+        corrected = self.db.execute(
+            update(SuperheroFavoriteStats).where(
+                SuperheroFavoriteStats.superhero_id == actual.c.superhero_id,
+                SuperheroFavoriteStats.favorite_count != actual.c.favorite_count
+            ).values(favorite_count=actual.c.favorite_count, updated_at=func.now())
+        ).rowcount
+
+        # Heroes with favorites but no counter row yet
+        corrected += self.db.execute(
+            pg_insert(SuperheroFavoriteStats).from_select(
+                ["superhero_id", "favorite_count"],
+                select(actual.c.superhero_id, actual.c.favorite_count).where(
+                    actual.c.superhero_id.not_in(select(SuperheroFavoriteStats.superhero_id))
+                )
+            ).on_conflict_do_nothing()
+        ).rowcount
+
+        # Heroes that lost all their favorites have no row in the aggregate above
+        corrected += self.db.execute(
+            update(SuperheroFavoriteStats).where(
+                SuperheroFavoriteStats.favorite_count != 0,
+                SuperheroFavoriteStats.superhero_id.not_in(select(UserFavorite.superhero_id).distinct())
+            ).values(favorite_count=0, updated_at=func.now())
+        ).rowcount
+
+        self.db.commit()
+        return corrected
+
+    def _record_favorite_event(self, superhero_id: int, count_delta: int, score_delta):
+        """
+        Apply a favorite add/remove to the hero's aggregates inside the current transaction.
+
+        The stored trending score is decayed up to now() before score_delta is added,
+        so each event is a single-row upsert.
+        """
+        decayed_score = SuperheroFavoriteStats.trending_score * _decay_factor(SuperheroFavoriteStats.trending_updated_at)
+        stmt = pg_insert(SuperheroFavoriteStats).values(
+            superhero_id=superhero_id,
+            favorite_count=max(count_delta, 0),
+            trending_score=func.greatest(score_delta, 0)
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SuperheroFavoriteStats.superhero_id],
+            set_={
+                "favorite_count": func.greatest(SuperheroFavoriteStats.favorite_count + count_delta, 0),
+                "trending_score": func.greatest(decayed_score + score_delta, 0),
+                "trending_updated_at": func.now(),
+                "updated_at": func.now()
+            }
+        )
+        self.db.execute(stmt)
+
+    def _apply_co_favorite_delta(self, user_id: int, superhero_id: int, delta: int):
+        """Adjust co-favorite counts between a hero and the user's other favorites"""
+        is_other_favorite = and_(
+            UserFavorite.user_id == user_id,
+            UserFavorite.superhero_id != superhero_id
+        )
+
+        if delta > 0:
+            pairs = select(
+                literal(superhero_id), UserFavorite.superhero_id, literal(delta)
+            ).where(is_other_favorite).union_all(
+                select(
+                    UserFavorite.superhero_id, literal(superhero_id), literal(delta)
+                ).where(is_other_favorite)
+            )
+            stmt = pg_insert(SuperheroCoFavorite).from_select(
+                ["superhero_id", "other_superhero_id", "co_count"], pairs
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[SuperheroCoFavorite.superhero_id, SuperheroCoFavorite.other_superhero_id],
+                set_={"co_count": SuperheroCoFavorite.co_count + delta}
+            )
+            self.db.execute(stmt)
+        else:
+            # Rows that reach zero are filtered on read and dropped by the next rebuild
+            others = select(UserFavorite.superhero_id).where(is_other_favorite)
+            self.db.execute(
+                update(SuperheroCoFavorite).where(
+                    or_(
+                        and_(SuperheroCoFavorite.superhero_id == superhero_id,
+                             SuperheroCoFavorite.other_superhero_id.in_(others)),
+                        and_(SuperheroCoFavorite.other_superhero_id == superhero_id,
+                             SuperheroCoFavorite.superhero_id.in_(others))
+                    )
+                ).values(co_count=func.greatest(SuperheroCoFavorite.co_count + delta, 0))
+            )
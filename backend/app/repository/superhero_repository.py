@@ -1,11 +1,18 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy import or_, func, select, update
 from typing import Optional, List, Tuple
-from ..models.superhero import Superhero
+from ..models.superhero import Superhero, CatalogVersion, with_attribute_values
+from ..models.attribute import Publisher, Alignment
+from .attribute_repository import AttributeRepository
+
+def _alignment_code(alignment: str):
+    """Scalar subquery for an alignment's dictionary code, so filters compare small integers on the indexed column"""
+    return select(Alignment.id).where(Alignment.name == alignment).scalar_subquery()
 
 class SuperheroRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.attribute_repo = AttributeRepository(db)
 
     def get_all(
         self, 
@@ -23,42 +30,76 @@ class SuperheroRepository:
                 or_(
                     Superhero.name.ilike(search_term),
                     Superhero.full_name.ilike(search_term),
-                    Superhero.publisher.ilike(search_term)
+                    Superhero.publisher_id.in_(select(Publisher.id).where(Publisher.name.ilike(search_term)))
                 )
             )
 
         if alignment:
-            query = query.filter(Superhero.alignment == alignment)
+            query = query.filter(Superhero.alignment_id == _alignment_code(alignment))
 
         total = query.count()
-        items = query.offset((page - 1) * page_size).limit(page_size).all()
+        items = query.options(*with_attribute_values()).offset((page - 1) * page_size).limit(page_size).all()
         
         return items, total
 
     def get_by_id(self, superhero_id: int) -> Optional[Superhero]:
         """Get superhero by ID"""
-        return self.db.query(Superhero).filter(Superhero.id == superhero_id).first()
+        return self.db.query(Superhero).options(*with_attribute_values()).filter(Superhero.id == superhero_id).first()
+
+    def get_by_ids(self, superhero_ids: List[int]) -> List[Superhero]:
+        """Get superheroes by IDs in a single query (order not guaranteed)"""
+        if not superhero_ids:
+            return []
+        return self.db.query(Superhero).options(*with_attribute_values()).filter(Superhero.id.in_(set(superhero_ids))).all()
+
+    def get_missing_ids(self, superhero_ids: List[int]) -> List[int]:
+        """Return the given IDs that don't exist, checked in a single query"""
+        unique_ids = set(superhero_ids)
+        if not unique_ids:
+            return []
+        existing = {
+            row.id for row in self.db.query(Superhero.id).filter(Superhero.id.in_(unique_ids)).all()
+        }
+        return sorted(unique_ids - existing)
 
     def update(self, superhero: Superhero, update_data: dict) -> Superhero:
         """Update superhero data"""
+        update_data = self.attribute_repo.encode(
+            {key: value for key, value in update_data.items() if value is not None}
+        )
         for key, value in update_data.items():
             if hasattr(superhero, key) and value is not None:
                 setattr(superhero, key, value)
+        self.bump_catalog_version()
         self.db.commit()
         self.db.refresh(superhero)
         return superhero
 
+    def get_catalog_version(self) -> int:
+        """Current catalog version (0 before any hero was written)"""
+        return self.db.query(CatalogVersion.version).filter(CatalogVersion.id == 1).scalar() or 0
+
+    def bump_catalog_version(self):
+        """Advance the catalog version inside the current transaction (caller commits)"""
+        bumped = self.db.execute(
+            update(CatalogVersion).where(CatalogVersion.id == 1).values(version=CatalogVersion.version + 1)
+        ).rowcount
+        if not bumped:
+            self.db.add(CatalogVersion(id=1, version=1))
+
     def get_by_alignment(self, alignment: str) -> List[Superhero]:
         """Get superheroes by alignment"""
-        return self.db.query(Superhero).filter(Superhero.alignment == alignment).all()
+        return self.db.query(Superhero).options(*with_attribute_values()).filter(
+            Superhero.alignment_id == _alignment_code(alignment)
+        ).all()
 
     def get_random(self, count: int = 5) -> List[Superhero]:
         """Get random superheroes"""
-        return self.db.query(Superhero).order_by(func.random()).limit(count).all()
+        return self.db.query(Superhero).options(*with_attribute_values()).order_by(func.random()).limit(count).all()
 
     def get_by_power_stat(self, stat_name: str, min_value: int = 50) -> List[Superhero]:
         """Get superheroes by power stat (intelligence, strength, etc.)"""
         stat_column = getattr(Superhero, stat_name, None)
         if not stat_column:
             return []
-        return self.db.query(Superhero).filter(stat_column >= min_value).all()
+        return self.db.query(Superhero).options(*with_attribute_values()).filter(stat_column >= min_value).all()
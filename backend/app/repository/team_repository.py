@@ -1,7 +1,24 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from ..models.team import Team, TeamMember
-from ..models.superhero import Superhero
+from sqlalchemy.orm import Session, selectinload, joinedload, aliased
+from sqlalchemy import delete, insert, update, func, select, or_, and_, values, column, Integer, Float
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from collections import defaultdict, deque
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from ..models.team import Team, TeamMember, TeamStats, TeamRating, TeamLshBucket
+from ..models.superhero import Superhero, with_attribute_values
+from ..service.team_scoring import STAT_FIELDS, STAT_TOTAL_KEYS, aggregate_heroes
+from ..service.team_ladder import INITIAL_RATING, ladder_factors, place_rating
+from ..service.team_signatures import roster_fingerprint, lsh_buckets
+
+# team_stats columns that feed the ladder's scoring factors (ladder_factors argument order)
+_LADDER_COLUMNS = [
+    TeamStats.member_count, TeamStats.total_power, TeamStats.total_strength,
+    TeamStats.total_combat, TeamStats.total_intelligence
+]
+
+def _with_members():
+    """Loader option hydrating members and their heroes in one extra query for all loaded teams"""
+    return selectinload(Team.members).joinedload(TeamMember.superhero).options(*with_attribute_values())
 
 class TeamRepository:
     def __init__(self, db: Session):
@@ -9,7 +26,12 @@ class TeamRepository:
 
     def create_team(self, name: str, description: Optional[str], user_id: int, superhero_ids: List[int]) -> Team:
         """Create a new team with members"""
-        team = Team(name=name, description=description, user_id=user_id)
+        team = Team(
+            name=name,
+            description=description,
+            user_id=user_id,
+            roster_fingerprint=roster_fingerprint(superhero_ids) if superhero_ids else None
+        )
         self.db.add(team)
         self.db.flush()  # Get team ID without committing
 
@@ -18,39 +40,102 @@ class TeamRepository:
             member = TeamMember(team_id=team.id, superhero_id=superhero_id, position=position)
             self.db.add(member)
 
+        self.db.flush()
+        self.refresh_team_stats([team.id])
+        self._refresh_team_signature(team, superhero_ids)
         self.db.commit()
-        self.db.refresh(team)
-        return team
+        return self.get_team_by_id(team.id)
+
+    def get_user_teams(self, user_id: int, with_members: bool = True) -> List[Team]:
+        """Get all teams for a user (with members and heroes loaded unless with_members=False)"""
+        query = self.db.query(Team).filter(Team.user_id == user_id)
+        if with_members:
+            query = query.options(_with_members())
+        return query.all()
+
+    def get_user_team_summaries(self, user_id: int, limit: int = 20, after_updated_at=None, after_id: Optional[int] = None) -> list:
+        """
+        Get a page of the user's teams (most recently updated first) as lightweight rows:
+        id, name, updated_at, member_count and total_power from the materialized stats.
+
+        Pages are keyed on the last (updated_at, id) seen.
+        """
+        query = self.db.query(
+            Team.id, Team.name, Team.updated_at, TeamStats.member_count, TeamStats.total_power
+        ).outerjoin(TeamStats, TeamStats.team_id == Team.id).filter(Team.user_id == user_id)
+        if after_updated_at is not None and after_id is not None:
+            query = query.filter(or_(
+                Team.updated_at < after_updated_at,
+                and_(Team.updated_at == after_updated_at, Team.id < after_id)
+            ))
+        return query.order_by(Team.updated_at.desc(), Team.id.desc()).limit(limit).all()
+
+    def get_member_thumbnails(self, team_ids: List[int]) -> Dict[int, List[dict]]:
+        """Get {team_id: [{id, name, image_url}]} in member order for several teams in one query"""
+        rows = self.db.query(
+            TeamMember.team_id, Superhero.id, Superhero.name, Superhero.image_url
+        ).join(Superhero, Superhero.id == TeamMember.superhero_id).filter(
+            TeamMember.team_id.in_(team_ids)
+        ).order_by(TeamMember.team_id, TeamMember.position, TeamMember.id).all()
+        thumbnails: Dict[int, List[dict]] = {team_id: [] for team_id in team_ids}
+        for team_id, hero_id, name, image_url in rows:
+            thumbnails[team_id].append({"id": hero_id, "name": name, "image_url": image_url})
+        return thumbnails
 
-    def get_user_teams(self, user_id: int) -> List[Team]:
-        """Get all teams for a user"""
-        return self.db.query(Team).filter(Team.user_id == user_id).all()
+    def get_teams_by_ids(self, team_ids: List[int], user_id: Optional[int] = None) -> List[Team]:
+        """Get several teams (stats loaded, members not), optionally filtered by user"""
+        query = self.db.query(Team).filter(Team.id.in_(team_ids))
+        if user_id:
+            query = query.filter(Team.user_id == user_id)
+        return query.all()
 
-    def get_team_by_id(self, team_id: int, user_id: Optional[int] = None) -> Optional[Team]:
-        """Get team by ID, optionally filtered by user"""
+    def get_team_by_id(self, team_id: int, user_id: Optional[int] = None, with_members: bool = True) -> Optional[Team]:
+        """Get team by ID (with members and heroes loaded unless with_members=False), optionally filtered by user"""
         query = self.db.query(Team).filter(Team.id == team_id)
+        if with_members:
+            query = query.options(_with_members())
         if user_id:
             query = query.filter(Team.user_id == user_id)
         return query.first()
 
+    def get_team_rosters(self, team_ids: List[int], user_id: int) -> Dict[int, Tuple[str, List[int], Optional[TeamStats]]]:
+        """Get {team_id: (name, member superhero IDs, materialized stats)} for the user's teams in a single query"""
+        rows = (
+            self.db.query(Team.id, Team.name, TeamStats, TeamMember.superhero_id)
+            .outerjoin(TeamStats, TeamStats.team_id == Team.id)
+            .outerjoin(TeamMember, TeamMember.team_id == Team.id)
+            .filter(Team.id.in_(set(team_ids)), Team.user_id == user_id)
+            .order_by(Team.id, TeamMember.position, TeamMember.id)
+            .all()
+        )
+        rosters: Dict[int, Tuple[str, List[int], Optional[TeamStats]]] = {}
+        for team_id, name, stats, superhero_id in rows:
+            roster = rosters.setdefault(team_id, (name, [], stats))
+            if superhero_id is not None:
+                roster[1].append(superhero_id)
+        return rosters
+
     def update_team(self, team: Team, name: Optional[str] = None, description: Optional[str] = None, superhero_ids: Optional[List[int]] = None) -> Team:
-        """Update team information and/or members"""
+        """
+        Update team information and/or members.
+
+        Membership changes are applied as a diff. The team row is always
+        updated, so the version check guards the whole edit.
+        """
         if name:
             team.name = name
         if description is not None:
             team.description = description
 
         if superhero_ids is not None:
-            # Remove existing members
-            self.db.query(TeamMember).filter(TeamMember.team_id == team.id).delete()
-            # Add new members
-            for position, superhero_id in enumerate(superhero_ids):
-                member = TeamMember(team_id=team.id, superhero_id=superhero_id, position=position)
-                self.db.add(member)
+            self._apply_member_diff(team, superhero_ids)
+            self.refresh_team_stats([team.id])
+            self._refresh_team_signature(team, superhero_ids)
+            # Bump updated_at/version even when only members changed
+            team.updated_at = func.now()
 
         self.db.commit()
-        self.db.refresh(team)
-        return team
+        return self.get_team_by_id(team.id)
 
     def delete_team(self, team_id: int) -> bool:
         """Delete a team"""
@@ -62,10 +147,257 @@ class TeamRepository:
         return False
 
     def get_team_superheroes(self, team_id: int) -> List[Superhero]:
-        """Get all superheroes in a team"""
-        members = self.db.query(TeamMember).filter(
+        """Get all superheroes in a team, in member position order"""
+        # Loaded through the member rows: a hero picked twice must come back twice
+        members = self.db.query(TeamMember).options(
+            joinedload(TeamMember.superhero).options(*with_attribute_values())
+        ).filter(
             TeamMember.team_id == team_id
-        ).order_by(TeamMember.position).all()
-        
-        superhero_ids = [m.superhero_id for m in members]
-        return self.db.query(Superhero).filter(Superhero.id.in_(superhero_ids)).all()
+        ).order_by(TeamMember.position, TeamMember.id).all()
+        return [member.superhero for member in members]
+
+    def refresh_team_stats(self, team_ids: List[int]):
+        """
+        Recompute materialized stats for the given teams (caller commits).
+
+        Loads member hero stats for all teams in one query and upserts one
+        TeamStats row per team.
+        """
+        if not team_ids:
+            return
+
+        # Loaded through the member rows so repeated heroes count every time;
+        # only the alignment is read from the attribute dictionaries
+        members = self.db.query(TeamMember).options(
+            joinedload(TeamMember.superhero).joinedload(Superhero.alignment_value)
+        ).filter(TeamMember.team_id.in_(team_ids)).all()
+
+        heroes_by_team = {team_id: [] for team_id in team_ids}
+        for member in members:
+            heroes_by_team[member.team_id].append(member.superhero)
+
+        values = []
+        for team_id, heroes in heroes_by_team.items():
+            member_count, totals, alignment_counts = aggregate_heroes(heroes)
+            row = {
+                "team_id": team_id,
+                "member_count": member_count,
+                "total_power": sum(totals.values()),
+                "alignment_distribution": alignment_counts
+            }
+            for field in STAT_FIELDS:
+                row[STAT_TOTAL_KEYS[field]] = totals[field]
+            values.append(row)
+
+        stmt = pg_insert(TeamStats).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TeamStats.team_id],
+            set_={
+                column: stmt.excluded[column]
+                for column in values[0] if column != "team_id"
+            } | {"updated_at": func.now()}
+        )
+        self.db.execute(stmt)
+
+    def refresh_stats_for_superhero(self, superhero_id: int, batch_size: int = 1000):
+        """Recompute stats for every team that includes the given hero"""
+        team_ids = [
+            row.team_id for row in self.db.query(TeamMember.team_id).filter(
+                TeamMember.superhero_id == superhero_id
+            ).distinct().all()
+        ]
+        for i in range(0, len(team_ids), batch_size):
+            self.refresh_team_stats(team_ids[i:i + batch_size])
+        self.db.commit()
+
+    def get_similar_team_candidates(self, team_id: int, limit: int = 500) -> List[int]:
+        """IDs of teams sharing at least one LSH bucket with the given team (most shared buckets first)"""
+        own = aliased(TeamLshBucket)
+        other = aliased(TeamLshBucket)
+        rows = self.db.query(other.team_id).join(
+            own, and_(own.band == other.band, own.bucket == other.bucket)
+        ).filter(
+            own.team_id == team_id,
+            other.team_id != team_id
+        ).group_by(other.team_id).order_by(
+            func.count().desc(), other.team_id
+        ).limit(limit).all()
+        return [row.team_id for row in rows]
+
+    def get_member_sets(self, team_ids: List[int]) -> Dict[int, Tuple[str, set]]:
+        """Get {team_id: (name, member superhero IDs)} for any teams in a single query"""
+        rows = self.db.query(Team.id, Team.name, TeamMember.superhero_id).outerjoin(
+            TeamMember, TeamMember.team_id == Team.id
+        ).filter(Team.id.in_(set(team_ids))).all()
+        members: Dict[int, Tuple[str, set]] = {}
+        for team_id, name, superhero_id in rows:
+            entry = members.setdefault(team_id, (name, set()))
+            if superhero_id is not None:
+                entry[1].add(superhero_id)
+        return members
+
+    def iter_ladder_entries(self, batch_size: int = 10000) -> Iterator[tuple]:
+        """Stream (team_id, member_count, total_power, total_strength, total_combat, total_intelligence) for every non-empty team"""
+        result = self.db.execute(
+            select(TeamStats.team_id, *_LADDER_COLUMNS)
+            .where(TeamStats.member_count > 0)
+            .execution_options(yield_per=batch_size)
+        )
+        for row in result:
+            yield tuple(row)
+
+    def save_fitted_ratings(self, team_ids: List[int], ratings: List[float], matches: List[int], batch_size: int = 5000):
+        """
+        Upsert the refitted ratings of the given teams in a single transaction.
+
+        Call in the same transaction that read the ladder entries: a team
+        placed after that read started (its rating row is newer than the
+        transaction) keeps its placement, and ratings of teams outside the fit
+        are left alone.
+        """
+        for i in range(0, len(team_ids), batch_size):
+            fitted = values(
+                column("team_id", Integer), column("rating", Float), column("matches", Integer), name="fitted"
+            ).data(list(zip(team_ids[i:i + batch_size], ratings[i:i + batch_size], matches[i:i + batch_size])))
+            # Teams deleted since the entries were read are skipped rather than failing the batch
+            stmt = pg_insert(TeamRating).from_select(
+                ["team_id", "rating", "matches"],
+                select(fitted).where(fitted.c.team_id.in_(select(Team.id)))
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[TeamRating.team_id],
+                set_={"rating": stmt.excluded.rating, "matches": stmt.excluded.matches, "updated_at": func.now()},
+                where=TeamRating.updated_at < func.now()
+            )
+            self.db.execute(stmt)
+        self.db.commit()
+
+    def get_ladder(self, limit: int = 50, after_rating: Optional[float] = None, after_team_id: Optional[int] = None) -> List[Tuple[TeamRating, str]]:
+        """
+        Get a page of the ladder ordered by rating (highest first), then team ID.
+
+        Pages are keyed on the last (rating, team_id) seen, so every page is an
+        index range scan regardless of depth.
+        """
+        query = self.db.query(TeamRating, Team.name).join(Team, Team.id == TeamRating.team_id)
+        if after_rating is not None and after_team_id is not None:
+            query = query.filter(or_(
+                TeamRating.rating < after_rating,
+                and_(TeamRating.rating == after_rating, TeamRating.team_id > after_team_id)
+            ))
+        return query.order_by(TeamRating.rating.desc(), TeamRating.team_id).limit(limit).all()
+
+    def get_ladder_rank(self, rating: float, team_id: int) -> int:
+        """1-based ladder position of the given (rating, team_id) entry"""
+        ahead = self.db.query(func.count(TeamRating.team_id)).filter(or_(
+            TeamRating.rating > rating,
+            and_(TeamRating.rating == rating, TeamRating.team_id < team_id)
+        )).scalar()
+        return ahead + 1
+
+    def place_team_rating(self, team_id: int, probes: int, peers: int):
+        """
+        Place a created or edited team on the current ladder, holding every other rating fixed.
+
+        Teams without members are taken off the ladder. A team whose roster is
+        identical to a rated team copies that rating. When the ladder is empty
+        the team starts at the initial rating.
+        """
+        stats = self.db.query(*_LADDER_COLUMNS).filter(TeamStats.team_id == team_id).first()
+        if not stats or not stats.member_count:
+            self.db.execute(delete(TeamRating).where(TeamRating.team_id == team_id))
+            self.db.commit()
+            return
+
+        # An identical roster elsewhere on the ladder already has the answer
+        twin = self.db.query(TeamRating.rating, TeamRating.matches).join(
+            Team, Team.id == TeamRating.team_id
+        ).filter(
+            Team.roster_fingerprint == select(Team.roster_fingerprint).where(Team.id == team_id).scalar_subquery(),
+            Team.id != team_id
+        ).first()
+        if twin:
+            self._save_team_rating(team_id, twin.rating, twin.matches)
+            return
+
+        factors = ladder_factors(*[[value] for value in stats])[0]
+        low, high = self.db.query(func.min(TeamRating.rating), func.max(TeamRating.rating)).filter(
+            TeamRating.team_id != team_id
+        ).one()
+
+        rating = INITIAL_RATING
+        played = 0
+        if low is not None:
+            def peers_at(target: float) -> np.ndarray:
+                nonlocal played
+                rows = self._get_rating_peers(target, team_id, peers)
+                played += len(rows)
+                return ladder_factors(*zip(*rows)) if rows else np.empty((0, len(_LADDER_COLUMNS)))
+
+            rating = place_rating(factors, peers_at, low, high, probes)
+
+        self._save_team_rating(team_id, rating, played)
+
+    def _save_team_rating(self, team_id: int, rating: float, matches: int):
+        """Upsert one team's rating and commit"""
+        stmt = pg_insert(TeamRating).values(team_id=team_id, rating=rating, matches=matches)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TeamRating.team_id],
+            set_={"rating": stmt.excluded.rating, "matches": stmt.excluded.matches, "updated_at": func.now()}
+        )
+        self.db.execute(stmt)
+        self.db.commit()
+
+    def _get_rating_peers(self, rating: float, exclude_team_id: int, count: int) -> List[tuple]:
+        """Ladder columns of the teams rated closest to `rating` (half above, half below), in one query"""
+        def side(condition, order):
+            return select(TeamRating.rating, *_LADDER_COLUMNS).join(
+                TeamStats, TeamStats.team_id == TeamRating.team_id
+            ).where(TeamRating.team_id != exclude_team_id, condition).order_by(order).limit(count).subquery()
+
+        above = side(TeamRating.rating >= rating, TeamRating.rating)
+        below = side(TeamRating.rating < rating, TeamRating.rating.desc())
+        rows = self.db.execute(select(above).union_all(select(below))).all()
+        above_rows = sorted((row for row in rows if row[0] >= rating), key=lambda row: row[0])[:count // 2]
+        below_rows = sorted((row for row in rows if row[0] < rating), key=lambda row: -row[0])[:count - len(above_rows)]
+        return [tuple(row[1:]) for row in above_rows + below_rows]
+
+    def _refresh_team_signature(self, team: Team, superhero_ids: List[int]):
+        """Store the roster fingerprint and replace the team's LSH buckets (caller commits)"""
+        team.roster_fingerprint = roster_fingerprint(superhero_ids) if superhero_ids else None
+        self.db.execute(delete(TeamLshBucket).where(TeamLshBucket.team_id == team.id))
+        buckets = lsh_buckets(superhero_ids)
+        if buckets:
+            self.db.execute(
+                insert(TeamLshBucket),
+                [{"team_id": team.id, "band": band, "bucket": bucket} for band, bucket in buckets]
+            )
+
+    def _apply_member_diff(self, team: Team, superhero_ids: List[int]):
+        """Insert, delete and re-position only the members that changed"""
+        # Existing members per hero, in position order (a hero may appear more than once)
+        existing_by_hero = defaultdict(deque)
+        for member in team.members:
+            existing_by_hero[member.superhero_id].append(member)
+
+        position_updates = []
+        new_members = []
+        for position, superhero_id in enumerate(superhero_ids):
+            if existing_by_hero[superhero_id]:
+                member = existing_by_hero[superhero_id].popleft()
+                if member.position != position:
+                    position_updates.append({"id": member.id, "position": position})
+            else:
+                new_members.append({"team_id": team.id, "superhero_id": superhero_id, "position": position})
+
+        removed_ids = [member.id for members in existing_by_hero.values() for member in members]
+
+        if removed_ids:
+            self.db.execute(
+                delete(TeamMember).where(TeamMember.id.in_(removed_ids)),
+                execution_options={"synchronize_session": False}
+            )
+        if position_updates:
+            self.db.execute(update(TeamMember), position_updates)
+        if new_members:
+            self.db.execute(insert(TeamMember), new_members)
@@ -1,5 +1,16 @@
 from sqlalchemy.orm import Session
-from ..models.user import User
+from sqlalchemy import func, case, cast, or_, delete, update, BigInteger
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import hashlib
+import re
+from ..models.user import User, PasswordResetToken
+from ..utils.principal_cache import principal_cache
+
+def _hash_token(token: str) -> str:
+    """Lookup key for a reset token (tokens are 256-bit random, so a fast hash is enough)"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
 
 class UserRepository:
     def __init__(self, db: Session):
@@ -13,6 +24,48 @@ class UserRepository:
         """Get user by username"""
         return self.db.query(User).filter(User.username == username).first()
 
+    def get_next_username(self, base: str) -> str:
+        """
+        Pick the next free username for a base in one query: the base itself if
+        unused, otherwise the base followed by one more than the highest numeric
+        suffix in use (john, john1, john7 -> john8). Concurrent callers can get
+        the same answer; the unique constraint decides and the loser retries.
+        """
+        suffix = func.substr(User.username, len(base) + 1)
+        base_taken, highest = self.db.query(
+            func.bool_or(User.username == base),
+            func.max(case((User.username == base, 0), else_=cast(suffix, BigInteger)))
+        ).filter(
+            User.username.startswith(base, autoescape=True),
+            User.username.regexp_match(f"^{re.escape(base)}[0-9]{{0,9}}$")
+        ).one()
+        # john5 alone leaves john itself free
+        return f"{base}{highest + 1}" if base_taken else base
+
+    def get_username_usage(self, bases: Iterable[str]) -> Dict[str, Tuple[bool, int]]:
+        """
+        Batch form of get_next_username: (bare base taken, highest numeric suffix in
+        use or 0) for each base; bases with no username are absent. With only john5
+        taken, john maps to (False, 5), so the base itself is still free.
+        One query over the OR'ed prefix ranges; the base-plus-digits match is applied
+        here so overlapping bases (john, john1) each get their own answer.
+        """
+        bases = set(bases)
+        if not bases:
+            return {}
+        usernames = self.db.query(User.username).filter(
+            or_(*[User.username.startswith(base, autoescape=True) for base in bases])
+        ).all()
+        usage = {}
+        for (username,) in usernames:
+            digits = len(username) - len(username.rstrip("0123456789"))
+            for length in range(min(digits, 9) + 1):
+                base = username[:len(username) - length]
+                if base in bases:
+                    taken, highest = usage.get(base, (False, 0))
+                    usage[base] = (taken or username == base, max(highest, int(username[len(base):] or 0)))
+        return usage
+
     def get_user_by_id(self, user_id: int) -> User:
         """Get user by ID"""
         return self.db.query(User).filter(User.id == user_id).first()
@@ -25,53 +78,105 @@ class UserRepository:
         self.db.refresh(user)
         return user
 
+    def get_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """Return which of the given emails already belong to a user"""
+        emails = list(emails)
+        if not emails:
+            return set()
+        return {email for (email,) in self.db.query(User.email).filter(User.email.in_(emails)).all()}
+
+    def bulk_create_users(self, rows: List[dict]) -> Set[str]:
+        """
+        Insert users in one multi-row statement. Rows that hit the unique email or
+        username constraint are skipped rather than failing the batch; returns the
+        emails that were inserted.
+        """
+        if not rows:
+            return set()
+        stmt = pg_insert(User).values(rows).on_conflict_do_nothing().returning(User.email)
+        inserted = {email for (email,) in self.db.execute(stmt)}
+        self.db.commit()
+        return inserted
+
     def update_user(self, user: User, update_data: dict) -> User:
         """Update user data"""
+        previous_email = user.email
         for key, value in update_data.items():
             if hasattr(user, key):
                 setattr(user, key, value)
         self.db.commit()
+        # Cached principals must not outlive a role, status, email or password change
+        principal_cache.invalidate(previous_email)
+        principal_cache.invalidate(user.email)
         self.db.refresh(user)
         return user
 
     def soft_delete_user(self, user: User) -> User:
         """Soft delete user"""
-        from datetime import datetime
         user.deleted_at = datetime.utcnow()
         user.is_active = False
         self.db.commit()
+        principal_cache.invalidate(user.email)
         return user
 
     def get_active_users(self) -> list[User]:
         """Get all active users"""
         return self.db.query(User).filter(User.is_active == True).all()
 
-    def set_password_reset_token(self, user: User, token: str, expires_at) -> User:
-        """Set password reset token for user"""
-        user.reset_token = token
-        user.reset_token_expires_at = expires_at
+    def create_password_reset_token(self, user: User, token: str, expires_at) -> PasswordResetToken:
+        """Store a reset token for a user by its hash, replacing any earlier ones"""
+        self.db.query(PasswordResetToken).filter(PasswordResetToken.user_id == user.id).delete(synchronize_session=False)
+        reset_token = PasswordResetToken(token_hash=_hash_token(token), user_id=user.id, expires_at=expires_at)
+        self.db.add(reset_token)
         self.db.commit()
-        self.db.refresh(user)
-        return user
+        return reset_token
 
-    def get_user_by_reset_token(self, token: str) -> User:
-        """Get user by reset token"""
-        return self.db.query(User).filter(User.reset_token == token).first()
+    def get_password_reset_token(self, token: str) -> Optional[PasswordResetToken]:
+        """Find an unexpired reset token (a primary key lookup on the token hash)"""
+        return self.db.query(PasswordResetToken).filter(
+            PasswordResetToken.token_hash == _hash_token(token),
+            PasswordResetToken.expires_at > datetime.now(timezone.utc)
+        ).first()
 
-    def clear_password_reset_token(self, user: User) -> User:
-        """Clear password reset token for user"""
-        user.reset_token = None
-        user.reset_token_expires_at = None
-        self.db.commit()
-        self.db.refresh(user)
-        return user
+    def reset_password_with_token(self, token: str, password_hash: str) -> bool:
+        """
+        Consume an unexpired reset token and set the user's new password hash in
+        one transaction. Concurrent resets with the same token race on the
+        token row's DELETE, so exactly one of them succeeds.
 
-    def is_reset_token_valid(self, user: User) -> bool:
-        """Check if user's reset token is valid (not expired)"""
-        if not user.reset_token or not user.reset_token_expires_at:
+        Returns:
+            False (and changes nothing) for an unknown, expired or already used
+            token, or an inactive user
+        """
+        user_id = self.db.execute(
+            delete(PasswordResetToken).where(
+                PasswordResetToken.token_hash == _hash_token(token),
+                PasswordResetToken.expires_at > datetime.now(timezone.utc)
+            ).returning(PasswordResetToken.user_id).execution_options(synchronize_session=False)
+        ).scalar()
+        email = None
+        if user_id is not None:
+            email = self.db.execute(
+                update(User).where(User.id == user_id, User.is_active == True)
+                .values(password_hash=password_hash).returning(User.email)
+            ).scalar()
+        if email is None:
+            self.db.rollback()
             return False
 
-        from datetime import datetime, timezone
-        # Make current time timezone-aware to match database datetime
-        now = datetime.now(timezone.utc)
-        return now < user.reset_token_expires_at
\ No newline at end of file
+        # Other outstanding tokens of the user die with the old password
+        self.db.execute(
+            delete(PasswordResetToken).where(PasswordResetToken.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        principal_cache.invalidate(email)
+        return True
+
+    def delete_expired_password_reset_tokens(self) -> int:
+        """Bulk-delete expired reset tokens (a range scan on the expiry index); returns the number removed"""
+        deleted = self.db.query(PasswordResetToken).filter(
+            PasswordResetToken.expires_at <= datetime.now(timezone.utc)
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return deleted
@@ -18,8 +18,14 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     controller = AuthController(db)
     result = controller.register_user(user_data)
     if result.status == "error":
-        # Return 409 for duplicate email, 400 for other validation errors
-        if "already exists" in result.message.lower():
+        # Return 409 for duplicate email, 503 when shedding load, 400 for other validation errors
+        if "busy" in result.message.lower():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=result.message,
+                headers={"Retry-After": "1"},
+            )
+        elif "already exists" in result.message.lower():
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail=result.message
@@ -43,8 +49,14 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     result = controller.authenticate_user(login_data.email, login_data.password)
 
     if result.status == "error":
-        # Return 401 for invalid credentials, 500 for server errors
-        if "server error" in result.message.lower():
+        # Return 401 for invalid credentials, 503 when shedding load, 500 for server errors
+        if "busy" in result.message.lower():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=result.message,
+                headers={"Retry-After": "1"},
+            )
+        elif "server error" in result.message.lower():
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=result.message
@@ -96,8 +108,14 @@ def reset_password(request: ResetPasswordRequest, db: Session = Depends(get_db))
     result = controller.reset_password(request.token, request.new_password)
 
     if result.status == "error":
-        # Return 400 for invalid/expired token, 500 for server errors
-        if "invalid" in result.message.lower() or "expired" in result.message.lower():
+        # Return 400 for invalid/expired token, 503 when shedding load, 500 for server errors
+        if "busy" in result.message.lower():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=result.message,
+                headers={"Retry-After": "1"},
+            )
+        elif "invalid" in result.message.lower() or "expired" in result.message.lower():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=result.message
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from ..database import get_db
@@ -90,6 +90,33 @@ def get_favorites(
 
     return result
 
+@router.get("/recommendations", response_model=APIResponse)
+def get_recommendations(
+    limit: int = Query(10, ge=1, le=50),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+):
+    """Get superheroes recommended for the current user"""
+    token = credentials.credentials
+    user = get_current_active_user(db, token)
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required"
+        )
+
+    controller = FavoriteController(db)
+    result = controller.get_recommendations(user.id, limit)
+
+    if result.status == "error":
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=result.message
+        )
+
+    return result
+
 @router.get("/check/{superhero_id}", response_model=APIResponse)
 def check_favorite(
     superhero_id: int,
@@ -45,6 +45,54 @@ def get_superheroes(
 
     return result
 
+@router.get("/most-favorited", response_model=APIResponse)
+def get_most_favorited(
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Get the most favorited superheroes"""
+    controller = SuperheroController(db)
+    result = controller.get_most_favorited(limit)
+
+    if result.status == "error":
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=result.message
+        )
+
+    return result
+
+@router.get("/trending", response_model=APIResponse)
+def get_trending(
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Get superheroes ranked by recent favorite activity"""
+    controller = SuperheroController(db)
+    result = controller.get_trending(limit)
+
+    if result.status == "error":
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=result.message
+        )
+
+    return result
+
+@router.get("/facets", response_model=APIResponse)
+def get_facets(db: Session = Depends(get_db)):
+    """Count heroes per publisher, alignment, gender, race, eye color and hair color"""
+    controller = SuperheroController(db)
+    result = controller.get_facets()
+
+    if result.status == "error":
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=result.message
+        )
+
+    return result
+
 @router.get("/{superhero_id}", response_model=APIResponse)
 def get_superhero(
     superhero_id: int,
@@ -62,6 +110,65 @@ def get_superhero(
 
     return result
 
+@router.get("/{superhero_id}/also-favorited", response_model=APIResponse)
+def get_also_favorited(
+    superhero_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """Get heroes that fans of this superhero also favorited"""
+    controller = SuperheroController(db)
+    result = controller.get_also_favorited(superhero_id, limit)
+
+    if result.status == "error":
+        status_code = status.HTTP_404_NOT_FOUND if "not found" in result.message.lower() else status.HTTP_500_INTERNAL_SERVER_ERROR
+        raise HTTPException(
+            status_code=status_code,
+            detail=result.message
+        )
+
+    return result
+
+@router.get("/{superhero_id}/teammates", response_model=APIResponse)
+def get_teammates(
+    superhero_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    include_former: bool = Query(False, description="Also count groups the heroes used to belong to"),
+    db: Session = Depends(get_db)
+):
+    """Get heroes that share a group with this superhero"""
+    controller = SuperheroController(db)
+    result = controller.get_teammates(superhero_id, limit, include_former)
+
+    if result.status == "error":
+        status_code = status.HTTP_404_NOT_FOUND if "not found" in result.message.lower() else status.HTTP_500_INTERNAL_SERVER_ERROR
+        raise HTTPException(
+            status_code=status_code,
+            detail=result.message
+        )
+
+    return result
+
+@router.get("/{superhero_id}/shared-groups/{other_id}", response_model=APIResponse)
+def get_shared_groups(
+    superhero_id: int,
+    other_id: int,
+    include_former: bool = Query(False, description="Also count groups the heroes used to belong to"),
+    db: Session = Depends(get_db)
+):
+    """Get the groups two superheroes have in common"""
+    controller = SuperheroController(db)
+    result = controller.get_shared_groups(superhero_id, other_id, include_former)
+
+    if result.status == "error":
+        status_code = status.HTTP_404_NOT_FOUND if "not found" in result.message.lower() else status.HTTP_500_INTERNAL_SERVER_ERROR
+        raise HTTPException(
+            status_code=status_code,
+            detail=result.message
+        )
+
+    return result
+
 @router.put("/{superhero_id}", response_model=APIResponse)
 def update_superhero(
     superhero_id: int,
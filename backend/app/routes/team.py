@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import List, Optional
-from pydantic import BaseModel
+from datetime import datetime
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
 from ..database import get_db
 from ..schemas.auth import APIResponse
 from ..controllers.team_controller import TeamController
@@ -20,6 +21,24 @@ class TeamUpdateRequest(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
     superhero_ids: Optional[List[int]] = None
+    version: Optional[int] = None  # Expected team version for optimistic concurrency
+
+class TeamOptimizeRequest(BaseModel):
+    team_size: int = Field(5, ge=1, le=10)
+    stat_weights: Optional[Dict[str, float]] = None  # Per-powerstat weight (default 1.0)
+    required_ids: List[int] = []
+    excluded_ids: List[int] = []
+    alignment_min: Optional[Dict[str, int]] = None  # e.g. {"good": 2}
+    alignment_max: Optional[Dict[str, int]] = None
+    publisher_max: Optional[Dict[str, int]] = None  # e.g. {"Marvel Comics": 3}
+    max_per_publisher: Optional[int] = Field(None, ge=1)
+    time_limit_ms: int = Field(1000, ge=10, le=10000)
+
+class TeamCompareAdhocRequest(BaseModel):
+    team1_ids: List[int] = Field(..., min_length=1, max_length=10)
+    team2_ids: List[int] = Field(..., min_length=1, max_length=10)
+    team1_name: Optional[str] = None
+    team2_name: Optional[str] = None
 
 @router.post("", response_model=APIResponse)
 def create_team(
@@ -58,10 +77,14 @@ def create_team(
 
 @router.get("", response_model=APIResponse)
 def get_teams(
+    view: Literal["full", "summary"] = Query("full", description="summary: paginated, no hero payloads"),
+    limit: int = Query(20, ge=1, le=100, description="Page size (summary view)"),
+    after_updated_at: Optional[datetime] = Query(None, description="updated_at of the last team on the previous page (summary view)"),
+    after_id: Optional[int] = Query(None, description="ID of the last team on the previous page (summary view)"),
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
-    """Get all teams for current user"""
+    """Get all teams for current user (or a page of lightweight summaries)"""
     token = credentials.credentials
     user = get_current_active_user(db, token)
 
@@ -72,11 +95,17 @@ def get_teams(
         )
 
     controller = TeamController(db)
-    result = controller.get_user_teams(user.id)
+    if view == "summary":
+        result = controller.get_user_team_summaries(user.id, limit, after_updated_at, after_id)
+    else:
+        result = controller.get_user_teams(user.id)
 
     if result.status == "error":
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        if "must be provided together" in result.message:
+            status_code = status.HTTP_400_BAD_REQUEST
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=status_code,
             detail=result.message
         )
 
@@ -86,6 +115,10 @@ def get_teams(
 def compare_teams(
     team1_id: int = Query(..., description="First team ID"),
     team2_id: int = Query(..., description="Second team ID"),
+    simulate: bool = Query(False, description="Also run a Monte Carlo battle simulation"),
+    trials: Optional[int] = Query(None, ge=100, description="Simulation trials (capped by server budget)"),
+    seed: Optional[int] = Query(None, ge=0, description="Simulation seed for reproducible results"),
+    time_budget_ms: Optional[int] = Query(None, ge=10, description="Simulation time budget (capped by server budget)"),
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
@@ -100,7 +133,144 @@ def compare_teams(
         )
 
     controller = TeamController(db)
-    result = controller.compare_teams(team1_id, team2_id, user.id)
+    result = controller.compare_teams(team1_id, team2_id, user.id, simulate, trials, seed, time_budget_ms)
+
+    if result.status == "error":
+        status_code = status.HTTP_400_BAD_REQUEST
+        if "not found" in result.message.lower():
+            status_code = status.HTTP_404_NOT_FOUND
+        raise HTTPException(
+            status_code=status_code,
+            detail=result.message
+        )
+
+    return result
+
+@router.post("/compare-adhoc", response_model=APIResponse)
+def compare_adhoc(
+    compare_data: TeamCompareAdhocRequest,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+):
+    """Compare two unsaved rosters and predict a winner"""
+    token = credentials.credentials
+    user = get_current_active_user(db, token)
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required"
+        )
+
+    controller = TeamController(db)
+    result = controller.compare_adhoc(
+        compare_data.team1_ids,
+        compare_data.team2_ids,
+        compare_data.team1_name,
+        compare_data.team2_name
+    )
+
+    if result.status == "error":
+        status_code = status.HTTP_400_BAD_REQUEST
+        if "not found" in result.message.lower():
+            status_code = status.HTTP_404_NOT_FOUND
+        raise HTTPException(
+            status_code=status_code,
+            detail=result.message
+        )
+
+    return result
+
+@router.get("/ladder", response_model=APIResponse)
+def get_ladder(
+    limit: int = Query(50, ge=1, le=200),
+    after_rating: Optional[float] = Query(None, description="Rating of the last entry on the previous page"),
+    after_team_id: Optional[int] = Query(None, description="Team ID of the last entry on the previous page"),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+):
+    """Get the global team rating ladder (keyset paginated)"""
+    token = credentials.credentials
+    user = get_current_active_user(db, token)
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required"
+        )
+
+    controller = TeamController(db)
+    result = controller.get_ladder(limit, after_rating, after_team_id)
+
+    if result.status == "error":
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        if "must be provided together" in result.message:
+            status_code = status.HTTP_400_BAD_REQUEST
+        raise HTTPException(
+            status_code=status_code,
+            detail=result.message
+        )
+
+    return result
+
+@router.get("/tournament", response_model=APIResponse)
+def run_tournament(
+    team_ids: Optional[List[int]] = Query(None, description="Team IDs to include (default: all of your teams)"),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+):
+    """Rank teams with a round-robin tournament"""
+    token = credentials.credentials
+    user = get_current_active_user(db, token)
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required"
+        )
+
+    controller = TeamController(db)
+    result = controller.run_tournament(user.id, team_ids)
+
+    if result.status == "error":
+        status_code = status.HTTP_400_BAD_REQUEST
+        if "not found" in result.message.lower():
+            status_code = status.HTTP_404_NOT_FOUND
+        raise HTTPException(
+            status_code=status_code,
+            detail=result.message
+        )
+
+    return result
+
+@router.post("/optimize", response_model=APIResponse)
+def optimize_team(
+    optimize_data: TeamOptimizeRequest,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+):
+    """Build the best-scoring team under the given constraints"""
+    token = credentials.credentials
+    user = get_current_active_user(db, token)
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required"
+        )
+
+    controller = TeamController(db)
+    result = controller.optimize_team(
+        optimize_data.team_size,
+        optimize_data.stat_weights,
+        optimize_data.required_ids,
+        optimize_data.excluded_ids,
+        optimize_data.alignment_min,
+        optimize_data.alignment_max,
+        optimize_data.publisher_max,
+        optimize_data.max_per_publisher,
+        optimize_data.time_limit_ms
+    )
 
     if result.status == "error":
         status_code = status.HTTP_400_BAD_REQUEST
@@ -140,6 +310,71 @@ def get_team(
 
     return result
 
+@router.get("/{team_id}/counter", response_model=APIResponse)
+def suggest_counter_team(
+    team_id: int,
+    team_size: Optional[int] = Query(None, ge=1, le=10, description="Counter roster size (default: same as the team)"),
+    favorites_only: bool = Query(False, description="Only pick from your favorite heroes"),
+    time_limit_ms: int = Query(500, ge=10, le=5000, description="Search time limit"),
+    seed: Optional[int] = Query(None, ge=0, description="Seed for reproducible results"),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+):
+    """Suggest the roster that beats a team by the widest margin"""
+    token = credentials.credentials
+    user = get_current_active_user(db, token)
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required"
+        )
+
+    controller = TeamController(db)
+    result = controller.suggest_counter_team(team_id, user.id, team_size, favorites_only, time_limit_ms, seed)
+
+    if result.status == "error":
+        status_code = status.HTTP_400_BAD_REQUEST
+        if "not found" in result.message.lower():
+            status_code = status.HTTP_404_NOT_FOUND
+        raise HTTPException(
+            status_code=status_code,
+            detail=result.message
+        )
+
+    return result
+
+@router.get("/{team_id}/similar", response_model=APIResponse)
+def get_similar_teams(
+    team_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+):
+    """Find identical and near-identical rosters to a team"""
+    token = credentials.credentials
+    user = get_current_active_user(db, token)
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required"
+        )
+
+    controller = TeamController(db)
+    result = controller.get_similar_teams(team_id, user.id, limit)
+
+    if result.status == "error":
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        if "not found" in result.message.lower():
+            status_code = status.HTTP_404_NOT_FOUND
+        raise HTTPException(
+            status_code=status_code,
+            detail=result.message
+        )
+
+    return result
+
 @router.put("/{team_id}", response_model=APIResponse)
 def update_team(
     team_id: int,
@@ -163,13 +398,16 @@ def update_team(
         user.id,
         team_data.name,
         team_data.description,
-        team_data.superhero_ids
+        team_data.superhero_ids,
+        team_data.version
     )
 
     if result.status == "error":
         status_code = status.HTTP_400_BAD_REQUEST
         if "not found" in result.message.lower():
             status_code = status.HTTP_404_NOT_FOUND
+        elif "modified by another request" in result.message.lower():
+            status_code = status.HTTP_409_CONFLICT
         raise HTTPException(
             status_code=status_code,
             detail=result.message
@@ -1,5 +1,7 @@
 from .superhero_seeder import SuperheroSeeder, run_seeder
 from .user_seeder import UserSeeder, run_user_seeder
+from .affiliation_seeder import AffiliationSeeder, run_affiliation_seeder
+from .user_import import UserImporter, run_user_import
 from .run_all import main as run_all_seeders
 
-__all__ = ["SuperheroSeeder", "run_seeder", "UserSeeder", "run_user_seeder", "run_all_seeders"]
\ No newline at end of file
+__all__ = ["SuperheroSeeder", "run_seeder", "UserSeeder", "run_user_seeder", "AffiliationSeeder", "run_affiliation_seeder", "UserImporter", "run_user_import", "run_all_seeders"]
\ No newline at end of file
@@ -0,0 +1,32 @@
+import logging
+from ..database import SessionLocal
+from ..repository.affiliation_repository import AffiliationRepository
+from ..utils import setup_logger
+
+class AffiliationSeeder:
+    def __init__(self):
+        self.logger = setup_logger("affiliation_seeder", level=logging.INFO)
+
+    def seed_affiliations(self):
+        """Rebuild the affiliation graph from every hero's group_affiliation and relatives"""
+        self.logger.info("Starting affiliation graph rebuild...")
+
+        db = SessionLocal()
+        try:
+            groups, memberships, relations = AffiliationRepository(db).rebuild_all()
+            self.logger.info(f"Affiliation graph rebuilt: {groups} groups, {memberships} memberships, {relations} relations")
+
+        except Exception as e:
+            db.rollback()
+            self.logger.error(f"Error during affiliation graph rebuild: {e}")
+            raise
+        finally:
+            db.close()
+
+def run_affiliation_seeder():
+    """Convenience function to run the affiliation seeder"""
+    seeder = AffiliationSeeder()
+    seeder.seed_affiliations()
+
+if __name__ == "__main__":
+    run_affiliation_seeder()
@@ -8,11 +8,13 @@ Run this after setting up your environment variables.
 Available seeders:
 - superhero: Fetches and stores superhero data from Superhero API
 - user: Creates admin user account
+- affiliation: Rebuilds the affiliation graph from stored superhero data
 
 Usage:
     python -m app.seeder.run_all                    # Run all seeders
     python -m app.seeder.run_all superhero         # Run only superhero seeder
     python -m app.seeder.run_all user              # Run only user seeder
+    python -m app.seeder.run_all affiliation       # Rebuild only the affiliation graph
     python -m app.seeder.run_all --help           # Show help
 
 Or from the seeder directory:
@@ -26,6 +28,7 @@ import argparse
 import logging
 from .superhero_seeder import run_seeder
 from .user_seeder import run_user_seeder
+from .affiliation_seeder import run_affiliation_seeder
 from ..utils import setup_logger
 
 def seed_superheroes():
@@ -60,6 +63,20 @@ def seed_users():
         logger.error(f"❌ Error during user seeding: {e}")
         return False
 
+def seed_affiliations():
+    """Rebuild the affiliation graph from stored superhero data"""
+    logger = setup_logger("seeder_runner", level=logging.INFO)
+
+    logger.info("🌟 Starting affiliation graph rebuild...")
+
+    try:
+        run_affiliation_seeder()
+        logger.info("🎉 Affiliation graph rebuilt successfully!")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Error during affiliation graph rebuild: {e}")
+        return False
+
 def main():
     logger = setup_logger("seeder_runner", level=logging.INFO)
 
@@ -67,7 +84,7 @@ def main():
     parser.add_argument(
         "seeders",
         nargs="*",
-        help="Specify which seeders to run: 'superhero', 'user', or 'all' (default: all)"
+        help="Specify which seeders to run: 'superhero', 'user', 'affiliation', or 'all' (default: all)"
     )
 
     args = parser.parse_args()
@@ -77,7 +94,7 @@ def main():
         args.seeders = ["all"]
     
     # Validate choices
-    valid_choices = ["superhero", "user", "all"]
+    valid_choices = ["superhero", "user", "affiliation", "all"]
     for seeder in args.seeders:
         if seeder not in valid_choices:
             parser.error(f"Invalid choice: '{seeder}'. Choose from: {', '.join(valid_choices)}")
@@ -88,6 +105,11 @@ def main():
         if not success:
             sys.exit(1)
 
+    if "all" in args.seeders or "affiliation" in args.seeders:
+        success = seed_affiliations()
+        if not success:
+            sys.exit(1)
+
     if "all" in args.seeders or "user" in args.seeders:
         success = seed_users()
         if not success:
@@ -4,6 +4,8 @@ import logging
 from sqlalchemy.orm import Session
 from ..database import SessionLocal
 from ..models.superhero import Superhero
+from ..repository.attribute_repository import AttributeRepository
+from ..repository.superhero_repository import SuperheroRepository
 from ..config import settings
 from ..utils import setup_logger
 import time
@@ -43,8 +45,8 @@ class SuperheroSeeder:
 
         return valid_results
 
-    def create_superhero_from_data(self, data: dict) -> Superhero:
-        """Create a Superhero instance from API data"""
+    def create_superhero_from_data(self, data: dict, attribute_repo: AttributeRepository) -> Superhero:
+        """Create a Superhero instance from API data (attribute values are stored as dictionary codes)"""
         # Extract powerstats
         powerstats = data.get("powerstats", {})
         intelligence = self._parse_int(powerstats.get("intelligence", "0"))
@@ -72,6 +74,8 @@ class SuperheroSeeder:
         # Extract image
         image = data.get("image", {})
 
+        attributes = attribute_repo.encode(self._attribute_values(data))
+
         return Superhero(
             id=int(data.get("id", 0)),
             name=data.get("name", ""),
@@ -90,19 +94,13 @@ class SuperheroSeeder:
             alter_egos=biography.get("alter-egos", ""),
             place_of_birth=biography.get("place-of-birth", ""),
             first_appearance=biography.get("first-appearance", ""),
-            publisher=biography.get("publisher", ""),
-            alignment=biography.get("alignment", ""),
             aliases=aliases,
 
             # Appearance
-            gender=appearance.get("gender", ""),
-            race=appearance.get("race", ""),
             height_feet=height[0] if len(height) > 0 else "",
             height_cm=height[1] if len(height) > 1 else "",
             weight_lbs=weight[0] if len(weight) > 0 else "",
             weight_kg=weight[1] if len(weight) > 1 else "",
-            eye_color=appearance.get("eye-color", ""),
-            hair_color=appearance.get("hair-color", ""),
 
             # Work
             occupation=work.get("occupation", ""),
@@ -113,9 +111,25 @@ class SuperheroSeeder:
             relatives=connections.get("relatives", ""),
 
             # Image
-            image_url=image.get("url", "")
+            image_url=image.get("url", ""),
+
+            # Publisher, alignment, gender, race, eye and hair color codes
+            **attributes
         )
 
+    def _attribute_values(self, data: dict) -> dict:
+        """Raw dictionary-encoded attribute values of a hero from API data"""
+        biography = data.get("biography", {})
+        appearance = data.get("appearance", {})
+        return {
+            "publisher": biography.get("publisher", ""),
+            "alignment": biography.get("alignment", ""),
+            "gender": appearance.get("gender", ""),
+            "race": appearance.get("race", ""),
+            "eye_color": appearance.get("eye-color", ""),
+            "hair_color": appearance.get("hair-color", "")
+        }
+
     def _parse_int(self, value: str) -> int:
         """Parse string to int, return 0 if invalid"""
         try:
@@ -130,6 +144,9 @@ class SuperheroSeeder:
 
         db = SessionLocal()
         try:
+            attribute_repo = AttributeRepository(db)
+            attribute_repo.preload()
+
             # Get existing hero IDs to avoid duplicates
             existing_ids = {hero.id for hero in db.query(Superhero.id).all()}
             self.logger.info(f"Found {len(existing_ids)} existing heroes in database")
@@ -156,11 +173,14 @@ class SuperheroSeeder:
                 # Fetch batch
                 batch_data = self.fetch_batch(batch_ids)
 
+                # Create the batch's new attribute values together; heroes then encode from memory
+                attribute_repo.encode_many([self._attribute_values(data) for data in batch_data])
+
                 # Create superhero objects
                 superheroes = []
                 for idx, data in enumerate(batch_data):
                     try:
-                        hero = self.create_superhero_from_data(data)
+                        hero = self.create_superhero_from_data(data, attribute_repo)
                         superheroes.append(hero)
                         total_added += 1
                         # Show progress for each hero
@@ -172,6 +192,7 @@ class SuperheroSeeder:
                 if superheroes:
                     try:
                         db.add_all(superheroes)
+                        SuperheroRepository(db).bump_catalog_version()
                         db.commit()
                         self.logger.info(f"✅ Batch {batch_num}: Successfully added {len(superheroes)} heroes to database")
                         self.logger.info(f"   Total heroes in database now: {total_added}/{len(hero_ids)}")
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Bulk user import for onboarding large tenants.
+
+Registering through the API costs one bcrypt hash, several queries and a commit
+per user. The importer streams a CSV or NDJSON file in batches instead. For each
+batch it:
+
+- validates records with the registration schema
+- checks emails against existing users in one query
+- hashes passwords across a process pool (bcrypt is CPU-bound and dominates the run)
+- assigns usernames from one batched suffix lookup
+- inserts the users with a single multi-row statement
+
+Records that cannot be imported go to a reject file with the reason; passwords
+are never written there. A progress file is rewritten after every committed
+batch, so an interrupted import can be continued with --resume. Before a batch
+is inserted, the emails about to be written are recorded next to the last
+checkpoint. A resume can then tell users inserted by the interrupted batch from
+genuine duplicates. The reject file is cut back to the checkpoint, because the
+records after it are read and rejected again.
+
+Input columns (CSV header) or keys (one JSON object per line): email,
+first_name, last_name, password. They follow the same rules as registration,
+and imported users get the "user" role.
+
+Usage:
+    python -m app.seeder.user_import users.csv
+    python -m app.seeder.user_import users.ndjson --workers 8 --batch-size 2000
+    python -m app.seeder.user_import users.csv --resume
+"""
+
+import argparse
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from ..database import SessionLocal
+from ..repository.user_repository import UserRepository
+from ..schemas.auth import UserCreate
+from ..utils import setup_logger
+from ..utils.auth import pwd_context
+
+# Same retry budget as registration for usernames taken by a concurrent signup
+USERNAME_ALLOCATION_ATTEMPTS = 5
+
+FORMATS_BY_EXTENSION = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".json": "ndjson"}
+
+def _hash_password(password: str) -> str:
+    """Worker process entry point: hash with the API's bcrypt context and cost"""
+    return pwd_context.hash(password)
+
+def _describe_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" for detail in error.errors()
+    )
+
+def read_records(path: str, file_format: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Stream (record number, fields, parse error) from a CSV or NDJSON file.
+    Records are numbered from 1; blank NDJSON lines are skipped and not counted.
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        if file_format == "csv":
+            for number, row in enumerate(csv.DictReader(handle), start=1):
+                # Cells beyond the header land under the None key
+                yield number, {key: value for key, value in row.items() if key is not None}, None
+            return
+
+        number = 0
+        for line in handle:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield number, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield number, None, "Expected a JSON object"
+                continue
+            yield number, record, None
+
+class UserImporter:
+    def __init__(
+        self,
+        path: str,
+        file_format: str,
+        batch_size: int = 1000,
+        workers: Optional[int] = None,
+        progress_path: Optional[str] = None,
+        reject_path: Optional[str] = None
+    ):
+        self.logger = setup_logger("user_import", level=logging.INFO)
+        self.path = path
+        self.file_format = file_format
+        self.batch_size = max(batch_size, 1)
+        self.workers = max(workers or os.cpu_count() or 1, 1)
+        self.progress_path = progress_path or f"{path}.progress.json"
+        self.reject_path = reject_path or f"{path}.rejects.ndjson"
+        self.processed = 0
+        self.imported = 0
+        self.rejected = 0
+        self.hash_seconds = 0.0
+        self.insert_seconds = 0.0
+        self._started = 0.0
+        self._resumed_from = 0
+        self._checkpoint: dict = {}
+        # Emails the interrupted run was inserting after its last checkpoint
+        self._in_flight_emails = set()
+        self._rejects = None
+        self._seen_emails = set()
+        # Username base -> highest numeric suffix handed out or in use (0 when none)
+        self._username_suffixes: Dict[str, int] = {}
+        # Bases whose bare name is neither in use nor handed out yet
+        self._free_bases = set()
+
+    def run(self, resume: bool = False) -> dict:
+        """Import the whole file and return the final progress summary"""
+        skip = self._resumed_from = self._load_progress() if resume else 0
+        if skip:
+            self.logger.info(f"Resuming after record {skip} ({self.imported} imported, {self.rejected} rejected so far)")
+
+        self._started = time.perf_counter()
+        self._checkpoint = self._progress()
+        if resume:
+            self._truncate_rejects(self.rejected)
+        db = SessionLocal()
+        pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            with open(self.reject_path, "a" if resume else "w", encoding="utf-8") as self._rejects:
+                repo = UserRepository(db)
+                batch: List[Tuple[int, dict]] = []
+                for number, fields, error in read_records(self.path, self.file_format):
+                    if number <= skip:
+                        continue
+                    if error:
+                        self._reject(number, None, error)
+                    else:
+                        batch.append((number, fields))
+                    self.processed = number
+                    if len(batch) >= self.batch_size:
+                        self._import_batch(repo, pool, batch)
+                        batch = []
+                if batch:
+                    self._import_batch(repo, pool, batch)
+                self._write_progress(finished=True)
+        except Exception as e:
+            db.rollback()
+            self.logger.error(f"User import stopped after record {self.processed}: {e}")
+            raise
+        finally:
+            pool.shutdown(cancel_futures=True)
+            db.close()
+
+        summary = self._progress(finished=True)
+        self.logger.info(
+            f"User import finished: {self.imported} imported, {self.rejected} rejected "
+            f"in {summary['elapsed_seconds']}s ({summary['records_per_second']}/s)"
+        )
+        return summary
+
+    def _import_batch(self, repo: UserRepository, pool: ProcessPoolExecutor, batch: List[Tuple[int, dict]]):
+        """Validate, hash and insert one batch, then record progress"""
+        users: List[Tuple[int, UserCreate]] = []
+        for number, fields in batch:
+            try:
+                user = UserCreate.model_validate(fields)
+            except ValidationError as e:
+                self._reject(number, fields.get("email"), _describe_validation_error(e))
+                continue
+            if user.email in self._seen_emails:
+                self._reject(number, user.email, "Duplicate email in import file")
+                continue
+            self._seen_emails.add(user.email)
+            users.append((number, user))
+
+        existing = repo.get_existing_emails(user.email for _, user in users)
+        for number, user in users:
+            if user.email in existing and user.email in self._in_flight_emails:
+                # Committed by the interrupted run after its last checkpoint
+                self.imported += 1
+            elif user.email in existing:
+                self._reject(number, user.email, "User with this email already exists")
+        users = [(number, user) for number, user in users if user.email not in existing]
+
+        # Only records that can still be imported are hashed
+        started = time.perf_counter()
+        chunksize = max(len(users) // (self.workers * 4), 1)
+        hashes = list(pool.map(_hash_password, [user.password for _, user in users], chunksize=chunksize))
+        self.hash_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        pending = [
+            (number, {
+                "email": user.email,
+                "first_name": user.first_name,
+                "last_name": user.last_name,
+                "password_hash": password_hash,
+                "role": "user",
+                "is_active": True
+            })
+            for (number, user), password_hash in zip(users, hashes)
+        ]
+        if pending:
+            self._write_in_flight([row["email"] for _, row in pending])
+        for _ in range(USERNAME_ALLOCATION_ATTEMPTS):
+            if not pending:
+                break
+            self._assign_usernames(repo, [row for _, row in pending])
+            inserted = repo.bulk_create_users([row for _, row in pending])
+            self.imported += len(inserted)
+            pending = [(number, row) for number, row in pending if row["email"] not in inserted]
+            if not pending:
+                break
+
+            # Skipped rows lost an email to a concurrent signup or a username to a concurrent
+            # signup or an overlapping base in this file; recheck and allocate again from the database
+            taken = repo.get_existing_emails(row["email"] for _, row in pending)
+            for number, row in pending:
+                if row["email"] in taken:
+                    self._reject(number, row["email"], "User with this email already exists")
+                else:
+                    self._username_suffixes.pop(row["email"].split("@")[0], None)
+            pending = [(number, row) for number, row in pending if row["email"] not in taken]
+
+        for number, row in pending:
+            self._reject(number, row["email"], "Could not allocate a username")
+        self.insert_seconds += time.perf_counter() - started
+
+        self._rejects.flush()
+        self._write_progress()
+        self.logger.info(f"Record {self.processed}: {self.imported} imported, {self.rejected} rejected")
+
+    def _assign_usernames(self, repo: UserRepository, rows: List[dict]):
+        """Username from the email's local part with a numeric suffix when taken, like registration"""
+        bases = {row["email"].split("@")[0] for row in rows}
+        unknown = bases - self._username_suffixes.keys()
+        if unknown:
+            usage = repo.get_username_usage(unknown)
+            for base in unknown:
+                taken, highest = usage.get(base, (False, 0))
+                self._username_suffixes[base] = highest
+                if taken:
+                    self._free_bases.discard(base)
+                else:
+                    self._free_bases.add(base)
+        for row in rows:
+            base = row["email"].split("@")[0]
+            if base in self._free_bases:
+                # The bare base goes first, even when suffixed names already exist
+                self._free_bases.discard(base)
+                row["username"] = base
+                continue
+            suffix = self._username_suffixes[base] + 1
+            self._username_suffixes[base] = suffix
+            row["username"] = f"{base}{suffix}"
+
+    def _reject(self, number: int, email: Optional[str], reason: str):
+        self.rejected += 1
+        self._rejects.write(json.dumps({"record": number, "email": email, "reason": reason}) + "\n")
+
+    def _progress(self, finished: bool = False) -> dict:
+        elapsed = time.perf_counter() - self._started
+        return {
+            "source": os.path.abspath(self.path),
+            "finished": finished,
+            "processed": self.processed,
+            "imported": self.imported,
+            "rejected": self.rejected,
+            "elapsed_seconds": round(elapsed, 1),
+            "records_per_second": round((self.processed - self._resumed_from) / elapsed, 1) if elapsed else 0.0,
+            "hash_seconds": round(self.hash_seconds, 1),
+            "insert_seconds": round(self.insert_seconds, 1),
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }
+
+    def _write_progress(self, finished: bool = False):
+        """Checkpoint after a committed batch"""
+        self._checkpoint = self._progress(finished)
+        self._save_progress(self._checkpoint)
+
+    def _write_in_flight(self, emails: List[str]):
+        """Record the emails about to be inserted, alongside the unchanged last checkpoint"""
+        self._save_progress({**self._checkpoint, "in_flight_emails": emails})
+
+    def _save_progress(self, progress: dict):
+        """Replace the progress file atomically so a crash never leaves it half-written"""
+        temporary_path = f"{self.progress_path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as handle:
+            json.dump(progress, handle, indent=2)
+        os.replace(temporary_path, self.progress_path)
+
+    def _truncate_rejects(self, lines: int):
+        """Cut the reject file back to the checkpoint (one line per counted reject)"""
+        if not os.path.exists(self.reject_path):
+            return
+        with open(self.reject_path, "r+b") as handle:
+            for _ in range(lines):
+                if not handle.readline():
+                    break
+            handle.truncate()
+
+    def _load_progress(self) -> int:
+        """Restore counters from the progress file and return the last committed record number"""
+        if not os.path.exists(self.progress_path):
+            return 0
+        with open(self.progress_path, encoding="utf-8") as handle:
+            progress = json.load(handle)
+        self.imported = progress.get("imported", 0)
+        self.rejected = progress.get("rejected", 0)
+        self.processed = progress.get("processed", 0)
+        self._in_flight_emails = set(progress.get("in_flight_emails", []))
+        return self.processed
+
+def run_user_import(path: str, file_format: Optional[str] = None, resume: bool = False, **options) -> dict:
+    """Convenience function to import users from a file"""
+    file_format = file_format or FORMATS_BY_EXTENSION.get(os.path.splitext(path)[1].lower(), "csv")
+    return UserImporter(path, file_format, **options).run(resume=resume)
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import users from a CSV or NDJSON file")
+    parser.add_argument("path", help="CSV with a header row, or one JSON object per line")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Input format (default: from the file extension)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Records per insert and commit (default: 1000)")
+    parser.add_argument("--workers", type=int, default=None, help="Hashing processes (default: CPU count)")
+    parser.add_argument("--progress-file", help="Progress file (default: <path>.progress.json)")
+    parser.add_argument("--reject-file", help="Reject file (default: <path>.rejects.ndjson)")
+    parser.add_argument("--resume", action="store_true", help="Continue after the last batch recorded in the progress file")
+    args = parser.parse_args()
+
+    try:
+        run_user_import(
+            args.path,
+            args.format,
+            resume=args.resume,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            progress_path=args.progress_file,
+            reject_path=args.reject_file
+        )
+    except Exception:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
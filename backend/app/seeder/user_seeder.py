@@ -1,17 +1,16 @@
-import bcrypt
 import logging
 from sqlalchemy.orm import Session
 from ..database import SessionLocal
 from ..models.user import User
-from ..utils import setup_logger
+from ..utils import setup_logger, get_password_hash
 
 class UserSeeder:
     def __init__(self):
         self.logger = setup_logger("user_seeder", level=logging.INFO)
 
     def hash_password(self, password: str) -> str:
-        """Hash a password using bcrypt"""
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        """Hash a password with the API's configured bcrypt context"""
+        return get_password_hash(password)
 
     def create_admin_user(self, db: Session):
         """Create the admin user"""
@@ -0,0 +1,138 @@
+"""
+In-memory adjacency index over the affiliation graph.
+
+The graph tables (affiliation_groups, superhero_groups, superhero_relations)
+are small, so each process keeps hero -> groups, group -> heroes and
+hero -> related heroes as dictionaries of sets. Teammate, shared-group and
+synergy queries are then dictionary lookups and set intersections. The index
+follows the catalog's TTL and is dropped when this process edits a hero.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from itertools import combinations
+from typing import Dict, List, Optional, Set
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..repository.affiliation_repository import AffiliationRepository
+
+class AffiliationIndex:
+    """Immutable adjacency view of the affiliation graph"""
+    def __init__(self, groups: List[tuple], memberships: List[tuple], relations: List[tuple]):
+        self.group_names: Dict[int, str] = dict(groups)
+        self.hero_groups: Dict[int, Set[int]] = defaultdict(set)
+        self.hero_former_groups: Dict[int, Set[int]] = defaultdict(set)
+        self.group_heroes: Dict[int, Set[int]] = defaultdict(set)
+        self.group_former_heroes: Dict[int, Set[int]] = defaultdict(set)
+        for superhero_id, group_id, is_former in memberships:
+            if is_former:
+                self.hero_former_groups[superhero_id].add(group_id)
+                self.group_former_heroes[group_id].add(superhero_id)
+            else:
+                self.hero_groups[superhero_id].add(group_id)
+                self.group_heroes[group_id].add(superhero_id)
+
+        # Relations are stored in both directions (a hero's father is related to the hero too)
+        self.relatives: Dict[int, Dict[int, str]] = defaultdict(dict)
+        for superhero_id, related_id, relation in relations:
+            self.relatives[superhero_id][related_id] = relation or ""
+            self.relatives[related_id].setdefault(superhero_id, "")
+
+    def groups_of(self, superhero_id: int, include_former: bool = False) -> Set[int]:
+        """Group IDs a hero belongs to"""
+        groups = self.hero_groups.get(superhero_id, set())
+        if include_former:
+            groups = groups | self.hero_former_groups.get(superhero_id, set())
+        return groups
+
+    def members_of(self, group_id: int, include_former: bool = False) -> Set[int]:
+        """Hero IDs in a group"""
+        members = self.group_heroes.get(group_id, set())
+        if include_former:
+            members = members | self.group_former_heroes.get(group_id, set())
+        return members
+
+    def teammates(self, superhero_id: int, limit: int = 20, include_former: bool = False) -> List[dict]:
+        """Heroes sharing at least one group with the given hero, most shared groups first"""
+        shared: Dict[int, List[int]] = defaultdict(list)
+        for group_id in self.groups_of(superhero_id, include_former):
+            for other_id in self.members_of(group_id, include_former):
+                if other_id != superhero_id:
+                    shared[other_id].append(group_id)
+
+        ranked = sorted(shared.items(), key=lambda item: (-len(item[1]), item[0]))[:limit]
+        return [
+            {"superhero_id": other_id, "shared_groups": self._group_list(group_ids)}
+            for other_id, group_ids in ranked
+        ]
+
+    def shared_groups(self, first_id: int, second_id: int, include_former: bool = False) -> List[dict]:
+        """Groups both heroes belong to"""
+        return self._group_list(
+            self.groups_of(first_id, include_former) & self.groups_of(second_id, include_former)
+        )
+
+    def team_synergy(self, superhero_ids: List[int]) -> dict:
+        """
+        Synergy of a roster: the share of hero pairs that are current teammates
+        in some group or are relatives, scaled to 0-100.
+        """
+        heroes = list(dict.fromkeys(superhero_ids))
+        pair_count = len(heroes) * (len(heroes) - 1) // 2
+        connected = 0
+        group_members: Dict[int, Set[int]] = defaultdict(set)
+        related_pairs = []
+        for first, second in combinations(heroes, 2):
+            common = self.groups_of(first) & self.groups_of(second)
+            for group_id in common:
+                group_members[group_id].update((first, second))
+            relation = self.relatives.get(first, {}).get(second)
+            if relation is not None:
+                related_pairs.append({"superhero_ids": [first, second], "relation": relation})
+            if common or relation is not None:
+                connected += 1
+
+        return {
+            "score": round(100 * connected / pair_count) if pair_count else 0,
+            "connected_pairs": connected,
+            "total_pairs": pair_count,
+            "shared_groups": [
+                {"group_id": group_id, "name": self.group_names.get(group_id, ""), "superhero_ids": sorted(members)}
+                for group_id, members in sorted(group_members.items(), key=lambda item: (-len(item[1]), item[0]))
+            ],
+            "relations": related_pairs
+        }
+
+    def _group_list(self, group_ids) -> List[dict]:
+        return sorted(
+            ({"group_id": group_id, "name": self.group_names.get(group_id, "")} for group_id in group_ids),
+            key=lambda group: group["name"].lower()
+        )
+
+class AffiliationGraph:
+    """Thread-safe holder of the current affiliation index"""
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._index: Optional[AffiliationIndex] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> AffiliationIndex:
+        """Return the current index, loading it from the database when missing or stale"""
+        index = self._index
+        if index is not None and time.monotonic() - self._loaded_at < self.ttl_seconds:
+            return index
+
+        with self._lock:
+            if self._index is None or time.monotonic() - self._loaded_at >= self.ttl_seconds:
+                self._index = AffiliationIndex(*AffiliationRepository(db).get_graph_rows())
+                self._loaded_at = time.monotonic()
+            return self._index
+
+    def invalidate(self):
+        """Drop the current index so the next read reloads it"""
+        with self._lock:
+            self._index = None
+
+affiliation_graph = AffiliationGraph(settings.CATALOG_TTL_SECONDS)
@@ -0,0 +1,117 @@
+"""
+Parsers for the free-text group_affiliation and relatives fields.
+
+The source data is loosely formatted, e.g.
+
+    group_affiliation: "Justice League, Outsiders; formerly White Lantern Corps, Sinestro Corps"
+    relatives: "Martha Wayne (mother, deceased), Thomas Wayne (father, deceased)"
+
+Entries are separated by commas or semicolons (commas inside parentheses
+don't split). In group lists a "formerly"/"former" prefix marks that entry and
+the rest of its semicolon segment as former memberships, and a parenthetical
+containing "former" marks a single entry.
+"""
+
+import re
+from typing import List, Tuple
+
+_EMPTY_VALUES = {"", "-", "none", "null", "n/a", "unknown"}
+_FORMER_PREFIX = re.compile(r"^(formerly|former|ex-)\s*(member\s+of\s+|of\s+)?", re.IGNORECASE)
+_PARENTHETICAL = re.compile(r"\(([^)]*)\)")
+_MAX_NAME_LENGTH = 255
+
+def normalize_name(name: str) -> str:
+    """Lookup key for a name: whitespace collapsed, lower-cased"""
+    return re.sub(r"\s+", " ", name).strip().lower()
+
+def _clean(name: str) -> str:
+    """Collapse whitespace and strip stray punctuation around a name"""
+    name = re.sub(r"\s+", " ", name).strip(" .,;:\"'")
+    if name.lower().startswith("and "):
+        name = name[4:].strip()
+    return name
+
+def _split_outside_parentheses(text: str) -> List[str]:
+    """Split on commas and semicolons that are not inside parentheses, keeping semicolons as markers"""
+    parts = []
+    depth = 0
+    current = []
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth = max(depth - 1, 0)
+        if depth == 0 and char in ",;":
+            parts.append("".join(current))
+            if char == ";":
+                parts.append(";")
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return parts
+
+def parse_groups(text: str) -> List[Tuple[str, bool]]:
+    """
+    Parse group_affiliation text.
+
+    Returns:
+        List of (group name, is_former), first occurrence of each group wins
+    """
+    if not text or text.strip().lower() in _EMPTY_VALUES:
+        return []
+
+    groups = {}
+    former_segment = False
+    for part in _split_outside_parentheses(text):
+        if part == ";":
+            former_segment = False
+            continue
+
+        entry = part.strip()
+        prefix = _FORMER_PREFIX.match(entry)
+        if prefix:
+            former_segment = True
+            entry = entry[prefix.end():]
+
+        is_former = former_segment
+        note = _PARENTHETICAL.search(entry)
+        if note and "former" in note.group(1).lower():
+            is_former = True
+        name = _clean(_PARENTHETICAL.sub("", entry))
+
+        key = normalize_name(name)
+        if key in _EMPTY_VALUES or len(name) > _MAX_NAME_LENGTH or key in groups:
+            continue
+        groups[key] = (name, is_former)
+
+    return list(groups.values())
+
+def parse_relatives(text: str) -> List[Tuple[str, str]]:
+    """
+    Parse relatives text.
+
+    Returns:
+        List of (relative name, relation) where relation is the first item in
+        the parenthetical (e.g. "father"), or "" when none is given
+    """
+    if not text or text.strip().lower() in _EMPTY_VALUES:
+        return []
+
+    relatives = []
+    seen = set()
+    for part in _split_outside_parentheses(text):
+        if part == ";":
+            continue
+        entry = part.strip()
+        note = _PARENTHETICAL.search(entry)
+        relation = _clean(note.group(1).split(",")[0]) if note else ""
+        name = _clean(_PARENTHETICAL.sub("", entry))
+
+        key = (normalize_name(name), relation.lower())
+        if key[0] in _EMPTY_VALUES or len(name) > _MAX_NAME_LENGTH or key in seen:
+            continue
+        seen.add(key)
+        relatives.append((name, relation[:_MAX_NAME_LENGTH]))
+
+    return relatives
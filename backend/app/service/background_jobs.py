@@ -0,0 +1,113 @@
+"""
+Periodic maintenance jobs run inside the API process.
+
+Each job opens its own session so it never shares state with request handlers.
+With several worker processes, only the one holding the scheduler's advisory
+lock runs them (see scheduler.SchedulerLease).
+"""
+
+import numpy as np
+from ..config import settings
+from ..database import SessionLocal
+from ..repository.favorite_repository import FavoriteRepository
+from ..repository.team_repository import TeamRepository
+from ..repository.user_repository import UserRepository
+from ..utils import get_logger
+from .scheduler import register_job
+from .co_favorites import build_co_occurrence
+from .team_ladder import fit_ratings, ladder_factors
+
+logger = get_logger("background_jobs")
+
+def reconcile_favorite_counts():
+    """Rebuild per-hero favorite counters from user_favorites"""
+    db = SessionLocal()
+    try:
+        corrected = FavoriteRepository(db).reconcile_favorite_counts()
+        if corrected:
+            logger.info(f"Favorite count reconcile corrected {corrected} heroes")
+    finally:
+        db.close()
+
+def rebuild_trending_scores():
+    """Rebuild time-decayed trending scores from the recent favorites window"""
+    db = SessionLocal()
+    try:
+        scored = FavoriteRepository(db).rebuild_trending_scores()
+        logger.info(f"Trending scores rebuilt for {scored} heroes")
+    finally:
+        db.close()
+
+def rebuild_co_favorites():
+    """Rebuild the co-favorite table from a full sparse co-occurrence product"""
+    db = SessionLocal()
+    try:
+        repo = FavoriteRepository(db)
+        # Held until the new counts commit, so no incremental update is overwritten
+        repo.lock_co_favorites()
+        rows = build_co_occurrence(repo.iter_favorite_pairs())
+        changed = repo.replace_co_favorite_counts(rows)
+        logger.info(f"Co-favorite model rebuilt with {len(rows)} hero pairs ({changed} rows changed)")
+    finally:
+        db.close()
+
+def rebuild_team_ladder():
+    """Refit Elo ratings for every team from vectorized simulated matches"""
+    db = SessionLocal()
+    try:
+        repo = TeamRepository(db)
+        # Read and write in one transaction so placements made meanwhile are kept
+        entries = list(repo.iter_ladder_entries())
+        if not entries:
+            return
+        team_ids, *columns = zip(*entries)
+        # Identical rosters have identical factors: fit each distinct row once and share the result
+        factors, inverse = np.unique(ladder_factors(*columns), axis=0, return_inverse=True)
+        ratings, matches = fit_ratings(factors, settings.TEAM_LADDER_ROUNDS, settings.TEAM_LADDER_K_FACTOR)
+        repo.save_fitted_ratings(list(team_ids), ratings[inverse].tolist(), matches[inverse].tolist())
+        logger.info(f"Team ladder refitted for {len(team_ids)} teams")
+    finally:
+        db.close()
+
+def sweep_password_reset_tokens():
+    """Delete expired password reset tokens"""
+    db = SessionLocal()
+    try:
+        deleted = UserRepository(db).delete_expired_password_reset_tokens()
+        if deleted:
+            logger.info(f"Swept {deleted} expired password reset tokens")
+    finally:
+        db.close()
+
+def register_background_jobs():
+    """Register all periodic jobs with the scheduler"""
+    register_job(
+        "favorite_count_reconcile",
+        settings.FAVORITE_COUNT_RECONCILE_INTERVAL_SECONDS,
+        reconcile_favorite_counts,
+        run_on_start=True
+    )
+    register_job(
+        "trending_rebuild",
+        settings.TRENDING_REBUILD_INTERVAL_SECONDS,
+        rebuild_trending_scores,
+        run_on_start=True
+    )
+    register_job(
+        "co_favorite_rebuild",
+        settings.CO_FAVORITE_REBUILD_INTERVAL_SECONDS,
+        rebuild_co_favorites,
+        run_on_start=True
+    )
+    register_job(
+        "team_ladder_rebuild",
+        settings.TEAM_LADDER_REBUILD_INTERVAL_SECONDS,
+        rebuild_team_ladder,
+        run_on_start=True
+    )
+    register_job(
+        "password_reset_token_sweep",
+        settings.PASSWORD_RESET_SWEEP_INTERVAL_SECONDS,
+        sweep_password_reset_tokens,
+        run_on_start=True
+    )
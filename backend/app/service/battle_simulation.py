@@ -0,0 +1,182 @@
+"""
+Monte Carlo battle simulation between two rosters.
+
+Each trial perturbs every hero's powerstats with multiplicative noise (a hero
+rarely performs exactly at their listed stats), then scores the two teams with
+the same weighted factors as the deterministic comparison. Trials run in
+vectorized NumPy chunks; large trial counts are sharded across a bounded
+process pool. Every run stops at its trial budget or its time budget,
+whichever comes first.
+"""
+
+import math
+import multiprocessing
+import secrets
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+import numpy as np
+from ..config import settings
+from ..utils import get_logger
+from .team_scoring import FACTOR_WEIGHTS
+
+logger = get_logger("battle_simulation")
+
+# Trials evaluated per vectorized chunk (bounds memory at chunk x heroes x 6 floats)
+CHUNK_TRIALS = 5000
+
+# Column indices into the 6-stat hero vectors (STAT_FIELDS order)
+INTELLIGENCE, STRENGTH, COMBAT = 0, 1, 5
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Lazily create the shared simulation process pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.SIMULATION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+def shutdown_simulation_pool():
+    """Shut down the simulation process pool (called on application shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+def _factor_values(totals: np.ndarray, member_count: int) -> np.ndarray:
+    """Map per-trial stat totals (trials x 6) to scoring factors (trials x 5)"""
+    total_power = totals.sum(axis=1)
+    return np.stack([
+        total_power,
+        total_power / (member_count * 6),
+        totals[:, STRENGTH],
+        totals[:, COMBAT],
+        totals[:, INTELLIGENCE]
+    ], axis=1)
+
+def _simulate_chunk(heroes1: np.ndarray, heroes2: np.ndarray, trials: int, stddev: float, rng: np.random.Generator) -> np.ndarray:
+    """Run `trials` matchups and return team1's margin (score1 - score2) per trial"""
+    noise1 = np.clip(rng.normal(1.0, stddev, size=(trials,) + heroes1.shape), 0.0, None)
+    noise2 = np.clip(rng.normal(1.0, stddev, size=(trials,) + heroes2.shape), 0.0, None)
+    factors1 = _factor_values((heroes1 * noise1).sum(axis=1), len(heroes1))
+    factors2 = _factor_values((heroes2 * noise2).sum(axis=1), len(heroes2))
+    score1 = (factors1 > factors2) @ FACTOR_WEIGHTS
+    score2 = (factors2 > factors1) @ FACTOR_WEIGHTS
+    return score1 - score2
+
+def run_shard(heroes1: np.ndarray, heroes2: np.ndarray, trials: int, stddev: float, seed_sequence, deadline: float) -> tuple:
+    """
+    Run one shard of trials until the trial count or the wall-clock deadline is reached.
+
+    Returns:
+        (team1_wins, team2_wins, ties, trials_run)
+    """
+    rng = np.random.default_rng(seed_sequence)
+    wins1 = wins2 = ties = completed = 0
+    while completed < trials and time.time() < deadline:
+        chunk = min(CHUNK_TRIALS, trials - completed)
+        margins = _simulate_chunk(heroes1, heroes2, chunk, stddev, rng)
+        wins1 += int((margins > 0).sum())
+        wins2 += int((margins < 0).sum())
+        ties += int((margins == 0).sum())
+        completed += chunk
+    return wins1, wins2, ties, completed
+
+def _wilson_interval(successes: int, total: int, z: float = 1.96) -> tuple:
+    """95% Wilson score interval for a binomial proportion"""
+    if total == 0:
+        return 0.0, 0.0
+    p = successes / total
+    denominator = 1 + z * z / total
+    center = (p + z * z / (2 * total)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+def simulate_battle(
+    heroes1: List[List[int]],
+    heroes2: List[List[int]],
+    trials: Optional[int] = None,
+    seed: Optional[int] = None,
+    time_budget_ms: Optional[int] = None
+) -> dict:
+    """
+    Simulate many stochastic matchups between two rosters.
+
+    Args:
+        heroes1: Powerstat vectors (STAT_FIELDS order) of the first roster
+        heroes2: Powerstat vectors of the second roster
+        trials: Requested trial count (capped by SIMULATION_MAX_TRIALS)
+        seed: Optional seed for reproducible results
+        time_budget_ms: Requested time budget (capped by SIMULATION_TIME_BUDGET_MS)
+
+    Returns:
+        Dictionary with win probabilities, a 95% confidence interval for team1's
+        win probability, trial counts and the seed used
+    """
+    trials = min(trials or settings.SIMULATION_DEFAULT_TRIALS, settings.SIMULATION_MAX_TRIALS)
+    budget_ms = min(time_budget_ms or settings.SIMULATION_TIME_BUDGET_MS, settings.SIMULATION_TIME_BUDGET_MS)
+    deadline = time.time() + budget_ms / 1000
+    if seed is None:
+        seed = secrets.randbits(32)
+    seed_sequence = np.random.SeedSequence(seed)
+
+    matrix1 = np.asarray(heroes1, dtype=np.float64).reshape(-1, 6)
+    matrix2 = np.asarray(heroes2, dtype=np.float64).reshape(-1, 6)
+    stddev = settings.SIMULATION_STAT_STDDEV
+
+    started = time.perf_counter()
+    shard_count = 1
+    if trials >= settings.SIMULATION_PARALLEL_THRESHOLD and settings.SIMULATION_WORKERS > 1:
+        shard_count = settings.SIMULATION_WORKERS
+
+    if shard_count == 1:
+        results = [run_shard(matrix1, matrix2, trials, stddev, seed_sequence, deadline)]
+    else:
+        shard_trials = [trials // shard_count + (1 if i < trials % shard_count else 0) for i in range(shard_count)]
+        pool = _get_pool()
+        futures = [
+            pool.submit(run_shard, matrix1, matrix2, count, stddev, child, deadline)
+            for count, child in zip(shard_trials, seed_sequence.spawn(shard_count))
+        ]
+        results = []
+        for future in futures:
+            try:
+                # Shards stop themselves at the deadline; allow a grace period for process start-up
+                results.append(future.result(timeout=max(deadline - time.time(), 0) + 5))
+            except FutureTimeoutError:
+                future.cancel()
+                logger.warning("Simulation shard exceeded its time budget and was dropped")
+            except BrokenProcessPool:
+                logger.error("Simulation process pool broke; it will be recreated on the next request")
+                shutdown_simulation_pool()
+                break
+
+    wins1 = sum(r[0] for r in results)
+    wins2 = sum(r[1] for r in results)
+    ties = sum(r[2] for r in results)
+    completed = sum(r[3] for r in results)
+    low, high = _wilson_interval(wins1, completed)
+
+    return {
+        "trials_requested": trials,
+        "trials_run": completed,
+        "team1_win_probability": wins1 / completed if completed else 0.0,
+        "team2_win_probability": wins2 / completed if completed else 0.0,
+        "tie_probability": ties / completed if completed else 0.0,
+        "team1_win_confidence_interval": {"level": 0.95, "low": low, "high": high},
+        "seed": seed,
+        "shards": shard_count,
+        "stat_stddev": stddev,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "time_budget_ms": budget_ms,
+        "budget_exhausted": completed < trials
+    }
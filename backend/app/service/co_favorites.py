@@ -0,0 +1,43 @@
+"""
+Item-to-item co-favorite model ("fans of X also favorited Y").
+
+The full rebuild builds a sparse user x hero incidence matrix X from
+user_favorites and computes C = X^T X; C[a, b] is the number of users who
+favorited both a and b. Incremental updates between rebuilds are applied by
+FavoriteRepository on every favorite add/remove.
+"""
+
+from typing import Iterable, List, Tuple
+import numpy as np
+from scipy import sparse
+
+def build_co_occurrence(pairs: Iterable[Tuple[int, int]]) -> List[Tuple[int, int, int]]:
+    """
+    Build co-favorite counts from (user_id, superhero_id) pairs.
+
+    Args:
+        pairs: Iterable of (user_id, superhero_id) favorite pairs
+
+    Returns:
+        List of (superhero_id, other_superhero_id, co_count) for every ordered
+        pair of distinct heroes with co_count > 0
+    """
+    favorites = np.array(list(pairs), dtype=np.int64).reshape(-1, 2)
+    if favorites.shape[0] == 0:
+        return []
+
+    user_ids, user_index = np.unique(favorites[:, 0], return_inverse=True)
+    hero_ids, hero_index = np.unique(favorites[:, 1], return_inverse=True)
+
+    incidence = sparse.csr_matrix(
+        (np.ones(favorites.shape[0], dtype=np.int32), (user_index, hero_index)),
+        shape=(len(user_ids), len(hero_ids))
+    )
+    co_occurrence = (incidence.T @ incidence).tocoo()
+
+    off_diagonal = co_occurrence.row != co_occurrence.col
+    rows = hero_ids[co_occurrence.row[off_diagonal]]
+    cols = hero_ids[co_occurrence.col[off_diagonal]]
+    counts = co_occurrence.data[off_diagonal]
+
+    return list(zip(rows.tolist(), cols.tolist(), counts.tolist()))
@@ -0,0 +1,39 @@
+"""
+Cache of team comparison stats keyed by roster content.
+
+Serves rosters without materialized stats (ad-hoc comparisons, or a saved
+team whose stats row is missing); saved teams read team_stats instead. Keys
+are built from an order-insensitive fingerprint of each roster, repeated
+heroes included, plus the catalog version stored in the database, never from
+team IDs: identical rosters share entries, a membership change produces a new
+fingerprint and any hero edit, made through any worker, bumps the version, so
+stale entries are simply never looked up again and age out of the LRU. A pair is stored once
+regardless of which side it was requested from.
+"""
+
+from typing import List, Tuple
+from ..config import settings
+from ..utils import LRUCache
+from .superhero_catalog import CatalogSnapshot
+from .team_signatures import roster_fingerprint
+
+comparison_cache = LRUCache(settings.COMPARISON_CACHE_SIZE)
+
+def get_matchup_stats(catalog: CatalogSnapshot, team1_ids: List[int], team2_ids: List[int]) -> Tuple[dict, dict]:
+    """
+    Return (stats1, stats2) for two rosters, computing and caching them on a miss.
+
+    The returned dictionaries are shared with the cache and must not be mutated.
+    """
+    fingerprint1 = roster_fingerprint(team1_ids)
+    fingerprint2 = roster_fingerprint(team2_ids)
+    swapped = fingerprint1 > fingerprint2
+    key = (fingerprint2, fingerprint1, catalog.version) if swapped else (fingerprint1, fingerprint2, catalog.version)
+
+    cached = comparison_cache.get(key)
+    if cached is None:
+        first, second = (team2_ids, team1_ids) if swapped else (team1_ids, team2_ids)
+        cached = (catalog.team_stats(first), catalog.team_stats(second))
+        comparison_cache.put(key, cached)
+
+    return (cached[1], cached[0]) if swapped else cached
@@ -0,0 +1,72 @@
+"""
+Ladder placement for created and edited teams, off the request path.
+
+Placing a team bisects the current ladder with one peers query per probe,
+which is too many round trips for a team write. Writes only enqueue the team;
+a single worker thread places queued teams with its own session. A team that
+is queued again before its turn is placed once, from its latest stats. A
+failed placement is only logged: the next ladder refit rates the team anyway.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Set
+from ..config import settings
+from ..database import SessionLocal
+from ..repository.team_repository import TeamRepository
+from ..utils import get_logger
+
+logger = get_logger("ladder_placement")
+
+class LadderPlacementQueue:
+    """Single-worker queue of team IDs awaiting ladder placement"""
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ladder-placement")
+        self._pending: Set[int] = set()
+        self._lock = threading.Lock()
+        self.placed = 0
+        self.failed = 0
+
+    def submit(self, team_id: int):
+        """Queue a team for placement (no-op if it is already waiting)"""
+        with self._lock:
+            if team_id in self._pending:
+                return
+            self._pending.add(team_id)
+        try:
+            self._executor.submit(self._place, team_id)
+        except RuntimeError:
+            # Executor already shut down; the next refit places the team
+            with self._lock:
+                self._pending.discard(team_id)
+
+    def _place(self, team_id: int):
+        with self._lock:
+            self._pending.discard(team_id)
+        db = SessionLocal()
+        try:
+            TeamRepository(db).place_team_rating(
+                team_id,
+                settings.TEAM_LADDER_PLACEMENT_PROBES,
+                settings.TEAM_LADDER_PLACEMENT_PEERS
+            )
+            with self._lock:
+                self.placed += 1
+        except Exception as e:
+            db.rollback()
+            with self._lock:
+                self.failed += 1
+            logger.warning(f"Could not place team {team_id} on the ladder: {e}")
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        """Return queue depth and placement counters"""
+        with self._lock:
+            return {"pending": len(self._pending), "placed": self.placed, "failed": self.failed}
+
+    def shutdown(self):
+        """Stop the worker thread, dropping queued placements (called on application shutdown)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+ladder_placement = LadderPlacementQueue()
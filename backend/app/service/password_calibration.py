@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Pick a bcrypt cost factor for this host.
+
+Each extra round doubles the work, so the command times hashing at increasing
+costs and recommends the highest cost whose median hash time stays within the
+latency target. Run it on the hardware that serves logins, then set
+BCRYPT_ROUNDS; existing hashes are upgraded (or downgraded) on each user's next
+successful login.
+
+Usage:
+    python -m app.service.password_calibration                 # 250 ms target
+    python -m app.service.password_calibration --target-ms 100
+"""
+
+import argparse
+import statistics
+import time
+from typing import Dict, Tuple
+from passlib.hash import bcrypt
+
+# OWASP's floor for bcrypt; passlib rejects anything above 31
+MIN_ROUNDS = 10
+MAX_ROUNDS = 20
+
+def measure_rounds(rounds: int, samples: int = 3) -> float:
+    """Median seconds to hash one password at the given cost"""
+    hasher = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hasher.hash("calibration-password")
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+def calibrate_rounds(target_ms: float, samples: int = 3) -> Tuple[int, Dict[int, float]]:
+    """
+    Find the highest cost within the target.
+
+    Returns:
+        (recommended rounds, {rounds: median milliseconds} for every cost measured)
+    """
+    timings: Dict[int, float] = {}
+    recommended = MIN_ROUNDS
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        timings[rounds] = 1000 * measure_rounds(rounds, samples)
+        if timings[rounds] > target_ms:
+            break
+        recommended = rounds
+        # The next cost takes about twice as long; stop before timing one that is clearly over
+        if 2 * timings[rounds] > 1.5 * target_ms:
+            break
+    return recommended, timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bcrypt and recommend BCRYPT_ROUNDS for this host")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Latency budget for one hash (default: 250)")
+    parser.add_argument("--samples", type=int, default=3, help="Hashes timed per cost (default: 3)")
+    args = parser.parse_args()
+
+    recommended, timings = calibrate_rounds(args.target_ms, max(args.samples, 1))
+    for rounds, milliseconds in timings.items():
+        marker = "  <- recommended" if rounds == recommended else ""
+        print(f"rounds={rounds:2d}  {milliseconds:8.1f} ms{marker}")
+    if timings[MIN_ROUNDS] > args.target_ms:
+        print(f"Even the minimum cost ({MIN_ROUNDS}) exceeds {args.target_ms:.0f} ms on this host")
+    print(f"\nBCRYPT_ROUNDS={recommended}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import threading
+from typing import Callable, List
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import NullPool
+from ..database import engine
+from ..utils import get_logger
+
+logger = get_logger("scheduler")
+
+# Every API worker process registers the same jobs; only the process holding this
+# session-level advisory lock runs them. The lock is held on a connection outside
+# the application pool and is released when that connection closes (release, a
+# failed ping or process exit); the next worker to check then takes over.
+SCHEDULER_LOCK_KEY = 0x5C4ED01E
+
+class SchedulerLease:
+    """Postgres advisory lock that elects one process to run the periodic jobs"""
+    def __init__(self, key: int):
+        self.key = key
+        self._engine = None
+        self._connection = None
+        self._held = False
+        self._lock = threading.Lock()
+
+    def is_leader(self) -> bool:
+        """Take or confirm the lock; False when another process holds it"""
+        if engine.dialect.name != "postgresql":
+            return True
+        with self._lock:
+            try:
+                if self._connection is None:
+                    self._connection = self._get_engine().connect()
+                if self._held:
+                    # The lock lives as long as the session; a failing ping means both are gone
+                    self._connection.execute(select(1))
+                else:
+                    self._held = bool(self._connection.execute(select(func.pg_try_advisory_lock(self.key))).scalar())
+                    if self._held:
+                        logger.info("This process now runs the background jobs")
+                self._connection.commit()
+            except Exception as e:
+                logger.warning(f"Scheduler lock check failed: {e}")
+                self._reset()
+                return False
+            if not self._held:
+                # Don't hold a connection open just to keep asking
+                self._reset()
+            return self._held
+
+    def release(self):
+        """Close the lock's connection, which releases the lock"""
+        with self._lock:
+            self._reset()
+
+    def _get_engine(self):
+        # Unpooled: closing a pooled connection would only park it, lock and all, in the pool
+        if self._engine is None:
+            self._engine = create_engine(engine.url, poolclass=NullPool)
+        return self._engine
+
+    def _reset(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+        self._connection = None
+        self._held = False
+
+scheduler_lease = SchedulerLease(SCHEDULER_LOCK_KEY)
+
+class PeriodicJob:
+    """
+    Runs a callable on a fixed interval in a daemon thread.
+
+    Jobs are expected to open and close their own database session; any
+    exception is logged and the job keeps its schedule.
+    """
+    def __init__(self, name: str, interval_seconds: int, func: Callable[[], None], run_on_start: bool = False):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.func = func
+        self.run_on_start = run_on_start
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the job thread (no-op if already running)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f"job-{self.name}", daemon=True)
+        self._thread.start()
+        logger.info(f"Started background job '{self.name}' (every {self.interval_seconds}s)")
+
+    def stop(self, timeout: float = 5.0):
+        """Signal the job to stop and wait briefly for it to exit"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def run_once(self):
+        """Run the job body once, logging instead of raising on failure"""
+        if not scheduler_lease.is_leader():
+            return
+        try:
+            self.func()
+        except Exception as e:
+            logger.error(f"Background job '{self.name}' failed: {e}")
+
+    def _run(self):
+        if self.run_on_start:
+            self.run_once()
+        while not self._stop_event.wait(self.interval_seconds):
+            self.run_once()
+
+_jobs: List[PeriodicJob] = []
+
+def register_job(name: str, interval_seconds: int, func: Callable[[], None], run_on_start: bool = False) -> PeriodicJob:
+    """Register a periodic job to be started with the application"""
+    job = PeriodicJob(name, interval_seconds, func, run_on_start)
+    _jobs.append(job)
+    return job
+
+def start_scheduler():
+    """Start all registered jobs"""
+    for job in _jobs:
+        job.start()
+
+def stop_scheduler():
+    """Stop all registered jobs"""
+    for job in _jobs:
+        job.stop()
+    scheduler_lease.release()
@@ -0,0 +1,131 @@
+"""
+In-process snapshot of the superhero catalog for vectorized team features.
+
+The catalog is small (a few hundred heroes), so each worker keeps the ids,
+powerstat matrix and the dictionary codes of the low-cardinality attributes
+(publisher, alignment, ...) in NumPy arrays; facet counts are a bincount over
+a code column. The snapshot version is the database's catalog version, which
+every superhero write bumps in its own transaction: each read compares it
+with one primary-key lookup and reloads on a mismatch, so every worker sees
+an edit made through any process on its next read. Snapshots also expire
+after CATALOG_TTL_SECONDS as a backstop for edits made outside the API.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional
+import numpy as np
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models.superhero import Superhero
+from ..models.attribute import ATTRIBUTE_MODELS
+from ..repository.attribute_repository import AttributeRepository
+from ..repository.superhero_repository import SuperheroRepository
+from .team_scoring import STAT_FIELDS, build_team_stats
+
+class CatalogSnapshot:
+    """Immutable, array-backed view of all superheroes"""
+    def __init__(self, rows: List[tuple], labels: Dict[str, Dict[int, str]], version: int = 0):
+        self.ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.names: List[str] = [row[1] for row in rows]
+        self.stats = np.array([[value or 0 for value in row[2:8]] for row in rows], dtype=np.int64).reshape(len(rows), len(STAT_FIELDS))
+        # Attribute codes per hero (0 where the attribute is unset) and code -> value per attribute
+        self.codes: Dict[str, np.ndarray] = {
+            attribute: np.array([row[8 + position] or 0 for row in rows], dtype=np.int16)
+            for position, attribute in enumerate(ATTRIBUTE_MODELS)
+        }
+        self.labels = labels
+        # Decoded views share the dictionary's string objects
+        self.alignments: List[str] = self._decode("alignment")
+        self.publishers: List[str] = self._decode("publisher")
+        self.index: Dict[int, int] = {hero_id: i for i, hero_id in enumerate(self.ids.tolist())}
+        self.version = version
+
+    def _decode(self, attribute: str) -> List[str]:
+        labels = self.labels.get(attribute, {})
+        return [labels.get(code, "") for code in self.codes[attribute].tolist()]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def indices_for(self, superhero_ids: List[int]) -> Optional[np.ndarray]:
+        """Map hero IDs to row indices (None if any ID is unknown)"""
+        try:
+            return np.array([self.index[hero_id] for hero_id in superhero_ids], dtype=np.int64)
+        except KeyError:
+            return None
+
+    def missing_ids(self, superhero_ids: List[int]) -> List[int]:
+        """Return the IDs not present in the catalog"""
+        return sorted({hero_id for hero_id in superhero_ids if hero_id not in self.index})
+
+    def team_stats(self, superhero_ids: List[int]) -> dict:
+        """Build team statistics for a roster of known hero IDs straight from the arrays"""
+        indices = self.indices_for(superhero_ids)
+        totals = dict(zip(STAT_FIELDS, self.stats[indices].sum(axis=0).tolist()))
+        alignment_counts: Dict[str, int] = {}
+        for i in indices.tolist():
+            if self.alignments[i]:
+                alignment_counts[self.alignments[i]] = alignment_counts.get(self.alignments[i], 0) + 1
+        return build_team_stats(len(indices), totals, alignment_counts)
+
+    def facets(self, superhero_ids: Optional[List[int]] = None) -> Dict[str, List[dict]]:
+        """
+        Hero counts per value of every dictionary-encoded attribute, most common
+        first (over the whole catalog, or over the given known hero IDs).
+        """
+        indices = None if superhero_ids is None else self.indices_for(superhero_ids)
+        facets = {}
+        for attribute, codes in self.codes.items():
+            labels = self.labels.get(attribute, {})
+            counts = np.bincount(codes if indices is None else codes[indices], minlength=max(labels, default=0) + 1)
+            facets[attribute] = [
+                {"value": labels[code], "count": int(counts[code])}
+                for code in np.argsort(-counts, kind="stable").tolist()
+                if counts[code] and code in labels
+            ]
+        return facets
+
+class SuperheroCatalog:
+    """Thread-safe holder of the current catalog snapshot"""
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> CatalogSnapshot:
+        """Return the current snapshot, loading it from the database when missing, outdated or expired"""
+        version = SuperheroRepository(db).get_catalog_version()
+        snapshot = self._snapshot
+        if self._is_current(snapshot, version):
+            return snapshot
+
+        with self._lock:
+            if not self._is_current(self._snapshot, version):
+                # The version is read before the rows, so a write racing with the load
+                # at worst labels newer rows with an older version and triggers a reload
+                rows = db.query(
+                    Superhero.id,
+                    Superhero.name,
+                    *[getattr(Superhero, field) for field in STAT_FIELDS],
+                    *[getattr(Superhero, f"{attribute}_id") for attribute in ATTRIBUTE_MODELS]
+                ).order_by(Superhero.id).all()
+                labels = AttributeRepository(db).get_labels()
+                self._snapshot = CatalogSnapshot([tuple(row) for row in rows], labels, version)
+                self._loaded_at = time.monotonic()
+            return self._snapshot
+
+    def _is_current(self, snapshot: Optional[CatalogSnapshot], version: int) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.version == version
+            and time.monotonic() - self._loaded_at < self.ttl_seconds
+        )
+
+    def invalidate(self):
+        """Drop the current snapshot so the next read reloads it"""
+        with self._lock:
+            self._snapshot = None
+
+superhero_catalog = SuperheroCatalog(settings.CATALOG_TTL_SECONDS)
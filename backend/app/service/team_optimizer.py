@@ -0,0 +1,178 @@
+"""
+Constraint-based optimal team builder.
+
+Finds the roster with the highest weighted powerstat score subject to team
+size, alignment quotas, required/excluded heroes and publisher limits. The
+search is a depth-first branch and bound over the catalog's stat matrix:
+
+* candidates are sorted by score, so the first descent is the greedy roster
+  and becomes the initial incumbent;
+* the bound for a partial roster is its score plus the best remaining scores
+  (a prefix sum), which lets whole sibling ranges be cut at once;
+* branches that can no longer meet an alignment minimum are pruned from
+  suffix counts.
+
+The search is anytime: when the time limit is hit the best roster found so
+far is returned with optimal=False.
+"""
+
+import time
+from typing import Dict, List, Optional
+import numpy as np
+from .superhero_catalog import CatalogSnapshot
+from .team_scoring import STAT_FIELDS
+
+# Check the clock every N expanded nodes
+_CLOCK_INTERVAL = 1024
+
+class OptimizationError(ValueError):
+    """Raised when the constraints are contradictory or cannot be satisfied"""
+
+def optimize_team(
+    catalog: CatalogSnapshot,
+    team_size: int,
+    stat_weights: Optional[Dict[str, float]] = None,
+    required_ids: Optional[List[int]] = None,
+    excluded_ids: Optional[List[int]] = None,
+    alignment_min: Optional[Dict[str, int]] = None,
+    alignment_max: Optional[Dict[str, int]] = None,
+    publisher_max: Optional[Dict[str, int]] = None,
+    max_per_publisher: Optional[int] = None,
+    time_limit_ms: int = 1000
+) -> dict:
+    """
+    Search for the best-scoring roster under the given constraints.
+
+    Returns:
+        Dictionary with superhero_ids, score, optimal flag, nodes explored and elapsed time
+
+    Raises:
+        OptimizationError: If the constraints are inconsistent or infeasible
+    """
+    started = time.perf_counter()
+    deadline = started + time_limit_ms / 1000
+
+    weights = np.array([(stat_weights or {}).get(field, 1.0) for field in STAT_FIELDS], dtype=np.float64)
+    values = catalog.stats @ weights
+    alignment_min = {k: v for k, v in (alignment_min or {}).items() if v > 0}
+    alignment_max = alignment_max or {}
+    publisher_max = publisher_max or {}
+    required_ids = list(dict.fromkeys(required_ids or []))
+    excluded = set(excluded_ids or [])
+
+    unknown = catalog.missing_ids(required_ids + list(excluded))
+    if unknown:
+        raise OptimizationError(f"Superheroes with IDs {', '.join(map(str, unknown))} not found")
+    if excluded & set(required_ids):
+        raise OptimizationError("A hero cannot be both required and excluded")
+    if len(required_ids) > team_size:
+        raise OptimizationError("More required heroes than team slots")
+    if sum(alignment_min.values()) > team_size:
+        raise OptimizationError("Alignment minimums exceed the team size")
+
+    def publisher_limit(publisher: str) -> Optional[int]:
+        limits = [limit for limit in (publisher_max.get(publisher), max_per_publisher) if limit is not None]
+        return min(limits) if limits else None
+
+    # Seed the state with the required heroes
+    base_alignment: Dict[str, int] = {}
+    base_publisher: Dict[str, int] = {}
+    base_score = 0.0
+    for hero_id in required_ids:
+        i = catalog.index[hero_id]
+        base_alignment[catalog.alignments[i]] = base_alignment.get(catalog.alignments[i], 0) + 1
+        base_publisher[catalog.publishers[i]] = base_publisher.get(catalog.publishers[i], 0) + 1
+        base_score += values[i]
+    for alignment, count in base_alignment.items():
+        if alignment in alignment_max and count > alignment_max[alignment]:
+            raise OptimizationError(f"Required heroes exceed the '{alignment}' alignment limit")
+    for publisher, count in base_publisher.items():
+        limit = publisher_limit(publisher)
+        if limit is not None and count > limit:
+            raise OptimizationError(f"Required heroes exceed the '{publisher}' publisher limit")
+
+    # Candidate pool sorted by score (best first)
+    taken = set(required_ids) | excluded
+    candidates = [i for i in np.argsort(-values, kind="stable").tolist() if int(catalog.ids[i]) not in taken]
+    candidate_values = values[candidates]
+    prefix = np.concatenate([[0.0], np.cumsum(candidate_values)])
+    candidate_alignments = [catalog.alignments[i] for i in candidates]
+    candidate_publishers = [catalog.publishers[i] for i in candidates]
+    n = len(candidates)
+
+    # suffix_alignment[a][j] = candidates at positions >= j with alignment a
+    suffix_alignment = {}
+    for alignment in alignment_min:
+        flags = np.array([a == alignment for a in candidate_alignments], dtype=np.int64)
+        suffix_alignment[alignment] = np.concatenate([np.cumsum(flags[::-1])[::-1], [0]])
+
+    slots = team_size - len(required_ids)
+    best = {"score": -np.inf, "picks": None}
+    state = {"nodes": 0, "timed_out": False}
+    picks: List[int] = []
+    alignment_counts = dict(base_alignment)
+    publisher_counts = dict(base_publisher)
+
+    def quotas_reachable(start: int, remaining: int) -> bool:
+        needed = 0
+        for alignment, minimum in alignment_min.items():
+            missing = minimum - alignment_counts.get(alignment, 0)
+            if missing > 0:
+                if suffix_alignment[alignment][start] < missing:
+                    return False
+                needed += missing
+        return needed <= remaining
+
+    def search(start: int, score: float):
+        remaining = slots - len(picks)
+        if remaining == 0:
+            if score > best["score"]:
+                best["score"] = score
+                best["picks"] = list(picks)
+            return
+        for j in range(start, n - remaining + 1):
+            state["nodes"] += 1
+            if state["nodes"] % _CLOCK_INTERVAL == 0 and time.perf_counter() > deadline:
+                state["timed_out"] = True
+            if state["timed_out"]:
+                return
+            # Best possible completion from here; candidates are sorted, so later j only get worse
+            if score + prefix[j + remaining] - prefix[j] <= best["score"]:
+                return
+            if not quotas_reachable(j, remaining):
+                return
+
+            alignment = candidate_alignments[j]
+            publisher = candidate_publishers[j]
+            if alignment in alignment_max and alignment_counts.get(alignment, 0) >= alignment_max[alignment]:
+                continue
+            limit = publisher_limit(publisher)
+            if limit is not None and publisher_counts.get(publisher, 0) >= limit:
+                continue
+
+            picks.append(j)
+            alignment_counts[alignment] = alignment_counts.get(alignment, 0) + 1
+            publisher_counts[publisher] = publisher_counts.get(publisher, 0) + 1
+            # The pick must leave the alignment minimums reachable with the remaining slots
+            if quotas_reachable(j + 1, remaining - 1):
+                search(j + 1, score + candidate_values[j])
+            picks.pop()
+            alignment_counts[alignment] -= 1
+            publisher_counts[publisher] -= 1
+
+    if quotas_reachable(0, slots):
+        search(0, base_score)
+
+    if best["picks"] is None:
+        if state["timed_out"]:
+            raise OptimizationError("No feasible team found within the time limit")
+        raise OptimizationError("No team satisfies the given constraints")
+
+    superhero_ids = required_ids + [int(catalog.ids[candidates[j]]) for j in best["picks"]]
+    return {
+        "superhero_ids": superhero_ids,
+        "score": float(best["score"]),
+        "optimal": not state["timed_out"],
+        "nodes_explored": state["nodes"],
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
@@ -0,0 +1,206 @@
+"""
+Team statistics and matchup scoring shared by team comparison features.
+"""
+
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+
+# Powerstats in the order used for hero stat vectors
+STAT_FIELDS = ["intelligence", "strength", "speed", "durability", "power", "combat"]
+
+# Team-level total key for each powerstat ("total_power" is the sum of all stats)
+STAT_TOTAL_KEYS = {
+    "intelligence": "total_intelligence",
+    "strength": "total_strength",
+    "speed": "total_speed",
+    "durability": "total_durability",
+    "power": "total_power_stat",
+    "combat": "total_combat"
+}
+
+# Winner prediction factors: (team stat key, weight, reason template); weights sum to 100
+SCORING_FACTORS = [
+    ("total_power", 40, "{name} has higher total power ({ours} vs {theirs})"),
+    ("average_power", 20, "{name} has higher average power per hero ({ours:.1f} vs {theirs:.1f})"),
+    ("total_strength", 15, "{name} has superior strength ({ours} vs {theirs})"),
+    ("total_combat", 15, "{name} has better combat skills ({ours} vs {theirs})"),
+    ("total_intelligence", 10, "{name} has higher intelligence ({ours} vs {theirs})")
+]
+FACTOR_KEYS = [key for key, _, _ in SCORING_FACTORS]
+FACTOR_WEIGHTS = np.array([weight for _, weight, _ in SCORING_FACTORS], dtype=np.int64)
+
+def hero_stat_values(hero) -> list:
+    """Return a hero's powerstats as a list of ints (missing stats count as 0)"""
+    return [getattr(hero, field) or 0 for field in STAT_FIELDS]
+
+def build_team_stats(member_count: int, totals: Dict[str, int], alignment_counts: Optional[Dict[str, int]] = None) -> dict:
+    """
+    Build the team statistics dictionary from aggregate totals.
+
+    Args:
+        member_count: Number of heroes in the team
+        totals: Per-stat totals keyed by STAT_FIELDS names
+        alignment_counts: Number of heroes per alignment
+
+    Returns:
+        Dictionary with total power, averages and alignment distribution
+    """
+    count = member_count
+    total_power = sum(totals.get(field, 0) for field in STAT_FIELDS)
+    distribution = {"good": 0, "bad": 0, "neutral": 0}
+    distribution.update(alignment_counts or {})
+
+    return {
+        "total_power": total_power,
+        "average_power": total_power / (count * 6) if count > 0 else 0,
+        "total_intelligence": totals.get("intelligence", 0),
+        "total_strength": totals.get("strength", 0),
+        "total_speed": totals.get("speed", 0),
+        "total_durability": totals.get("durability", 0),
+        "total_power_stat": totals.get("power", 0),
+        "total_combat": totals.get("combat", 0),
+        "average_intelligence": totals.get("intelligence", 0) / count if count > 0 else 0,
+        "average_strength": totals.get("strength", 0) / count if count > 0 else 0,
+        "average_speed": totals.get("speed", 0) / count if count > 0 else 0,
+        "average_durability": totals.get("durability", 0) / count if count > 0 else 0,
+        "average_power_stat": totals.get("power", 0) / count if count > 0 else 0,
+        "average_combat": totals.get("combat", 0) / count if count > 0 else 0,
+        "alignment_distribution": distribution,
+        "member_count": count
+    }
+
+def aggregate_heroes(heroes: Iterable) -> tuple:
+    """
+    Sum powerstats and count alignments for a group of heroes.
+
+    Returns:
+        (member_count, totals, alignment_counts)
+    """
+    member_count = 0
+    totals = {field: 0 for field in STAT_FIELDS}
+    alignment_counts = {}
+    for hero in heroes:
+        member_count += 1
+        for field, value in zip(STAT_FIELDS, hero_stat_values(hero)):
+            totals[field] += value
+        if hero.alignment:
+            alignment_counts[hero.alignment] = alignment_counts.get(hero.alignment, 0) + 1
+    return member_count, totals, alignment_counts
+
+def calculate_team_stats(heroes) -> dict:
+    """Calculate total power, averages, and alignment distribution from hero rows"""
+    member_count, totals, alignment_counts = aggregate_heroes(heroes)
+    return build_team_stats(member_count, totals, alignment_counts)
+
+def team_stats_to_dict(team_stats) -> dict:
+    """Build the team statistics dictionary from a materialized TeamStats row"""
+    totals = {field: getattr(team_stats, STAT_TOTAL_KEYS[field]) or 0 for field in STAT_FIELDS}
+    return build_team_stats(team_stats.member_count, totals, team_stats.alignment_distribution)
+
+def score_matchup(stats1: dict, stats2: dict, name1: str, name2: str) -> tuple:
+    """
+    Score two teams against each other using the weighted factors.
+
+    Returns:
+        (team1_score, team2_score, reasons)
+    """
+    team1_score = 0
+    team2_score = 0
+    reasons = []
+    for key, weight, template in SCORING_FACTORS:
+        if stats1[key] > stats2[key]:
+            team1_score += weight
+            reasons.append(template.format(name=name1, ours=stats1[key], theirs=stats2[key]))
+        elif stats2[key] > stats1[key]:
+            team2_score += weight
+            reasons.append(template.format(name=name2, ours=stats2[key], theirs=stats1[key]))
+    return team1_score, team2_score, reasons
+
+def compare_team_stats(team1: dict, stats1: dict, team2: dict, stats2: dict) -> dict:
+    """
+    Build the comparison result for two teams.
+
+    Args:
+        team1: {"id": ..., "name": ...} for the first team (id may be None)
+        stats1: Team statistics of the first team
+        team2: {"id": ..., "name": ...} for the second team
+        stats2: Team statistics of the second team
+
+    Returns:
+        Comparison dictionary with both teams, the winner, explanation and reasons
+    """
+    team1_score, team2_score, reasons = score_matchup(stats1, stats2, team1["name"], team2["name"])
+
+    if team1_score > team2_score:
+        winner_id = team1["id"]
+        winner_name = team1["name"]
+        explanation = f"{team1['name']} wins with a score of {team1_score}/100 vs {team2['name']}'s {team2_score}/100."
+    elif team2_score > team1_score:
+        winner_id = team2["id"]
+        winner_name = team2["name"]
+        explanation = f"{team2['name']} wins with a score of {team2_score}/100 vs {team1['name']}'s {team1_score}/100."
+    else:
+        winner_id = None
+        winner_name = "Tie"
+        explanation = f"Both teams are evenly matched with a score of {team1_score}/100."
+
+    return {
+        "team1": {
+            "id": team1["id"],
+            "name": team1["name"],
+            "stats": stats1,
+            "score": team1_score
+        },
+        "team2": {
+            "id": team2["id"],
+            "name": team2["name"],
+            "stats": stats2,
+            "score": team2_score
+        },
+        "winner": {
+            "team_id": winner_id,
+            "team_name": winner_name,
+            "score": max(team1_score, team2_score)
+        },
+        "explanation": explanation,
+        "reasons": reasons
+    }
+
+def build_factor_matrix(stats_list: List[dict]) -> np.ndarray:
+    """Stack team statistics into a (teams x factors) matrix in SCORING_FACTORS order"""
+    return np.array(
+        [[stats[key] for key in FACTOR_KEYS] for stats in stats_list],
+        dtype=np.float64
+    ).reshape(len(stats_list), len(FACTOR_KEYS))
+
+def pairwise_scores(factors: np.ndarray) -> np.ndarray:
+    """
+    Score every team against every other team at once.
+
+    Returns:
+        (n x n) matrix where [i, j] is team i's score (0-100) against team j
+    """
+    scores = np.zeros((len(factors), len(factors)), dtype=np.int64)
+    # One (n x n) comparison per factor keeps memory at O(n^2) instead of O(n^2 * factors)
+    for column, weight in enumerate(FACTOR_WEIGHTS):
+        values = factors[:, column]
+        scores += weight * (values[:, None] > values[None, :])
+    return scores
+
+def round_robin(factors: np.ndarray) -> dict:
+    """
+    Play a full round-robin between all teams.
+
+    Returns:
+        Dictionary of per-team arrays: wins, losses, ties, points (sum of match
+        scores) and rank order (indices, best first)
+    """
+    scores = pairwise_scores(factors)
+    opponent = ~np.eye(len(factors), dtype=bool)
+    wins = ((scores > scores.T) & opponent).sum(axis=1)
+    losses = ((scores < scores.T) & opponent).sum(axis=1)
+    ties = ((scores == scores.T) & opponent).sum(axis=1)
+    points = scores.sum(axis=1)
+    # Rank by wins, then ties, then accumulated match points
+    order = np.lexsort((-points, -ties, -wins))
+    return {"wins": wins, "losses": losses, "ties": ties, "points": points, "order": order}
@@ -1,15 +1,22 @@
 from .logger import setup_logger, get_logger, logger
 from .auth import (
-    verify_password, get_password_hash, create_access_token,
+    verify_password, verify_and_update_password, get_password_hash, create_access_token,
     verify_token, authenticate_user, get_current_user,
     get_current_active_user, get_current_admin_user
 )
 from .response import create_success_response, create_error_response, create_user_data, create_superhero_data
+from .lru_cache import LRUCache
+from .principal_cache import Principal, PrincipalCache, principal_cache
+from .token_cache import TokenCache, token_cache
+from .hashing_executor import HashingExecutor, HashingOverloadedError, hashing_executor
 
 __all__ = [
     "setup_logger", "get_logger", "logger",
-    "verify_password", "get_password_hash", "create_access_token",
+    "verify_password", "verify_and_update_password", "get_password_hash", "create_access_token",
     "verify_token", "authenticate_user", "get_current_user",
     "get_current_active_user", "get_current_admin_user",
-    "create_success_response", "create_error_response", "create_user_data", "create_superhero_data"
+    "create_success_response", "create_error_response", "create_user_data", "create_superhero_data",
+    "LRUCache", "Principal", "PrincipalCache", "principal_cache",
+    "TokenCache", "token_cache",
+    "HashingExecutor", "HashingOverloadedError", "hashing_executor"
 ]
\ No newline at end of file
@@ -1,25 +1,39 @@
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 from ..config import settings
 from ..models.user import User
 from ..utils import get_logger
+from .principal_cache import Principal, principal_cache
+from .token_cache import token_cache
+from .hashing_executor import hashing_executor
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context shared by the API and seeders; hashes with any other cost are flagged for rehash
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 # Logger
 logger = get_logger("auth_utils")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a password against its hash (on the hashing executor; may raise HashingOverloadedError)"""
+    return hashing_executor.run(pwd_context.verify, plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and, when its hash uses an outdated scheme or cost, return a replacement hash
+    (on the hashing executor; may raise HashingOverloadedError).
+
+    Returns:
+        (valid, new_hash or None)
+    """
+    return hashing_executor.run(pwd_context.verify_and_update, plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    return pwd_context.hash(password)
+    """Hash a password (on the hashing executor; may raise HashingOverloadedError)"""
+    return hashing_executor.run(pwd_context.hash, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
@@ -34,9 +48,15 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 def verify_token(token: str) -> Optional[dict]:
-    """Verify and decode JWT token"""
+    """Verify and decode JWT token (memoized per token until it expires)"""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
     try:
+        started = time.perf_counter()
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        token_cache.put(token, payload, time.perf_counter() - started)
         return payload
     except JWTError as e:
         logger.warning(f"JWT verification failed: {e}")
@@ -54,8 +74,8 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
         return None
     return user
 
-def get_current_user(db: Session, token: str) -> Optional[User]:
-    """Get current user from JWT token"""
+def get_current_user(db: Session, token: str) -> Optional[Principal]:
+    """Get the current user's principal from a JWT token (served from the principal cache when possible)"""
     payload = verify_token(token)
     if payload is None:
         return None
@@ -64,19 +84,27 @@ def get_current_user(db: Session, token: str) -> Optional[User]:
     if email is None:
         return None
 
+    issued_at = payload.get("iat")
+    principal = principal_cache.get(email, issued_at)
+    if principal is not None:
+        return principal
+
+    generation = principal_cache.generation()
     user = db.query(User).filter(User.email == email).first()
     if user is None or not user.is_active:
         return None
 
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.put(email, issued_at, principal, generation)
+    return principal
 
-def get_current_active_user(db: Session, token: str) -> Optional[User]:
+def get_current_active_user(db: Session, token: str) -> Optional[Principal]:
     """Get current active user (same as get_current_user for now)"""
     return get_current_user(db, token)
 
-def get_current_admin_user(db: Session, token: str) -> Optional[User]:
+def get_current_admin_user(db: Session, token: str) -> Optional[Principal]:
     """Get current admin user"""
     user = get_current_user(db, token)
     if user and user.role == "admin":
         return user
-    return None
\ No newline at end of file
+    return None
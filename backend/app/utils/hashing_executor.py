@@ -0,0 +1,109 @@
+"""
+Dedicated, size-limited executor for bcrypt.
+
+Password hashing and verification are deliberately slow. Run inline, a login
+burst occupies every slot of the shared request threadpool and stalls cheap
+reads. All bcrypt work goes through a small thread pool instead (bcrypt
+releases the GIL, so threads hash in parallel) with admission control: at
+most `workers + max_queue` operations are admitted at once and the rest are
+rejected immediately with HashingOverloadedError, which the routes turn into
+503. Auth traffic can therefore tie up at most that many request threads.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+from ..config import settings
+
+T = TypeVar("T")
+
+class HashingOverloadedError(RuntimeError):
+    """Raised when the hashing queue is full and the request should be shed"""
+
+class _Timing:
+    """Count, total and maximum of a duration"""
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "average_ms": round(1000 * self.total / self.count, 3) if self.count else 0.0,
+            "max_ms": round(1000 * self.max, 3)
+        }
+
+class HashingExecutor:
+    """Bounded thread pool for password hashing with load shedding and timing metrics"""
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = max(workers, 1)
+        self.max_queue = max(max_queue, 0)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self.rejected = 0
+        self.queue_wait = _Timing()
+        self.hash_time = _Timing()
+
+    def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Run a hashing function on the pool and wait for its result.
+
+        Raises:
+            HashingOverloadedError: If the queue is full
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashingOverloadedError("Password hashing queue is full")
+
+        submitted = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+
+        def task():
+            started = time.perf_counter()
+            with self._lock:
+                self._running += 1
+                self.queue_wait.add(started - submitted)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self.hash_time.add(time.perf_counter() - started)
+
+        try:
+            return self._executor.submit(task).result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        """Return pool size, current load and timing metrics"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._in_flight - self._running,
+                "rejected": self.rejected,
+                "queue_wait": self.queue_wait.as_dict(),
+                "hash_time": self.hash_time.as_dict()
+            }
+
+    def shutdown(self):
+        """Stop the worker threads (called on application shutdown)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+hashing_executor = HashingExecutor(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
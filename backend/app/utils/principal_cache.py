@@ -0,0 +1,118 @@
+"""
+Per-process cache of verified principals for JWT-protected routes.
+
+A token's signature and expiry are still checked on every request; the cache
+only replaces the user lookup that follows. Entries are keyed by the token's
+(subject, issued-at) pair, expire after a short TTL and are dropped for a
+subject whenever this process updates, deletes or resets the password of that
+user. Edits made by other processes are picked up when the TTL runs out.
+
+A fill that raced with an invalidation is discarded: the caller reads the
+cache's generation before querying and the entry is only stored if it has not
+moved since. The generation is a single counter bumped by every invalidation,
+so it costs no memory per subject; a fill racing with any user's invalidation
+is skipped too, and simply repeated on that token's next request.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional, Set, Tuple
+from ..config import settings
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as seen by route handlers (detached from any session)"""
+    id: int
+    email: str
+    username: str
+    first_name: str
+    last_name: str
+    role: str
+    is_active: bool = True
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            role=user.role,
+            is_active=user.is_active
+        )
+
+class PrincipalCache:
+    """Thread-safe bounded TTL cache of principals with per-subject invalidation"""
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Principal, float]]" = OrderedDict()
+        self._keys_by_subject: Dict[str, Set[Tuple[str, Hashable]]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, subject: str, issued_at: Hashable) -> Optional[Principal]:
+        """Return the cached principal for a token, or None when missing or expired"""
+        key = (subject, issued_at)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def generation(self) -> int:
+        """Invalidation counter; read it before the user lookup and pass it back to put()"""
+        with self._lock:
+            return self._generation
+
+    def put(self, subject: str, issued_at: Hashable, principal: Principal, generation: int):
+        """Store a principal unless anything was invalidated after `generation` was read"""
+        if self.maxsize <= 0:
+            return
+        key = (subject, issued_at)
+        with self._lock:
+            if self._generation != generation:
+                return
+            self._entries[key] = (principal, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            self._keys_by_subject.setdefault(subject, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, subject: str):
+        """Drop every cached token of a subject"""
+        with self._lock:
+            self._generation += 1
+            for key in self._keys_by_subject.pop(subject, set()):
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_subject.clear()
+
+    def stats(self) -> dict:
+        """Return size and hit/miss counters"""
+        with self._lock:
+            return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+    def _remove(self, key: Tuple[str, Hashable]):
+        self._entries.pop(key, None)
+        keys = self._keys_by_subject.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_subject[key[0]]
+
+principal_cache = PrincipalCache(settings.AUTH_PRINCIPAL_CACHE_SIZE, settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS)
@@ -60,13 +60,14 @@ def create_user_data(user) -> dict:
         "updated_at": user.updated_at.isoformat() if user.updated_at else None
     }
 
-def create_superhero_data(superhero, is_favorite: bool = False) -> dict:
+def create_superhero_data(superhero, is_favorite: bool = False, favorite_count: int = None) -> dict:
     """
     Create standardized superhero data dictionary from Superhero model.
 
     Args:
         superhero: Superhero model instance
         is_favorite: Whether this superhero is favorited by the current user
+        favorite_count: Optional number of users who favorited this superhero
 
     Returns:
         Dictionary with superhero data
@@ -103,4 +104,6 @@ def create_superhero_data(superhero, is_favorite: bool = False) -> dict:
         "image_url": superhero.image_url,
         "is_favorite": is_favorite
     }
+    if favorite_count is not None:
+        data["favorite_count"] = favorite_count
     return data
\ No newline at end of file
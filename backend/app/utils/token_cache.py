@@ -0,0 +1,74 @@
+"""
+Memoized JWT verification.
+
+The same long-lived token is presented on every request of a session, and
+HMAC verification plus claim validation is repeated each time. Verified claims
+are kept in an LRU keyed by the SHA-256 digest of the token (the raw token is
+never stored) and are served until the token's `exp`. Only successful
+verifications are cached, so a forged or tampered token always goes through
+jwt.decode and fails there.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Optional
+from ..config import settings
+from .lru_cache import LRUCache
+
+class TokenCache:
+    """LRU of token digest -> verified claims with hit and time-saved counters"""
+    def __init__(self, maxsize: int):
+        self._cache = LRUCache(maxsize)
+        self._lock = threading.Lock()
+        self.expired = 0
+        self.decode_count = 0
+        self.decode_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return a copy of the cached claims, or None when missing or expired"""
+        key = self._key(token)
+        claims = self._cache.get(key)
+        if claims is None:
+            return None
+        exp = claims.get("exp")
+        if exp is not None and exp <= time.time():
+            self._cache.pop(key)
+            with self._lock:
+                self.expired += 1
+            return None
+        with self._lock:
+            if self.decode_count:
+                self.saved_seconds += self.decode_seconds / self.decode_count
+        return dict(claims)
+
+    def put(self, token: str, claims: dict, decode_seconds: float):
+        """Store verified claims along with how long verification took"""
+        with self._lock:
+            self.decode_count += 1
+            self.decode_seconds += decode_seconds
+        self._cache.put(self._key(token), dict(claims))
+
+    def stats(self) -> dict:
+        """Return size, hit rate and verification time saved"""
+        stats = self._cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        with self._lock:
+            # An expired entry is found in the LRU but still costs a full verification
+            stats["hits"] -= self.expired
+            stats["misses"] += self.expired
+            average_ms = 1000 * self.decode_seconds / self.decode_count if self.decode_count else 0.0
+            stats.update({
+                "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+                "expired": self.expired,
+                "average_verify_ms": round(average_ms, 4),
+                "verify_ms_saved": round(1000 * self.saved_seconds, 2)
+            })
+        return stats
+
+token_cache = TokenCache(settings.JWT_DECODE_CACHE_SIZE)
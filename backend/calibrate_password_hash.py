@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Convenience script to benchmark bcrypt and recommend BCRYPT_ROUNDS.
+
+This is a wrapper around app.service.password_calibration.
+"""
+
+import sys
+import os
+
+# Add the app directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Import and run the calibration command
+from app.service.password_calibration import main
+
+if __name__ == "__main__":
+    main()
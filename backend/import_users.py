@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Convenience script to bulk import users from a CSV or NDJSON file.
+
+This is a wrapper around app.seeder.user_import.
+"""
+
+import sys
+import os
+
+# Add the app directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Import and run the user import command
+from app.seeder.user_import import main
+
+if __name__ == "__main__":
+    main()